@@ -3,6 +3,8 @@ Konfigurasi untuk Shopee Analyzer
 """
 
 # Strategi Pengelolaan Iklan
+# Window jam bersifat setengah terbuka [start, end): 'morning' 7-9 = jam 07:00-08:59,
+# 'midnight' 0-1 = jam 00:00-00:59 (dipakai heatmap, snapshot & monitoring schedule)
 DAILY_SCHEDULE = {
     'morning': {'start': 7, 'end': 9, 'action': 'adjust_roas_budget'},
     'noon': {'start': 12, 'end': 13, 'action': 'monitor_ctr_spend'},
@@ -31,12 +33,14 @@ PERFORMANCE_THRESHOLDS = {
     'CTR_EXCELLENT': 0.03,      # 3%
     'CTR_GOOD': 0.025,          # 2.5%
     'CTR_AVERAGE': 0.02,        # 2%
+    'CTR_FAIR': 0.015,          # 1.5%
     'CTR_POOR': 0.01,           # 1%
     
     'ACOS_EXCELLENT': 0.10,     # 10%
     'ACOS_GOOD': 0.15,          # 15%
     'ACOS_AVERAGE': 0.20,       # 20%
     'ACOS_POOR': 0.30,          # 30%
+    'ACOS_CRITICAL': 0.40,      # 40%
     
     'CONVERSION_EXCELLENT': 0.08,   # 8%
     'CONVERSION_GOOD': 0.05,        # 5%
@@ -56,12 +60,24 @@ SCALE_UP_CRITERIA = {
 }
 
 # Rekomendasi Budget
+# min_change / max_change: batas perubahan budget (%) untuk optimizer
 BUDGET_RECOMMENDATIONS = {
-    'BONCOS': {'action': 'DECREASE', 'percentage': 50, 'advice': 'Turunkan 50% atau PAUSE'},
-    'RUGI': {'action': 'DECREASE', 'percentage': 30, 'advice': 'Turunkan 20-30%'},
-    'BREAK_EVEN': {'action': 'INCREASE', 'percentage': 20, 'advice': 'Naikkan 10-20%'},
-    'UNTUNG': {'action': 'INCREASE', 'percentage': 30, 'advice': 'Naikkan 20-30%'},
-    'UNTUNG TINGGI': {'action': 'INCREASE', 'percentage': 50, 'advice': 'Naikkan 50-100%'}
+    'BONCOS': {'action': 'DECREASE', 'percentage': 50, 'advice': 'Turunkan 50% atau PAUSE',
+               'min_change': -100, 'max_change': -50},
+    'RUGI': {'action': 'DECREASE', 'percentage': 30, 'advice': 'Turunkan 20-30%',
+             'min_change': -30, 'max_change': -20},
+    'BREAK_EVEN': {'action': 'INCREASE', 'percentage': 20, 'advice': 'Naikkan 10-20%',
+                   'min_change': 0, 'max_change': 20},
+    'UNTUNG': {'action': 'INCREASE', 'percentage': 30, 'advice': 'Naikkan 20-30%',
+               'min_change': 0, 'max_change': 30},
+    'UNTUNG TINGGI': {'action': 'INCREASE', 'percentage': 50, 'advice': 'Naikkan 50-100%',
+                      'min_change': 0, 'max_change': 100}
+}
+
+# Optimizer alokasi budget
+BUDGET_OPTIMIZER = {
+    'total_daily_budget': None,     # None = total Spend saat ini
+    'marginal_roas_decay': 0.85     # ROAS budget tambahan diasumsikan turun pelan
 }
 
 # Kolom Wajib Shopee
@@ -81,4 +97,138 @@ SHOPEE_DATE_FORMATS = [
     '%d/%m/%Y %H.%M.%S',
     '%d/%m/%Y %H:%M',
     '%d/%m/%Y %H.%M'
-]
\ No newline at end of file
+]
+# Deteksi anomali (EWMA per Kode Produk / campaign), state disimpan antar run
+ANOMALY_DETECTION = {
+    'enabled': False,
+    'alpha': 0.3,               # bobot snapshot terbaru
+    'z_threshold': 3.0,         # batas z-score
+    'min_observations': 3,      # minimal snapshot sebelum bisa flag
+    'state_file': 'anomaly_state.npz'
+}
+
+# History campaign (memory-mapped arrays)
+HISTORY = {
+    'enabled': False,           # simpan delta harian per campaign ke folder history
+    'directory': 'history',
+    'window_days': 7
+}
+
+# File aturan rekomendasi (JSON, atau YAML jika PyYAML terpasang)
+RULES_FILE = 'rules.json'
+
+# Laporan per segmen (satu workbook per segmen, ditulis paralel)
+# segment_by: None (satu laporan) / 'Mode_Bidding' / 'Penempatan_Iklan' / 'Status' / kolom toko
+SEGMENTED_REPORT = {
+    'segment_by': None,
+    'max_workers': None,        # None = jumlah core
+    'output_dir': None          # None = folder baru per run
+}
+
+# Dashboard HTML statis
+HTML_DASHBOARD = {
+    'enabled': True,
+    'top_n': 10,                # jumlah campaign top/bottom
+    'page_size': 100            # baris per halaman tabel campaign
+}
+
+# Service query HTTP lokal
+QUERY_SERVICE = {
+    'source': 'data_shopee.csv',    # file export atau folder berisi export
+    'host': '127.0.0.1',
+    'port': 8765,
+    'poll_interval': 5,             # detik antar pengecekan export baru
+    'default_limit': 100
+}
+
+# Cache hasil pipeline (key = hash isi data + threshold aktif)
+RESULT_CACHE = {
+    'enabled': True,
+    'max_entries': 64,
+    'max_bytes': 512 * 1024 * 1024,     # batas memory cache
+    'directory': None       # folder cache di disk antar run (pickle, hanya folder tepercaya; None = memory saja)
+}
+
+# Mode incremental: hanya campaign yang datanya berubah yang dihitung ulang
+INCREMENTAL = {
+    'enabled': False,
+    'state_file': 'incremental_state.json'
+}
+
+# Preview cepat (python run_analysis.py --preview)
+PREVIEW = {
+    'rows_per_campaign': 50,    # ukuran reservoir per campaign
+    'top_n': 20,                # baris spend terbesar yang selalu dihitung eksak
+    'chunk_size': 200000,       # baris per chunk saat streaming
+    'confidence_z': 1.96,       # 95% confidence interval
+    'seed': None
+}
+
+# Cube agregasi multi-dimensi (dimensi turunan tanggal: Minggu, Bulan, Hari)
+CUBE = {
+    'dimensions': ['Campaign', 'Mode_Bidding', 'Penempatan_Iklan', 'Status_Iklan',
+                   'Kode_Produk', 'Tanggal'],
+    'report_rollups': {
+        'Cube_Bidding_Minggu': ['Mode_Bidding', 'Minggu'],
+        'Cube_Penempatan': ['Penempatan_Iklan'],
+        'Cube_Status_Iklan': ['Status_Iklan'],
+        'Cube_Produk': ['Kode_Produk']
+    }
+}
+
+# Load CSV paralel (rentang byte per proses, hasil lewat shared memory)
+PARALLEL_LOAD = {
+    'enabled': False,
+    'workers': None,            # None = semua core
+    'min_bytes': 64 * 1024 * 1024   # file lebih kecil di-load biasa
+}
+
+# Batas memory pipeline (None = selalu in-memory); di atas budget -> chunk + spill ke disk
+MEMORY_BUDGET = {
+    'budget_bytes': None,       # mis. 2 * 1024 ** 3 untuk VM 4 GB
+    'chunk_rows': 200000,
+    'sample_rows': 5000,        # baris awal untuk perkiraan memory
+    'spill_dir': None           # None = folder temp sistem
+}
+
+# Engine dataframe: 'pandas', 'pyarrow', 'polars' atau 'auto' (yang tersedia);
+# kembali ke pandas otomatis jika package tidak terinstall
+BACKEND = {
+    'engine': 'pandas',
+    'parquet_dir': None         # folder output Parquet (None = tidak ditulis)
+}
+
+# Mode snapshot: export kumulatif (sejak Tanggal Mulai) -> baris interval antar export
+SNAPSHOT = {
+    'enabled': False,
+    'state_file': 'snapshot_state.npz',
+    'intervals_file': 'snapshot_intervals.csv'
+}
+
+# Index identitas campaign: nama dinormalisasi / Kode Produk -> Campaign_ID stabil
+CAMPAIGN_IDENTITY = {
+    'enabled': False,
+    'file': 'campaign_ids.json'
+}
+
+# Katalog produk lokal (CSV: Kode Produk, HPP, Margin, Kategori) -> COGS & break-even ROAS
+PRODUCT_CATALOG = {
+    'file': None,                       # None = profit tanpa HPP (Sales - Spend)
+    'cache_file': 'catalog_cache.npz'   # index katalog, dibangun ulang jika file berubah
+}
+
+# Pipeline lazy: target -> hanya node yang dibutuhkan yang dihitung
+# workers > 1: node independen (mis. campaign vs daily summary) dihitung bersamaan
+# State antar run (anomali, history, snapshot, incremental, identitas) hanya ditulis
+# oleh target yang memuat node history_trends / intervals / save_state
+PIPELINE = {
+    'workers': 1,
+    'targets': {
+        'full': ['daily_summary', 'hourly_heatmap', 'analysis_results', 'budget_plan', 'history_trends',
+                 'changes', 'cube_rollups', 'display', 'plans', 'report_file', 'dashboard_file',
+                 'parquet_files', 'save_state'],
+        'status': ['display'],
+        'report': ['report_file', 'save_state'],
+        'budget': ['budget_plan']
+    }
+}
@@ -2,8 +2,30 @@
 Jadwal monitoring iklan berdasarkan waktu pemasangan
 """
 
+import sys
+import heapq
+import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
 
+from config import DAILY_SCHEDULE
+
+# Checkpoint per campaign: (nama, hari ke-N jam window) atau (nama, N jam setelah mulai)
+CHECKPOINTS = [
+    {'action': 'ANALISIS PERTAMA', 'day': 1, 'hour': DAILY_SCHEDULE['morning']['start'],
+     'check': 'Impressions > 0? Iklan live? Budget mulai terserap?'},
+    {'action': 'CEK PERFORMANCE SEMENTARA', 'day': 1, 'hour': DAILY_SCHEDULE['noon']['start'],
+     'check': 'CTR berapa? Ada klik? Budget absorption?'},
+    {'action': 'EVALUASI HARIAN PERTAMA', 'day': 1, 'hour': DAILY_SCHEDULE['evening']['start'],
+     'check': 'Total impressions, clicks, CTR akhir, konversi'},
+    {'action': 'ANALISIS 48 JAM', 'hours': 48,
+     'check': 'Total konversi, ROAS awal, conversion rate'},
+    {'action': 'EXECUTE SCALE UP/DOWN', 'day': 3, 'hour': DAILY_SCHEDULE['morning']['start'],
+     'check': 'Scale up jika ROAS > 1.2 & CTR > 2%, scale down jika ROAS < 0.8 & CTR < 1%'},
+    {'action': 'ANALISIS KOMPREHENSIF', 'day': 7, 'hour': DAILY_SCHEDULE['morning']['start'],
+     'check': 'ROAS 7-hari, CTR average, total konversi, total profit'}
+]
+
 def get_monitoring_schedule(start_time):
     """
     Generate jadwal monitoring berdasarkan waktu mulai
@@ -118,17 +140,135 @@ def print_schedule(schedule):
         if 'decision' in item:
             print(f"   🤔 Decision: {item['decision']}")
 
-# Generate schedule untuk iklan yang dipasang sekarang
-now = datetime.now()
-schedule = get_monitoring_schedule(now)
+def get_checkpoint_times(start_times):
+    """Waktu semua checkpoint untuk array waktu mulai (campaign x checkpoint, datetime64[ns])"""
+    starts = pd.to_datetime(pd.Series(start_times)).to_numpy(dtype='datetime64[ns]')
+    days = starts.astype('datetime64[D]').astype('datetime64[ns]')
+    hour = np.timedelta64(1, 'h')
+    
+    due = np.empty((len(starts), len(CHECKPOINTS)), dtype='datetime64[ns]')
+    for i, checkpoint in enumerate(CHECKPOINTS):
+        if 'hours' in checkpoint:
+            due[:, i] = starts + checkpoint['hours'] * hour
+        else:
+            due[:, i] = days + np.timedelta64(checkpoint['day'], 'D') + checkpoint['hour'] * hour
+    
+    # Jangan jadwalkan di window reset learning (00:00-01:00) -> geser ke akhir window
+    midnight = DAILY_SCHEDULE['midnight']
+    hour_of_day = (due - due.astype('datetime64[D]')) // hour
+    in_reset = (hour_of_day >= midnight['start']) & (hour_of_day < midnight['end'])
+    due[in_reset] = due[in_reset].astype('datetime64[D]') + midnight['end'] * hour
+    return due
 
-print_schedule(schedule)
+class MonitoringQueue:
+    """Priority queue (heap) checkpoint monitoring semua campaign, urut waktu jatuh tempo"""
+    
+    def __init__(self, campaigns=(), start_times=()):
+        self.campaigns = list(campaigns)
+        self.heap = []
+        if self.campaigns:
+            self.add_campaigns(self.campaigns, start_times, append=False)
+    
+    @classmethod
+    def from_data(cls, df):
+        """Queue dari cleaned data: waktu mulai = Tanggal (Tanggal Mulai) paling awal per campaign"""
+        # Baris tanpa campaign dilewati (factorize memberi kode -1 untuk NaN)
+        data = df[df['Tanggal'].notna() & df['Campaign'].notna()]
+        codes, campaigns = pd.factorize(data['Campaign'])
+        times = data['Tanggal'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        starts = np.full(len(campaigns), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(starts, codes, times)
+        return cls(campaigns, starts.view('datetime64[ns]'))
+    
+    def add_campaigns(self, campaigns, start_times, append=True):
+        """Tambah checkpoint campaign baru (heapify sekali, O(n))"""
+        offset = len(self.campaigns) if append else 0
+        if append:
+            self.campaigns.extend(campaigns)
+        due = get_checkpoint_times(start_times).view(np.int64)
+        campaign_ids = np.repeat(np.arange(offset, offset + len(due)), len(CHECKPOINTS))
+        checkpoint_ids = np.tile(np.arange(len(CHECKPOINTS)), len(due))
+        self.heap.extend(zip(due.ravel().tolist(), campaign_ids.tolist(), checkpoint_ids.tolist()))
+        heapq.heapify(self.heap)
+    
+    def __len__(self):
+        return len(self.heap)
+    
+    def _item(self, entry):
+        due, campaign_id, checkpoint_id = entry
+        checkpoint = CHECKPOINTS[checkpoint_id]
+        return {
+            'Due': pd.Timestamp(due),
+            'Campaign': self.campaigns[campaign_id],
+            'Action': checkpoint['action'],
+            'Check': checkpoint['check']
+        }
+    
+    def next_due(self):
+        """Waktu checkpoint berikutnya (None jika queue kosong)"""
+        return pd.Timestamp(self.heap[0][0]) if self.heap else None
+    
+    def pop_due(self, now=None):
+        """Ambil semua checkpoint yang sudah jatuh tempo (O(k log n))
+        
+        Checkpoint lama yang terlewat untuk campaign yang sama digantikan oleh
+        yang paling baru (kolom Skipped = jumlah yang dilewati).
+        """
+        now = pd.Timestamp(now or datetime.now()).value
+        entries = []
+        while self.heap and self.heap[0][0] <= now:
+            entries.append(heapq.heappop(self.heap))
+        if not entries:
+            return pd.DataFrame(columns=['Due', 'Campaign', 'Action', 'Check', 'Skipped'])
+        
+        due = pd.DataFrame([self._item(entry) for entry in entries])
+        due['Campaign_Index'] = [entry[1] for entry in entries]
+        due['Skipped'] = due.groupby('Campaign_Index').cumcount()
+        latest = due.drop_duplicates('Campaign_Index', keep='last')
+        return latest.drop(columns='Campaign_Index').reset_index(drop=True)
+    
+    def upcoming(self, n=10):
+        """N checkpoint berikutnya tanpa mengubah queue"""
+        return pd.DataFrame([self._item(entry) for entry in heapq.nsmallest(n, self.heap)])
 
-print("\n" + "="*70)
-print("📌 KESIMPULAN:")
-print("="*70)
-print("1. Analisis pertama: BESOK PAGI (07:00-09:00)")
-print("2. Analisis bermakna: SETELAH 48 JAM")
-print("3. Analisis komprehensif: SETELAH 7 HARI")
-print("4. JANGAN analisis: MALAM INI (00:00-01:00)")
-print("="*70)
\ No newline at end of file
+def print_monitoring_queue(queue, now=None):
+    """Print checkpoint yang perlu dicek sekarang & berikutnya"""
+    print("="*70)
+    print(f"📋 MONITORING QUEUE ({len(queue.campaigns)} campaign, {len(queue)} checkpoint)")
+    print("="*70)
+    
+    due = queue.pop_due(now)
+    print(f"\n🔔 PERLU DICEK SEKARANG ({len(due)} campaign):")
+    for _, row in due.iterrows():
+        skipped = f" (+{row['Skipped']} terlewat)" if row['Skipped'] else ""
+        print(f"   • {str(row['Campaign'])[:40]}: {row['Action']}{skipped}")
+        print(f"     ✓ {row['Check']}")
+    
+    print("\n⏭️ BERIKUTNYA:")
+    for _, row in queue.upcoming(5).iterrows():
+        print(f"   {row['Due']:%Y-%m-%d %H:%M} | {str(row['Campaign'])[:40]}: {row['Action']}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Queue per campaign dari file export: python monitoring_schedule.py data_shopee.csv
+        from shopee_data_processor import ShopeeDataProcessor
+        processor = ShopeeDataProcessor()
+        raw_data = processor.load_data(sys.argv[1])
+        if raw_data is not None:
+            print_monitoring_queue(MonitoringQueue.from_data(processor.clean_data(raw_data)))
+        sys.exit()
+    
+    # Generate schedule untuk iklan yang dipasang sekarang
+    now = datetime.now()
+    schedule = get_monitoring_schedule(now)
+    
+    print_schedule(schedule)
+    
+    print("\n" + "="*70)
+    print("📌 KESIMPULAN:")
+    print("="*70)
+    print("1. Analisis pertama: BESOK PAGI (07:00-09:00)")
+    print("2. Analisis bermakna: SETELAH 48 JAM")
+    print("3. Analisis komprehensif: SETELAH 7 HARI")
+    print("4. JANGAN analisis: MALAM INI (00:00-01:00)")
+    print("="*70)
\ No newline at end of file
@@ -12,8 +12,24 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from shopee_data_processor import ShopeeDataProcessor
-from shopee_analyzer import ShopeeAdAnalyzer
 from shopee_report_generator import ShopeeReportGenerator
+from shopee_budget_optimizer import ShopeeBudgetOptimizer
+from shopee_anomaly_detector import ShopeeAnomalyDetector
+from shopee_history_store import ShopeeHistoryStore
+from shopee_report_diff import ShopeeReportDiff
+from shopee_html_dashboard import ShopeeHtmlDashboard
+from shopee_incremental import ShopeeIncrementalUpdater
+from shopee_preview import ShopeePreview
+from shopee_cube import ShopeeCube
+from shopee_parallel_loader import ShopeeParallelLoader
+from shopee_spill import ShopeeSpillExecutor
+from shopee_snapshot import ShopeeSnapshotIngestor
+from shopee_identity import ShopeeCampaignIdentity
+from shopee_pipeline import ShopeePipeline
+from shopee_setup import build_analyzer, enrich_processed_data
+from shopee_metrics import PROFIT_LABELS, profit_total
+from config import SEGMENTED_REPORT, HTML_DASHBOARD, INCREMENTAL, PARALLEL_LOAD, MEMORY_BUDGET, BACKEND, \
+    SNAPSHOT, ANOMALY_DETECTION, HISTORY, CAMPAIGN_IDENTITY
 
 def main():
     """Main function"""
@@ -24,8 +40,7 @@ def main():
     
     # 1. Initialize components
     processor = ShopeeDataProcessor()
-    analyzer = ShopeeAdAnalyzer(processor)
-    report_generator = ShopeeReportGenerator()
+    print(f"⚙️ Engine dataframe: {processor.backend.engine}")
     
     # 2. Get input file
     input_file = get_input_file()
@@ -34,71 +49,66 @@ def main():
         print("❌ No input file provided. Exiting.")
         return
     
-    # 3. Load and process data
-    print(f"\n📂 Processing: {input_file}")
-    raw_data = processor.load_data(input_file)
-    
-    if raw_data is None or raw_data.empty:
-        print("❌ No data to analyze")
+    # Preview cepat: sample + estimasi, tanpa pipeline & laporan lengkap
+    if '--preview' in sys.argv:
+        ShopeePreview(processor).run(input_file)
         return
     
-    # 4. Clean data
-    cleaned_data = processor.clean_data(raw_data)
-    
-    # 5. Calculate metrics
-    processed_data = processor.calculate_additional_metrics(cleaned_data)
-    
-    # 6. Get summaries
-    campaign_summary = processor.get_campaign_summary(processed_data)
-    daily_summary = processor.get_daily_summary(processed_data)
-    
-    # 7. Analyze campaigns
-    analysis_results = analyzer.analyze_campaigns(campaign_summary)
-    
-    # 8. Display analysis
-    display_analysis(analysis_results, campaign_summary)
-    
-    # 9. Get current time for planning
-    now = datetime.now()
-    current_hour = now.hour
-    current_day = now.weekday() + 1  # Monday = 1
-    
-    print(f"\n📅 Analysis Date: {now.strftime('%Y-%m-%d')}")
-    print(f"⏰ Current Time: {current_hour:02d}:00")
-    print(f"📆 Day of Week: {current_day}")
+    # Target pipeline: --only=status / --only=campaign_summary,budget_plan (default: full)
+    targets = next((arg.split('=', 1)[1] for arg in sys.argv if arg.startswith('--only=')), 'full')
+    pipeline = build_pipeline(processor, input_file)
+    try:
+        pipeline.plan(targets)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
     
-    # 10. Generate daily and weekly plans
-    analyzer.generate_daily_plan(current_hour)
-    analyzer.generate_weekly_plan(current_day)
+    # 3-5. Load, clean & metrics (dibutuhkan semua target)
+    if pipeline.get('data') is None:
+        print("❌ No data to analyze")
+        return
     
-    # 11. Generate Excel report
-    print("\n" + "="*70)
-    print("💾 GENERATING COMPREHENSIVE REPORT")
-    print("="*70)
+    # 6-11. Hanya node yang dibutuhkan target yang dihitung
+    pipeline.run(targets)
     
-    report_file = report_generator.generate_excel_report(
-        raw_data=raw_data,
-        cleaned_data=cleaned_data,
-        analysis_results=analysis_results,
-        campaign_summary=campaign_summary,
-        daily_summary=daily_summary
-    )
+    if 'report_file' not in pipeline.results:
+        print("\n" + "="*70)
+        print(f"🎯 ANALYSIS COMPLETE! (target: {', '.join(pipeline.resolve_targets(targets))})")
+        print("="*70)
+        return
+    report_file = pipeline.results['report_file']
+    dashboard_file = pipeline.results.get('dashboard_file')
     
     # 12. Final summary
     print("\n" + "="*70)
     print("🎯 ANALYSIS COMPLETE!")
     print("="*70)
     
-    print(f"\n📁 Report saved: {report_file}")
-    print("\n📋 Sheets included:")
-    print("1. Raw_Data - Data original dari Shopee")
-    print("2. Cleaned_Data - Data yang sudah dibersihkan")
-    print("3. Campaign_Analysis - Analisis detail per campaign")
-    print("4. Campaign_Summary - Ringkasan performa")
-    print("5. Daily_Summary - Performa harian")
-    print("6. Recommendations - Rekomendasi tindakan")
-    print("7. Strategy_Guide - Panduan strategi harian & mingguan")
-    print("8. Performance_Dashboard - Dashboard performa")
+    if report_file:
+        print(f"\n📁 Report saved: {report_file}")
+    else:
+        print("\n⚠️ Report not generated")
+    if dashboard_file:
+        print(f"🌐 Dashboard: {dashboard_file}")
+    if SEGMENTED_REPORT['segment_by']:
+        # Daftar sheet di bawah hanya untuk mode satu workbook
+        if report_file:
+            print(f"📂 Segment workbooks per {SEGMENTED_REPORT['segment_by']} + index workbook")
+    else:
+        print("\n📋 Sheets included:")
+        print("1. Raw_Data - Data original dari Shopee (hanya kolom yang dipakai analisis)")
+        print("2. Cleaned_Data - Data yang sudah dibersihkan")
+        print("3. Campaign_Analysis - Analisis detail per campaign")
+        print("4. Campaign_Summary - Ringkasan performa")
+        print("5. Daily_Summary - Performa harian")
+        print("6. Recommendations - Rekomendasi tindakan")
+        print("7. Strategy_Guide - Panduan strategi harian & mingguan")
+        print("8. Performance_Dashboard - Dashboard performa")
+        print("9. Hour_Heatmap - Performa per hari & jam mulai campaign / snapshot (window 07-09 / 20-22)")
+        print("10. Budget_Plan - Alokasi ulang budget harian antar campaign")
+        print("11. History_Trends - ROAS 7 hari & pertumbuhan berturut-turut")
+        print("12. Changes - Perubahan dibanding laporan sebelumnya")
+        print("13. Cube_* - Rollup per bidding/minggu, penempatan, status iklan & produk")
     
     print("\n🚀 NEXT STEPS:")
     print("1. Buka file Excel untuk melihat laporan lengkap")
@@ -110,6 +120,215 @@ def main():
     if os.name == 'nt':
         input("\nPress Enter to exit...")
 
+def build_pipeline(processor, input_file):
+    """Tahap processor, analyzer & report sebagai node ShopeePipeline"""
+    history = ShopeeHistoryStore() if HISTORY['enabled'] else None
+    analyzer = build_analyzer(processor, history=history)
+    rules_engine = analyzer.rules_engine
+    cache = analyzer.cache
+    report_generator = ShopeeReportGenerator()
+    budget_optimizer = ShopeeBudgetOptimizer(rules_engine=rules_engine)
+    anomaly_detector = ShopeeAnomalyDetector() if ANOMALY_DETECTION['enabled'] else None
+    report_diff = ShopeeReportDiff()
+    incremental = ShopeeIncrementalUpdater(processor) if INCREMENTAL['enabled'] else None
+    identity = ShopeeCampaignIdentity() if CAMPAIGN_IDENTITY['enabled'] else None
+    pipeline = ShopeePipeline()
+    
+    @pipeline.node('data')
+    def load_data():
+        """raw_data, cleaned_data & processed_data (None jika tidak ada data)"""
+        # 3. Load and process data
+        print(f"\n📂 Processing: {input_file}")
+        spill = ShopeeSpillExecutor(processor) if MEMORY_BUDGET['budget_bytes'] else None
+        if spill is not None and spill.should_spill(input_file):
+            # Export melebihi budget memory: per chunk + partisi di disk. Raw/cleaned
+            # tidak pernah dimuat utuh (sheet Raw_Data & Cleaned_Data dilewati),
+            # summary dihitung dari kolom yang dibaca ulang dari partisi
+            spill.run(input_file)
+            raw_data = cleaned_data = None
+            processed_data = spill.read_columns()
+            spill.cleanup()
+            if processed_data.empty:
+                return None
+        else:
+            if PARALLEL_LOAD['enabled']:
+                # Load + clean per rentang byte di beberapa proses (clean sudah termasuk)
+                raw_data, cleaned_data = ShopeeParallelLoader(processor).load(input_file)
+            else:
+                raw_data = processor.load_data(input_file)
+                cleaned_data = None
+            
+            if raw_data is None or raw_data.empty:
+                return None
+            
+            # 4. Clean data
+            if cleaned_data is None:
+                cleaned_data = processor.clean_data(raw_data)
+            
+            # 5. Calculate metrics
+            processed_data = processor.calculate_additional_metrics(cleaned_data)
+        
+        processed_data = enrich_processed_data(processor, processed_data, identity=identity)
+        # Waktu export = waktu modifikasi file (export Shopee tidak mencatat waktu export)
+        export_time = datetime.fromtimestamp(os.path.getmtime(input_file))
+        return {'raw_data': raw_data, 'cleaned_data': cleaned_data, 'processed_data': processed_data,
+                'export_time': export_time}
+    
+    # 6. Get summaries
+    @pipeline.node('campaign_summary', 'data')
+    def campaign_summary(data):
+        if incremental is not None:
+            # Hanya campaign yang datanya berubah sejak run sebelumnya yang dihitung ulang
+            return incremental.update_summary(data['processed_data'], rules=rules_engine.rules)
+        return analyzer.summarize(data['processed_data'])
+    
+    @pipeline.node('intervals', 'data')
+    def intervals(data):
+        """Semua interval snapshot (None jika mode snapshot tidak aktif)"""
+        if not SNAPSHOT['enabled']:
+            return None
+        # Export kumulatif: delta antar snapshot (tidak double-count)
+        snapshot = ShopeeSnapshotIngestor()
+        show_snapshot_intervals(snapshot.ingest(data['processed_data']))
+        return snapshot.load_intervals()
+    
+    @pipeline.node('daily_summary', 'data', 'intervals')
+    def daily_summary(data, intervals):
+        if intervals is not None:
+            return processor.get_daily_summary(intervals)
+        return processor.get_daily_summary(data['processed_data'])
+    
+    @pipeline.node('hourly_heatmap', 'data', 'intervals')
+    def hourly_heatmap(data, intervals):
+        if intervals is not None:
+            # Jam aktivitas dari waktu snapshot, bukan jam mulai campaign
+            return processor.get_hourly_heatmap(intervals, basis='snapshot')
+        return processor.get_hourly_heatmap(data['processed_data'])
+    
+    # 7. Detect anomalies & analyze campaigns
+    @pipeline.node('anomalies', 'data')
+    def anomalies(data):
+        if anomaly_detector is None:
+            return None
+        # State EWMA baru disimpan di node save_state (target read-only tidak menulis)
+        return anomaly_detector.update(data['processed_data'], snapshot_time=data['export_time'],
+                                       save=False)
+    
+    @pipeline.node('analysis_results', 'campaign_summary', 'anomalies')
+    def analysis_results(summary, anomalies):
+        if incremental is not None:
+            return incremental.update_analysis(analyzer, anomalies=anomalies)
+        return analyzer.analyze_campaigns(summary, anomalies=anomalies)
+    
+    @pipeline.node('budget_plan', 'campaign_summary')
+    def budget_plan(summary):
+        if cache is not None:
+            return cache.cached('budget_plan', [summary], lambda: budget_optimizer.optimize(summary))
+        return budget_optimizer.optimize(summary)
+    
+    @pipeline.node('history_trends', 'data', 'campaign_summary')
+    def history_trends(data, summary):
+        if history is None:
+            return None
+        # Tanggal history = tanggal export, bukan tanggal analisis dijalankan
+        history.append(summary, data['export_time'].date())
+        return analyzer.get_history_trends()
+    
+    @pipeline.node('save_state', 'data', 'anomalies', 'analysis_results')
+    def save_state(data, anomalies, analysis_results):
+        """Simpan state antar run (identitas, anomali, incremental); hanya target full / report"""
+        if identity is not None:
+            identity.save()
+        if anomaly_detector is not None and anomaly_detector.changed:
+            anomaly_detector.save_state()
+        if incremental is not None:
+            incremental.save()
+    
+    pipeline.add('changes', report_diff.diff_with_previous, ['campaign_summary'])
+    
+    # Cube agregasi dibangun sekali; rollup lain cukup dari cube.query(...)
+    pipeline.add('cube_rollups', lambda data: ShopeeCube().build(data['processed_data']).report_rollups(),
+                 ['data'])
+    
+    # 8. Display analysis
+    pipeline.add('display', display_analysis, ['analysis_results', 'campaign_summary'])
+    
+    @pipeline.node('plans')
+    def plans():
+        # 9. Get current time for planning
+        now = datetime.now()
+        current_hour = now.hour
+        current_day = now.weekday() + 1  # Monday = 1
+        
+        print(f"\n📅 Analysis Date: {now.strftime('%Y-%m-%d')}")
+        print(f"⏰ Current Time: {current_hour:02d}:00")
+        print(f"📆 Day of Week: {current_day}")
+        
+        # 10. Generate daily and weekly plans
+        analyzer.generate_daily_plan(current_hour)
+        analyzer.generate_weekly_plan(current_day)
+    
+    @pipeline.node('report_file', 'data', 'analysis_results', 'campaign_summary', 'daily_summary',
+                   'hourly_heatmap', 'budget_plan', 'history_trends', 'changes', 'cube_rollups')
+    def report_file(data, analysis_results, campaign_summary, daily_summary, hourly_heatmap,
+                    budget_plan, history_trends, changes, cube_rollups):
+        # 11. Generate Excel report
+        print("\n" + "="*70)
+        print("💾 GENERATING COMPREHENSIVE REPORT")
+        print("="*70)
+        
+        if SEGMENTED_REPORT['segment_by']:
+            # Satu workbook per segmen, ditulis paralel + index
+            return report_generator.generate_segmented_reports(
+                raw_data=data['raw_data'],
+                cleaned_data=data['cleaned_data'],
+                processed_data=data['processed_data'],
+                analysis_results=analysis_results,
+                campaign_summary=campaign_summary,
+                processor=processor,
+                hourly_heatmap=hourly_heatmap,
+                budget_plan=budget_plan,
+                history_trends=history_trends,
+                changes=changes
+            )
+        return report_generator.generate_excel_report(
+            raw_data=data['raw_data'],
+            cleaned_data=data['cleaned_data'],
+            analysis_results=analysis_results,
+            campaign_summary=campaign_summary,
+            daily_summary=daily_summary,
+            hourly_heatmap=hourly_heatmap,
+            budget_plan=budget_plan,
+            history_trends=history_trends,
+            changes=changes,
+            cube_rollups=cube_rollups
+        )
+    
+    @pipeline.node('dashboard_file', 'analysis_results', 'campaign_summary', 'daily_summary', 'report_file')
+    def dashboard_file(analysis_results, campaign_summary, daily_summary, report_file):
+        # Dashboard HTML ringan di samping file Excel
+        if not HTML_DASHBOARD['enabled']:
+            return None
+        # Tanpa file laporan (mis. kolom segmen tidak ada) -> nama default bertimestamp
+        file_name = os.path.splitext(report_file)[0] + '_dashboard.html' if report_file else None
+        return ShopeeHtmlDashboard().generate(
+            analysis_results, campaign_summary, daily_summary, file_name=file_name
+        )
+    
+    @pipeline.node('parquet_files', 'data', 'campaign_summary', 'analysis_results', 'daily_summary')
+    def parquet_files(data, campaign_summary, analysis_results, daily_summary):
+        # Output Parquet untuk tool lain (DuckDB, notebook, BI)
+        if not BACKEND['parquet_dir']:
+            return None
+        return report_generator.generate_parquet_outputs({
+            'processed_data': data['processed_data'],
+            'campaign_summary': campaign_summary,
+            'campaign_analysis': analysis_results,
+            'daily_summary': daily_summary
+        }, BACKEND['parquet_dir'], processor.backend)
+    
+    return pipeline
+
 def get_input_file():
     """Get input file from user or auto-detect"""
     # Auto-detect common file names
@@ -145,14 +364,14 @@ def display_analysis(analysis_results, campaign_summary):
     # Overall summary
     total_spend = campaign_summary['Spend'].sum()
     total_sales = campaign_summary['Sales'].sum()
-    total_profit = campaign_summary['Profit'].sum()
+    _, profit_label, total_profit = profit_total(campaign_summary)
     avg_roas = campaign_summary['ROAS'].mean()
     
     print(f"\n📈 OVERALL SUMMARY:")
     print(f"   Total Campaigns: {len(campaign_summary)}")
     print(f"   Total Spend: Rp {total_spend:,.0f}")
     print(f"   Total Sales: Rp {total_sales:,.0f}")
-    print(f"   Total Profit: Rp {total_profit:,.0f}")
+    print(f"   Total {profit_label}: Rp {total_profit:,.0f}")
     print(f"   Average ROAS: {avg_roas:.2f}")
     
     # Campaign details
@@ -162,6 +381,8 @@ def display_analysis(analysis_results, campaign_summary):
         print(f"   Status: {row['Status']}")
         print(f"   ROAS: {row['ROAS']} | CTR: {row['CTR']} | ACOS: {row['ACOS']}")
         print(f"   Spend: {row['Spend']} | Sales: {row['Sales']} | Profit: {row['Profit']}")
+        if 'True_Profit' in row:
+            print(f"   {PROFIT_LABELS['True_Profit']}: {row['True_Profit']}")
         print(f"   Score: {row['Performance_Score']}/100 | Priority: {row['Priority']}")
         print(f"   Action: {row['Recommendations']}")
     
@@ -174,11 +395,30 @@ def display_analysis(analysis_results, campaign_summary):
         print(f"\n🔴 HIGH PRIORITY ({len(high_priority)} campaign):")
         for _, row in high_priority.iterrows():
             print(f"   • {row['Campaign'][:30]}...: {row['Recommendations']}")
+            if row.get('Anomaly'):
+                print(f"     ⚠️ Anomali: {row['Anomaly']}")
     
     if not medium_priority.empty:
         print(f"\n🟡 MEDIUM PRIORITY ({len(medium_priority)} campaign):")
         for _, row in medium_priority.iterrows():
             print(f"   • {row['Campaign'][:30]}...: {row['Recommendations']}")
 
+def show_snapshot_intervals(intervals):
+    """Display interval metrics (hanya aktivitas sejak snapshot sebelumnya)"""
+    if intervals.empty:
+        return
+    
+    window = intervals['Window'].iloc[0]
+    spend = intervals['Spend'].sum()
+    clicks = intervals['Clicks'].sum()
+    impressions = intervals['Impressions'].sum()
+    ctr = clicks / impressions if impressions > 0 else 0
+    
+    print(f"\n⏱️ INTERVAL SNAPSHOT ({window}):")
+    print(f"   Spend: Rp {spend:,.0f} | Clicks: {clicks:,.0f} | CTR: {ctr:.2%}")
+    top = intervals.nlargest(3, 'Spend')
+    for _, row in top.iterrows():
+        print(f"   • {str(row['Campaign'])[:30]}...: Spend Rp {row['Spend']:,.0f} | CTR {row['CTR']:.2%}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
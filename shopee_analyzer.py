@@ -6,58 +6,107 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from config import PERFORMANCE_THRESHOLDS
+from shopee_metrics import ADDITIVE_METRICS, DIRECT_METRICS, format_rupiah
+from shopee_rules_engine import campaign_status, status_input
+
 class ShopeeAdAnalyzer:
     """Class untuk analisis iklan Shopee"""
     
-    def __init__(self, processor):
+    def __init__(self, processor, history=None, rules_engine=None, cache=None):
         self.processor = processor
-        self.raw_data = None
-        self.cleaned_data = None
-        self.campaign_summary = None
+        self.history = history
+        self.rules_engine = rules_engine
+        self.cache = cache
+    
+    def _cached(self, kind, frames, compute):
+        """Hasil dari ShopeeResultCache jika ada (key = isi data + config + rules)"""
+        if self.cache is None:
+            return compute()
+        rules = self.rules_engine.rules if self.rules_engine is not None else None
+        return self.cache.cached(kind, frames, compute, extra=rules)
+    
+    def summarize(self, df):
+        """Campaign summary dari data yang sudah diproses (memoized)"""
+        # Key hanya dari kolom yang dipakai get_campaign_summary
+        used = [c for c in ['Campaign', 'Campaign_ID'] + ADDITIVE_METRICS + DIRECT_METRICS if c in df.columns]
+        return self._cached('campaign_summary', [df[used]], lambda: self.processor.get_campaign_summary(df))
+    
+    def get_history_trends(self, days=None):
+        """Tren campaign dari ShopeeHistoryStore (ROAS rolling, growth)"""
+        if self.history is None:
+            return pd.DataFrame()
+        return self.history.trend_summary(days)
         
-    def analyze_campaigns(self, df):
-        """Analisis mendalam semua campaign"""
+    def analyze_campaigns(self, df, anomalies=None):
+        """Analisis mendalam semua campaign (memoized per isi data)"""
         print("\n" + "="*60)
         print("📊 DETAILED CAMPAIGN ANALYSIS")
         print("="*60)
-        
+        return self._cached('analysis', [df, anomalies],
+                            lambda: self._analyze_campaigns(df, anomalies))
+    
+    def _analyze_campaigns(self, df, anomalies=None):
+        """Analisis tanpa cache"""
         analysis_results = []
         
-        for _, campaign in df.iterrows():
+        # Status dari rules engine (rules file + ladder bawaan), sama dengan Campaign_Summary
+        statuses = campaign_status(df, self.rules_engine)
+        
+        # Rules engine: semua rule dievaluasi sekaligus (vectorized)
+        rule_results = None
+        if self.rules_engine is not None and self.rules_engine.rules:
+            # Dengan HPP: kondisi ROAS di rule dibaca sebagai Margin_ROAS (break-even tetap 1.0)
+            rule_results = self.rules_engine.evaluate(status_input(df)).to_dict('records')
+        
+        # Anomali dari ShopeeAnomalyDetector -> otomatis HIGH priority
+        anomaly_notes = {}
+        if anomalies is not None and not anomalies.empty:
+            for campaign_name, group in anomalies.groupby('Campaign', sort=False):
+                anomaly_notes[campaign_name] = ', '.join(
+                    f"{metric} z={z:.1f}" for metric, z in zip(group['Metric'], group['Z_Score'])
+                )
+        
+        for i, (_, campaign) in enumerate(df.iterrows()):
             campaign_name = campaign['Campaign']
             roas = campaign.get('ROAS', 0)
             ctr = campaign.get('CTR', 0)
             acos = campaign.get('ACOS', 0)
             spend = campaign.get('Spend', 0)
             sales = campaign.get('Sales', 0)
+            # ROAS dibanding break-even produk (Margin_ROAS = Gross_Profit / Spend, balik modal = 1)
+            # HPP tidak diketahui (NaN) -> ROAS biasa, sama dengan status_input
+            roas_level = campaign.get('Margin_ROAS', roas)
+            if pd.isna(roas_level):
+                roas_level = roas
             
-            # Status berdasarkan ROAS
-            if spend == 0:
-                status = 'TIDAK AKTIF'
-                priority = 'MEDIUM'
-            elif roas < 0.5:
-                status = 'BONCOS'
-                priority = 'HIGH'
-            elif roas < 1:
-                status = 'RUGI'
-                priority = 'HIGH'
-            elif roas < 1.2:
-                status = 'BREAK EVEN'
-                priority = 'MEDIUM'
-            elif roas < 2:
-                status = 'UNTUNG'
-                priority = 'LOW'
-            else:
-                status = 'UNTUNG TINGGI'
-                priority = 'LOW'
+            status = statuses['Status'].iat[i]
+            priority = statuses['Level'].iat[i] or 'MEDIUM'
             
             # Rekomendasi berdasarkan status
             recommendations = self._get_recommendations(status, roas, ctr, acos, spend, sales)
             
+            # Rekomendasi dari rule group 'status' yang match (status sudah dari rule yang sama)
+            extra_rules = {}
+            if rule_results is not None:
+                rule = rule_results[i]
+                if rule.get('Rule_Status'):
+                    recommendations = {
+                        'action': rule.get('Action_Status') or recommendations['action'],
+                        'budget': rule.get('Budget_Status') or recommendations['budget'],
+                        'focus': rule.get('Focus_Status') or recommendations['focus']
+                    }
+                extra_rules = {column: value for column, value in rule.items()
+                               if column != 'Campaign' and not column.endswith('_Status')}
+            
+            anomaly = anomaly_notes.get(campaign_name, '')
+            if anomaly:
+                priority = 'HIGH'
+            
             # Score performa (0-100)
-            score = self._calculate_performance_score(roas, ctr, acos)
+            score = self._calculate_performance_score(roas_level, ctr, acos)
             
-            analysis_results.append({
+            result = {
                 'Campaign': campaign_name,
                 'Status': status,
                 'ROAS': roas,
@@ -71,7 +120,18 @@ class ShopeeAdAnalyzer:
                 'Recommendations': recommendations['action'],
                 'Budget_Advice': recommendations['budget'],
                 'Focus_Area': recommendations['focus']
-            })
+            }
+            if 'True_Profit' in campaign:
+                # Profit setelah HPP di samping Profit (Sales - Spend); N/A jika HPP tidak diketahui
+                result['True_Profit'] = format_rupiah(campaign['True_Profit'])
+            if 'Break_Even_ROAS' in campaign:
+                # NaN = margin <= 0 (tidak ada ROAS yang balik modal) atau HPP tidak diketahui
+                break_even = campaign['Break_Even_ROAS']
+                result['Break_Even_ROAS'] = round(break_even, 2) if pd.notna(break_even) else 'N/A'
+            result.update(extra_rules)
+            if anomalies is not None:
+                result['Anomaly'] = anomaly
+            analysis_results.append(result)
         
         return pd.DataFrame(analysis_results)
     
@@ -84,7 +144,8 @@ class ShopeeAdAnalyzer:
                 'focus': 'Aktivasi campaign'
             },
             'BONCOS': {
-                'action': 'HENTIKAN SEMENTARA! ROAS < 0.5. Revisi total creatives & targeting',
+                'action': f"HENTIKAN SEMENTARA! ROAS < {PERFORMANCE_THRESHOLDS['ROAS_CRITICAL']}. "
+                          "Revisi total creatives & targeting",
                 'budget': 'Turunkan 50% atau PAUSE',
                 'focus': 'Total Revamp'
             },
@@ -117,47 +178,48 @@ class ShopeeAdAnalyzer:
         })
     
     def _calculate_performance_score(self, roas, ctr, acos):
-        """Hitung score performa (0-100)"""
+        """Hitung score performa (0-100) dari PERFORMANCE_THRESHOLDS"""
+        thresholds = PERFORMANCE_THRESHOLDS
         score = 0
         
         # ROAS score (max 40)
-        if roas >= 2:
+        if roas >= thresholds['ROAS_EXCELLENT']:
             score += 40
-        elif roas >= 1.5:
+        elif roas >= thresholds['ROAS_GOOD']:
             score += 35
-        elif roas >= 1.2:
+        elif roas >= thresholds['ROAS_BREAK_EVEN']:
             score += 30
-        elif roas >= 1:
+        elif roas >= thresholds['ROAS_MINIMUM']:
             score += 20
-        elif roas >= 0.5:
+        elif roas >= thresholds['ROAS_CRITICAL']:
             score += 10
         else:
             score += 0
         
         # CTR score (max 30)
-        if ctr >= 0.03:  # 3%
+        if ctr >= thresholds['CTR_EXCELLENT']:
             score += 30
-        elif ctr >= 0.025:  # 2.5%
+        elif ctr >= thresholds['CTR_GOOD']:
             score += 25
-        elif ctr >= 0.02:  # 2%
+        elif ctr >= thresholds['CTR_AVERAGE']:
             score += 20
-        elif ctr >= 0.015:  # 1.5%
+        elif ctr >= thresholds['CTR_FAIR']:
             score += 15
-        elif ctr >= 0.01:  # 1%
+        elif ctr >= thresholds['CTR_POOR']:
             score += 10
         else:
             score += 5
         
-        # ACOS score (max 30)
-        if acos <= 10:  # ACOS ≤ 10%
+        # ACOS score (max 30), ACOS di sini dalam persen
+        if acos <= thresholds['ACOS_EXCELLENT'] * 100:
             score += 30
-        elif acos <= 15:  # ACOS ≤ 15%
+        elif acos <= thresholds['ACOS_GOOD'] * 100:
             score += 25
-        elif acos <= 20:  # ACOS ≤ 20%
+        elif acos <= thresholds['ACOS_AVERAGE'] * 100:
             score += 20
-        elif acos <= 30:  # ACOS ≤ 30%
+        elif acos <= thresholds['ACOS_POOR'] * 100:
             score += 15
-        elif acos <= 40:  # ACOS ≤ 40%
+        elif acos <= thresholds['ACOS_CRITICAL'] * 100:
             score += 10
         else:
             score += 5
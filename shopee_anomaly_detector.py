@@ -0,0 +1,218 @@
+"""
+Deteksi anomali performa campaign Shopee secara streaming (EWMA)
+"""
+
+import os
+import pandas as pd
+import numpy as np
+from datetime import datetime
+
+from config import ANOMALY_DETECTION
+
+# Total kumulatif per key (dasar rasio & deteksi snapshot yang tidak berubah)
+TOTAL_COLUMNS = ['Impressions', 'Clicks', 'Sales', 'Spend']
+
+class ShopeeAnomalyDetector:
+    """Class untuk deteksi anomali CTR, CPC, ROAS & spend rate per campaign"""
+    
+    # Arah anomali: -1 = turun drastis, +1 = naik drastis, 0 = dua arah
+    metrics = ['CTR', 'CPC', 'ROAS', 'Spend_Rate']
+    directions = np.array([-1, 1, -1, 0])
+    
+    def __init__(self, state_file=None, alpha=None, z_threshold=None, min_observations=None):
+        self.state_file = state_file or ANOMALY_DETECTION['state_file']
+        self.alpha = alpha if alpha is not None else ANOMALY_DETECTION['alpha']
+        self.z_threshold = z_threshold if z_threshold is not None else ANOMALY_DETECTION['z_threshold']
+        self.min_observations = (min_observations if min_observations is not None
+                                 else ANOMALY_DETECTION['min_observations'])
+        self.changed = False
+        self._reset_state()
+        self.load_state()
+    
+    def _reset_state(self):
+        """State kosong"""
+        n_metrics = len(self.metrics)
+        self.keys = np.array([], dtype=object)
+        self.mean = np.zeros((0, n_metrics))
+        self.var = np.zeros((0, n_metrics))
+        self.count = np.zeros((0, n_metrics), dtype=np.int32)
+        self.last_totals = np.zeros((0, len(TOTAL_COLUMNS)))    # total kumulatif terakhir per key
+        self.last_time = np.zeros(0)                            # waktu snapshot terakhir per key (detik)
+        self.flags = np.zeros((0, 5))       # anomali terakhir: key, metrik, value, expected, z
+        self._index = pd.Index(self.keys)
+    
+    def load_state(self):
+        """Load state dari file (jika ada)"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return False
+        
+        try:
+            with np.load(self.state_file, allow_pickle=False) as state:
+                keys_blob = state['keys'].tobytes().decode('utf-8')
+                self.keys = np.array(keys_blob.split('\x00') if keys_blob else [], dtype=object)
+                self.mean = state['mean'].astype(np.float64)
+                self.var = state['var'].astype(np.float64)
+                self.count = state['count']
+                self.last_totals = state['last_totals']
+                self.last_time = state['last_time']
+                self.flags = state['flags']
+            self._index = pd.Index(self.keys)
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not load anomaly state: {e}")
+            self._reset_state()
+            return False
+    
+    def save_state(self):
+        """Simpan state secara ringkas (key utf-8 ter-join, float32 untuk mean/var)"""
+        keys_blob = '\x00'.join(self.keys).encode('utf-8')
+        np.savez(
+            self.state_file,
+            keys=np.frombuffer(keys_blob, dtype=np.uint8),
+            mean=self.mean.astype(np.float32),
+            var=self.var.astype(np.float32),
+            count=self.count,
+            last_totals=self.last_totals,
+            last_time=self.last_time,
+            flags=self.flags
+        )
+    
+    def _get_keys(self, df):
+        """Key per baris: Kode Produk jika ada, selain itu campaign
+        
+        Campaign dikenali lewat Campaign_ID ("#<id>") jika index identitas aktif,
+        jadi nama iklan yang berganti tetap memakai state EWMA yang sama.
+        """
+        if 'Campaign_ID' in df.columns:
+            campaign = '#' + df['Campaign_ID'].astype(str)
+        else:
+            campaign = df['Campaign'].astype(str)
+        if 'Kode_Produk' not in df.columns:
+            return campaign
+        code = df['Kode_Produk'].astype(str).str.strip()
+        return code.where(df['Kode_Produk'].notna() & (code != ''), campaign)
+    
+    def _aggregate(self, df):
+        """Total metrik per key (baris dengan key sama dijumlah dulu) + pasangan key -> campaign"""
+        key_codes, keys = pd.factorize(self._get_keys(df).to_numpy(dtype=object))
+        totals = np.column_stack([
+            np.bincount(key_codes, weights=df[col].to_numpy(dtype=np.float64), minlength=len(keys))
+            for col in TOTAL_COLUMNS
+        ])
+        pairs = pd.DataFrame({'key': key_codes, 'Campaign': df['Campaign'].astype(str).to_numpy()})
+        return np.asarray(keys, dtype=object), totals, pairs.drop_duplicates()
+    
+    def _ensure_keys(self, keys):
+        """Index state untuk setiap key, tambahkan campaign baru"""
+        idx = self._index.get_indexer(keys)
+        new = idx < 0
+        if new.any():
+            new_keys = pd.unique(keys[new])
+            n_new = len(new_keys)
+            n_metrics = len(self.metrics)
+            self.keys = np.concatenate([self.keys, new_keys.astype(object)])
+            self.mean = np.vstack([self.mean, np.zeros((n_new, n_metrics))])
+            self.var = np.vstack([self.var, np.zeros((n_new, n_metrics))])
+            self.count = np.vstack([self.count, np.zeros((n_new, n_metrics), dtype=np.int32)])
+            self.last_totals = np.vstack([self.last_totals, np.full((n_new, len(TOTAL_COLUMNS)), np.nan)])
+            self.last_time = np.concatenate([self.last_time, np.full(n_new, np.nan)])
+            self._index = pd.Index(self.keys)
+            idx = self._index.get_indexer(keys)
+        return idx
+    
+    def update(self, df, snapshot_time=None, save=True):
+        """Update state dengan snapshot baru (data per baris) & kembalikan anomali yang terdeteksi
+        
+        Key yang total kumulatif & waktu snapshot-nya sama dengan run sebelumnya
+        (export yang sama dijalankan ulang) tidak di-update; anomali terakhirnya
+        dilaporkan ulang. State hanya disimpan jika ada key yang berubah.
+        """
+        print("\n🔎 Checking campaign anomalies...")
+        columns = ['Campaign', 'Key', 'Metric', 'Value', 'Expected', 'Z_Score']
+        
+        if df.empty:
+            return pd.DataFrame(columns=columns)
+        
+        if snapshot_time is None:
+            snapshot_time = datetime.now()
+        now = pd.Timestamp(snapshot_time).timestamp()
+        
+        # Satu update per key: key duplikat tidak saling menimpa state EWMA
+        keys, totals, pairs = self._aggregate(df)
+        idx = self._ensure_keys(keys)
+        impressions, clicks, sales, spend = totals.T
+        
+        last_time = self.last_time[idx]
+        advanced = (last_time != now) | (totals != self.last_totals[idx]).any(axis=1)
+        
+        # Spend rate (Rp/jam) sejak snapshot terakhir key ini; NaN jika belum ada / reset
+        hours = (now - last_time) / 3600
+        spend_delta = spend - self.last_totals[idx, TOTAL_COLUMNS.index('Spend')]
+        spend_rate = np.divide(spend_delta, hours, out=np.full(len(keys), np.nan),
+                               where=(hours > 0) & (spend_delta >= 0))
+        
+        values = np.column_stack([
+            np.divide(clicks, impressions, out=np.full_like(clicks, np.nan), where=impressions > 0),
+            np.divide(spend, clicks, out=np.full_like(spend, np.nan), where=clicks > 0),
+            np.divide(sales, spend, out=np.full_like(sales, np.nan), where=spend > 0),
+            spend_rate
+        ])
+        
+        mean = self.mean[idx]
+        var = self.var[idx]
+        count = self.count[idx]
+        valid = np.isfinite(values) & advanced[:, None]
+        
+        # Z-score terhadap state sebelum update
+        std = np.sqrt(var)
+        z = np.divide(values - mean, std, out=np.zeros_like(values), where=valid & (std > 0))
+        ready = valid & (count >= self.min_observations) & (std > 0)
+        breach = np.where(
+            self.directions < 0, z < -self.z_threshold,
+            np.where(self.directions > 0, z > self.z_threshold, np.abs(z) > self.z_threshold)
+        ) & ready
+        
+        # EWMA update O(1) per campaign: snapshot pertama langsung jadi mean
+        diff = values - mean
+        incr = self.alpha * diff
+        first = valid & (count == 0)
+        new_mean = np.where(first, values, mean + incr)
+        new_var = np.where(first, 0.0, (1 - self.alpha) * (var + diff * incr))
+        self.mean[idx] = np.where(valid, new_mean, mean)
+        self.var[idx] = np.where(valid, new_var, var)
+        self.count[idx] = count + valid
+        self.last_totals[idx[advanced]] = totals[advanced]
+        self.last_time[idx[advanced]] = now
+        
+        # Anomali: hasil baru untuk key yang berubah, hasil tersimpan untuk yang tidak
+        rows, cols = np.nonzero(breach)
+        new_flags = np.column_stack([idx[rows], cols, values[rows, cols], mean[rows, cols], z[rows, cols]])
+        stale = np.isin(self.flags[:, 0], idx[advanced])
+        self.flags = np.vstack([self.flags[~stale], new_flags])
+        position = pd.Series(np.arange(len(keys)), index=idx)
+        current = self.flags[np.isin(self.flags[:, 0], idx)]
+        found = pd.DataFrame({
+            'key': position[current[:, 0].astype(np.int64)].to_numpy(),
+            'Metric': np.array(self.metrics)[current[:, 1].astype(np.int64)],
+            'Value': current[:, 2],
+            'Expected': current[:, 3],
+            'Z_Score': current[:, 4]
+        })
+        
+        # changed: ada state yang perlu disimpan (save=False -> caller memanggil save_state)
+        self.changed = bool(advanced.any())
+        if not self.changed:
+            print("   ⏭️ Snapshot sama dengan run sebelumnya, state anomali tidak diubah")
+        elif save:
+            self.save_state()
+        
+        # Key produk bisa dipakai beberapa campaign -> satu baris per campaign
+        anomalies = found.merge(pairs, on='key').assign(Key=lambda d: keys[d['key'].to_numpy()])
+        anomalies = anomalies[columns]
+        
+        if anomalies.empty:
+            print("   ✅ No anomalies detected")
+        else:
+            print(f"   ⚠️ {len(anomalies)} anomalies in {anomalies['Campaign'].nunique()} campaigns")
+        
+        return anomalies
@@ -0,0 +1,186 @@
+"""
+Backend dataframe: pandas (default) atau engine berbasis Arrow (pyarrow / Polars)
+
+Engine Arrow dipakai untuk parsing CSV multithread, kernel string Arrow saat
+cleaning angka, group-by multithread untuk summary dan output Parquet.
+Hasil selalu dikembalikan sebagai DataFrame pandas biasa sehingga analyzer &
+report generator tidak perlu tahu engine yang aktif. Jika package opsional
+tidak terinstall, otomatis kembali ke pandas.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pa_csv = pc = pq = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+from config import BACKEND
+
+ENGINES = ['pandas', 'pyarrow', 'polars']
+
+# Angka yang valid setelah separator ribuan dibuang & koma desimal -> titik
+NUMBER_PATTERN = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+
+class ShopeeBackend:
+    """Class untuk operasi dataframe berat dengan engine yang bisa dipilih"""
+    
+    def __init__(self, engine=None):
+        requested = engine or BACKEND['engine']
+        self.engine = self._resolve(requested)
+        if requested not in ('auto', self.engine):
+            print(f"⚠️ Engine '{requested}' tidak tersedia, memakai {self.engine}")
+    
+    @staticmethod
+    def available():
+        """Engine yang bisa dipakai di environment ini"""
+        return [name for name, module in zip(ENGINES, [pd, pa, pl]) if module is not None]
+    
+    def _resolve(self, engine):
+        available = self.available()
+        if engine == 'auto':
+            return next(name for name in ['polars', 'pyarrow', 'pandas'] if name in available)
+        if engine not in ENGINES:
+            raise ValueError(f"Engine tidak dikenal: {engine} (pilihan: auto, {', '.join(ENGINES)})")
+        return engine if engine in available else 'pandas'
+    
+    # --- Load ---
+    
+    def read_csv(self, file_path, sep, encoding, usecols, dtype):
+        """Baca CSV (kolom di `dtype` sebagai teks, lainnya di-infer); engine Arrow
+        dengan fallback ke pandas jika gagal
+        
+        `file_path` boleh berupa stream (input terkompresi): dibaca parser pandas.
+        """
+        if self.engine != 'pandas' and isinstance(file_path, str):
+            try:
+                return self._read_csv_arrow(file_path, sep, encoding, usecols, dtype)
+            except Exception as e:
+                print(f"   ⚠️ Parser {self.engine} gagal ({e}), memakai parser pandas")
+        return pd.read_csv(file_path, sep=sep, encoding=encoding, usecols=usecols, dtype=dtype)
+    
+    def _read_csv_arrow(self, file_path, sep, encoding, usecols, dtype):
+        # Kolom teks tanpa inference ("1.410" tetap "1.410"), kolom lain di-infer engine
+        text_columns = [col for col in usecols if col in dtype]
+        if self.engine == 'polars':
+            header = list(pd.read_csv(file_path, sep=sep, encoding=encoding, nrows=0).columns)
+            positions = [header.index(col) for col in usecols]
+            df = pl.read_csv(file_path, separator=sep, columns=positions, infer_schema_length=None,
+                             schema_overrides={col: pl.String for col in text_columns},
+                             encoding='utf8' if encoding.startswith('utf-8') else 'utf8-lossy')
+            return pd.DataFrame({
+                col: pd.Series(df[name].to_numpy(), dtype='str') if df[name].dtype == pl.String
+                else df[name].to_pandas()
+                for col, name in zip(usecols, df.columns)
+            })
+        
+        table = pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(encoding=encoding),
+            parse_options=pa_csv.ParseOptions(delimiter=sep),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=usecols,
+                column_types={col: pa.string() for col in text_columns},
+                strings_can_be_null=True
+            )
+        )
+        df = table.to_pandas()
+        strings = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+        return df.astype({col: 'str' for col in strings})
+    
+    # --- Cleaning ---
+    
+    def parse_numbers(self, series, remove=('.',)):
+        """Teks angka format Indonesia -> numerik (seperti pd.to_numeric errors='coerce')
+        
+        `remove` = karakter yang dibuang (separator ribuan / '%'), koma = desimal.
+        """
+        if self.engine == 'pyarrow':
+            return self._parse_numbers_arrow(series, remove)
+        if self.engine == 'polars':
+            return self._parse_numbers_polars(series, remove)
+        
+        values = series.astype(str)
+        for token in remove:
+            values = values.str.replace(token, '', regex=False)
+        values = values.str.replace(',', '.', regex=False)
+        return pd.to_numeric(values, errors='coerce')
+    
+    def _parse_numbers_arrow(self, series, remove):
+        values = pa.array(series.astype('str'), from_pandas=True)
+        if isinstance(values, pa.ChunkedArray):
+            values = values.combine_chunks()
+        for token in remove:
+            values = pc.replace_substring(values, token, '')
+        values = pc.utf8_trim_whitespace(pc.replace_substring(values, ',', '.'))
+        valid = pc.match_substring_regex(values, NUMBER_PATTERN)
+        numbers = pc.cast(pc.if_else(valid, values, pa.scalar(None, pa.string())), pa.float64())
+        
+        # int64 jika semua nilai bulat & valid (sama dengan pd.to_numeric)
+        fractional = pc.any(pc.match_substring_regex(values, r'[.eE]')).as_py()
+        if numbers.null_count == 0 and not fractional:
+            return pd.Series(pc.cast(values, pa.int64()).to_numpy(), index=series.index)
+        return pd.Series(numbers.to_numpy(zero_copy_only=False), index=series.index)
+    
+    def _parse_numbers_polars(self, series, remove):
+        values = pl.Series(series.name, series.astype('str').to_numpy(dtype=object, na_value=None))
+        for token in remove:
+            values = values.str.replace_all(token, '', literal=True)
+        values = values.str.replace_all(',', '.', literal=True).str.strip_chars()
+        numbers = values.cast(pl.Float64, strict=False)
+        if numbers.null_count() == 0 and not values.str.contains(r'[.eE]').any():
+            return pd.Series(values.cast(pl.Int64).to_numpy(), index=series.index)
+        return pd.Series(numbers.to_numpy(), index=series.index)
+    
+    # --- Group-by ---
+    
+    def group_sum(self, df, key, columns):
+        """Jumlah kolom per key (urut key, key kosong dibuang) = groupby().sum()
+        
+        NaN ikut terjumlah jadi NaN (mis. COGS produk di luar katalog) di semua engine.
+        """
+        if self.engine == 'pandas' or df.empty:
+            return df.groupby(key)[columns].sum(skipna=False).reset_index()
+        
+        data = df[df[key].notna()]
+        keys = data[key].to_numpy(dtype=object)
+        if self.engine == 'polars':
+            frame = pl.DataFrame([pl.Series(key, keys.tolist())] +
+                                 [pl.Series(col, data[col].to_numpy()) for col in columns])
+            result = frame.group_by(key).agg([pl.col(col).sum() for col in columns]).sort(key)
+            output = {col: result[col].to_numpy() for col in result.columns}
+        else:
+            table = pa.table({key: pa.array(keys), **{col: data[col].to_numpy() for col in columns}})
+            result = table.group_by(key).aggregate([(col, 'sum') for col in columns]).sort_by(key)
+            output = {key: result[key].to_numpy()}
+            output.update({col: result[f"{col}_sum"].to_numpy() for col in columns})
+        
+        values = np.asarray(output[key])
+        if values.dtype.kind == 'M' and df[key].dtype == object:
+            values = values.astype(object)      # date32 -> datetime.date seperti .dt.date
+        summary = pd.DataFrame({key: pd.Series(values).astype(df[key].dtype)})
+        for col in columns:
+            summary[col] = output[col].astype(np.int64 if df[col].dtype.kind in 'biu' else np.float64)
+        return summary
+    
+    # --- Output ---
+    
+    def write_parquet(self, df, file_path):
+        """Simpan DataFrame ke Parquet lewat Arrow (tanpa salinan kolom numerik)"""
+        if pa is not None:
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), file_path)
+        elif pl is not None:
+            pl.DataFrame({col: df[col].to_numpy() for col in df.columns}).write_parquet(file_path)
+        else:
+            print("⚠️ Output Parquet butuh pyarrow atau polars, dilewati")
+            return None
+        return file_path
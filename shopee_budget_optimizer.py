@@ -0,0 +1,96 @@
+"""
+Optimasi alokasi budget harian antar campaign Shopee
+"""
+
+import pandas as pd
+import numpy as np
+
+from config import BUDGET_RECOMMENDATIONS, BUDGET_OPTIMIZER
+from shopee_rules_engine import campaign_status
+
+class ShopeeBudgetOptimizer:
+    """Class untuk alokasi ulang budget dengan batas total harian"""
+    
+    def __init__(self, marginal_roas_decay=None, rules_engine=None):
+        if marginal_roas_decay is None:
+            marginal_roas_decay = BUDGET_OPTIMIZER['marginal_roas_decay']
+        self.marginal_roas_decay = marginal_roas_decay
+        self.rules_engine = rules_engine
+        
+        # Band perubahan budget per status (status tanpa band = tidak diubah)
+        self.bands = {key.replace('_', ' '): (band['min_change'] / 100, band['max_change'] / 100)
+                      for key, band in BUDGET_RECOMMENDATIONS.items()}
+    
+    def optimize(self, campaign_summary, total_budget=None):
+        """Alokasikan total budget harian untuk memaksimalkan expected sales"""
+        print("\n💰 Optimizing budget allocation...")
+        
+        if campaign_summary.empty:
+            return pd.DataFrame()
+        
+        spend = campaign_summary['Spend'].to_numpy(dtype=np.float64)
+        sales = campaign_summary['Sales'].to_numpy(dtype=np.float64)
+        roas = np.divide(sales, spend, out=np.zeros_like(spend), where=spend > 0)
+        
+        if total_budget is None:
+            total_budget = BUDGET_OPTIMIZER['total_daily_budget']
+        if total_budget is None:
+            total_budget = spend.sum()
+        
+        # Batas bawah/atas per campaign dari band rekomendasi. Status dari rules
+        # engine (sama dengan Campaign_Summary), relatif terhadap break-even jika HPP diketahui
+        status = campaign_status(campaign_summary.assign(ROAS=roas), self.rules_engine)['Status'].to_numpy()
+        bands = np.array([self.bands.get(name, (0.0, 0.0)) for name in status]).reshape(-1, 2)
+        lower = spend * (1 + bands[:, 0])
+        upper = spend * (1 + bands[:, 1])
+        
+        floor_total = lower.sum()
+        if floor_total > total_budget:
+            # Budget total tidak cukup untuk batas minimum: skala turun proporsional
+            print(f"   ⚠️ Total budget < batas minimum (Rp {floor_total:,.0f}), skala proporsional")
+            scale = total_budget / floor_total if floor_total > 0 else 0
+            proposed = lower * scale
+        else:
+            # Dua segmen per campaign: [lower, spend] dengan ROAS saat ini,
+            # [spend, upper] dengan ROAS yang sudah di-decay (return menurun)
+            current_cap = np.clip(spend, lower, upper)
+            width = np.concatenate([current_cap - lower, upper - current_cap])
+            value = np.concatenate([roas, roas * self.marginal_roas_decay])
+            width[value <= 0] = 0
+            
+            # Greedy marginal-return: isi segmen dengan return tertinggi lebih dulu
+            order = np.argsort(-value, kind='stable')
+            width_sorted = width[order]
+            filled_before = np.cumsum(width_sorted) - width_sorted
+            alloc_sorted = np.clip(total_budget - floor_total - filled_before, 0, width_sorted)
+            
+            alloc = np.empty_like(alloc_sorted)
+            alloc[order] = alloc_sorted
+            n = len(spend)
+            proposed = lower + alloc[:n] + alloc[n:]
+        
+        expected_sales = (
+            roas * np.minimum(proposed, spend)
+            + roas * self.marginal_roas_decay * np.maximum(proposed - spend, 0)
+        )
+        
+        budget_plan = pd.DataFrame({
+            'Campaign': campaign_summary['Campaign'].to_numpy(),
+            'Status': status,
+            'ROAS': roas,
+            'Current_Budget': spend,
+            'Proposed_Budget': np.round(proposed),
+            'Change': np.round(proposed) - spend,
+            'Change_Pct': np.divide(proposed - spend, spend,
+                                    out=np.zeros_like(spend), where=spend > 0) * 100,
+            'Min_Budget': lower,
+            'Max_Budget': upper,
+            'Expected_Sales': expected_sales
+        })
+        
+        allocated = budget_plan['Proposed_Budget'].sum()
+        print(f"   ✅ Total budget: Rp {total_budget:,.0f} | Allocated: Rp {allocated:,.0f}")
+        print(f"   ✅ Expected sales: Rp {expected_sales.sum():,.0f} "
+              f"(current: Rp {sales.sum():,.0f})")
+        
+        return budget_plan.sort_values('Expected_Sales', ascending=False).reset_index(drop=True)
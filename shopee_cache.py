@@ -0,0 +1,184 @@
+"""
+Cache hasil pipeline Shopee berbasis hash isi data (content-addressed)
+"""
+
+import os
+import glob
+import copy
+import json
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+import config
+from config import RESULT_CACHE
+
+# Bagian config yang mempengaruhi hasil analisis
+CONFIG_KEYS = ['PERFORMANCE_THRESHOLDS', 'BUDGET_RECOMMENDATIONS', 'BUDGET_OPTIMIZER', 'SCALE_UP_CRITERIA']
+def _code_hash():
+    """Hash semua modul .py di folder ini (analisis, rules, katalog, identitas, ...)
+    
+    Cache tidak dipakai lagi jika salah satu modul berubah.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    base = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(base, '*.py'))):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def config_hash(extra=None, code_hash=None):
+    """Hash threshold & aturan yang aktif + kode modul (ikut berubah jika config diubah)
+    
+    Bisa dipakai tanpa membuat ShopeeResultCache (mis. state incremental).
+    """
+    settings = {name: getattr(config, name, None) for name in CONFIG_KEYS}
+    settings['extra'] = extra
+    settings['code'] = code_hash or _code_hash()
+    text = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+class ShopeeResultCache:
+    """Class cache LRU (memory + opsional disk) untuk summary, analisis & plan"""
+    
+    def __init__(self, max_entries=None, max_bytes=None, directory=None):
+        self.max_entries = max_entries or RESULT_CACHE['max_entries']
+        self.max_bytes = max_bytes or RESULT_CACHE['max_bytes']
+        self.directory = directory if directory is not None else RESULT_CACHE['directory']
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.code_hash = _code_hash()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+    
+    def frame_hash(self, df):
+        """Hash isi DataFrame (nilai, index, nama & tipe kolom)"""
+        digest = hashlib.blake2b(digest_size=16)
+        if df is None:
+            digest.update(b'none')
+            return digest.hexdigest()
+        digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+        for name in df.columns:
+            column = df[name]
+            if isinstance(column, pd.Series) and column.dtype.kind in 'biufcmM':
+                # Kolom numerik: byte mentah langsung (jauh lebih cepat dari hash per nilai)
+                digest.update(np.ascontiguousarray(column.to_numpy()).view(np.uint8))
+            else:
+                digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+    
+    def config_hash(self, extra=None):
+        """Hash threshold & aturan yang aktif (ikut berubah jika config diubah)"""
+        return config_hash(extra, self.code_hash)
+    
+    def make_key(self, kind, *parts):
+        """Key cache: jenis hasil + hash/nilai input"""
+        return f"{kind}-" + hashlib.blake2b(
+            '|'.join(str(p) for p in parts).encode('utf-8'), digest_size=16
+        ).hexdigest()
+    
+    def _size(self, value):
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(deep=True).sum())
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    
+    def _copy(self, value):
+        """Salinan agar caller tidak bisa mengubah isi cache"""
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return value.copy()
+        return copy.deepcopy(value)
+    
+    def _disk_path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+    
+    def get(self, key):
+        """Ambil hasil dari memory, lalu disk; None jika tidak ada"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self._copy(self.entries[key][0])
+        
+        if self.directory and os.path.exists(self._disk_path(key)):
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    value = pickle.load(f)
+                os.utime(self._disk_path(key))     # urutan LRU file di disk
+                self._store(key, value)
+                self.hits += 1
+                return self._copy(value)
+            except Exception as e:
+                print(f"⚠️ Cache file rusak, diabaikan: {e}")
+        
+        self.misses += 1
+        return None
+    
+    def _store(self, key, value):
+        size = self._size(value)
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key)[1]
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+        
+        # Evict LRU sampai kembali di bawah batas
+        while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+    
+    def put(self, key, value):
+        """Simpan hasil ke memory (dan disk jika diaktifkan)"""
+        value = self._copy(value)
+        self._store(key, value)
+        if self.directory:
+            tmp_path = self._disk_path(key) + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(key))
+            self._prune_disk()
+    
+    def _prune_disk(self):
+        """Hapus file cache terlama di disk di atas max_entries / max_bytes"""
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime_ns, stat.st_size, name))
+        files.sort(reverse=True)
+        total = 0
+        for i, (_, size, name) in enumerate(files):
+            total += size
+            if i >= self.max_entries or total > self.max_bytes:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+    
+    def cached(self, kind, frames, compute, extra=None):
+        """Hasil compute() untuk input frames, dihitung sekali per isi data + config"""
+        key = self.make_key(kind, self.config_hash(extra), *[self.frame_hash(df) for df in frames])
+        value = self.get(key)
+        if value is not None:
+            print(f"♻️ Cache hit: {kind}")
+            return value
+        value = compute()
+        if value is not None:
+            self.put(key, value)
+        return value
+    
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+    
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,155 @@
+"""
+Katalog produk lokal (Kode Produk -> HPP, margin, kategori) untuk profit sebenarnya
+"""
+
+import os
+import csv
+import numpy as np
+import pandas as pd
+
+from config import PRODUCT_CATALOG
+from shopee_backend import ShopeeBackend
+
+class ShopeeProductCatalog:
+    """Class untuk katalog produk ter-index (kode int64 terurut + cache .npz)"""
+    
+    def __init__(self, file_path=None, cache_file=None, backend=None):
+        self.file_path = file_path or PRODUCT_CATALOG['file']
+        self.cache_file = cache_file if cache_file is not None else PRODUCT_CATALOG['cache_file']
+        self.backend = backend or ShopeeBackend()
+        self.codes = np.zeros(0, dtype=np.int64)        # Kode Produk, terurut
+        self.hpp = np.zeros(0)                          # HPP per unit (NaN = tidak ada)
+        self.margin = np.zeros(0)                       # margin kotor % (NaN = tidak ada)
+        self.category_codes = np.zeros(0, dtype=np.int32)
+        self.categories = np.array([], dtype=object)
+    
+    def _signature(self):
+        stat = os.stat(self.file_path)
+        return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    
+    def load(self):
+        """Load katalog sekali: dari cache .npz jika file katalog belum berubah"""
+        if not self.file_path or not os.path.exists(self.file_path):
+            print(f"⚠️ Katalog produk tidak ditemukan: {self.file_path}")
+            return False
+        
+        if self.cache_file and self._load_cache():
+            print(f"📦 Katalog produk: {len(self.codes):,} SKU (cache)")
+            return True
+        
+        try:
+            self._parse()
+        except Exception as e:
+            print(f"❌ Error loading katalog produk: {e}")
+            return False
+        if self.cache_file:
+            self._save_cache()
+        print(f"📦 Katalog produk: {len(self.codes):,} SKU dari {self.file_path}")
+        return True
+    
+    def _parse(self):
+        """Baca file katalog (CSV: Kode Produk, HPP, Margin, Kategori)"""
+        with open(self.file_path, encoding='utf-8-sig', newline='') as f:
+            first_line = f.readline()
+        sep = max([',', ';', '\t'], key=first_line.count)
+        header = [col.strip() for col in next(csv.reader([first_line], delimiter=sep), [])]
+        if 'Kode Produk' not in header:
+            raise ValueError("Kolom 'Kode Produk' wajib ada di katalog")
+        usecols = [col for col in ['Kode Produk', 'HPP', 'Margin', 'Kategori'] if col in header]
+        df = pd.read_csv(self.file_path, sep=sep, encoding='utf-8-sig', dtype='str',
+                         usecols=lambda col: col.strip() in usecols)
+        df.columns = [col.strip() for col in df.columns]
+        
+        codes = pd.to_numeric(df['Kode Produk'].str.strip(), errors='coerce')
+        valid = codes.notna().to_numpy()
+        if not valid.all():
+            print(f"   ⚠️ {(~valid).sum()} baris dengan Kode Produk tidak valid diabaikan")
+        df = df[valid]
+        codes = codes[valid].to_numpy(dtype=np.int64)
+        
+        def number(col, remove):
+            if col not in df.columns:
+                return np.full(len(df), np.nan)
+            return self.backend.parse_numbers(df[col], remove=remove).to_numpy(dtype=np.float64)
+        
+        hpp = number('HPP', ('.',))
+        margin = number('Margin', ('%',))
+        category_codes, categories = pd.factorize(df['Kategori'] if 'Kategori' in df.columns
+                                                  else pd.Series('', index=df.index))
+        
+        # Urutkan per kode (kode duplikat: baris terakhir yang dipakai)
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        last = np.append(codes[1:] != codes[:-1], True)
+        keep = order[last]
+        self.codes = codes[last]
+        self.hpp = hpp[keep]
+        self.margin = margin[keep]
+        self.category_codes = category_codes[keep].astype(np.int32)
+        self.categories = np.asarray(categories, dtype=object)
+    
+    def _load_cache(self):
+        if not os.path.exists(self.cache_file):
+            return False
+        try:
+            with np.load(self.cache_file, allow_pickle=False) as cache:
+                if not np.array_equal(cache['signature'], self._signature()):
+                    return False
+                self.codes = cache['codes']
+                self.hpp = cache['hpp']
+                self.margin = cache['margin']
+                self.category_codes = cache['category_codes']
+                blob = cache['categories'].tobytes().decode('utf-8')
+                self.categories = np.array(blob.split('\x00') if blob else [], dtype=object)
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not load catalog cache: {e}")
+            return False
+    
+    def _save_cache(self):
+        np.savez(
+            self.cache_file,
+            signature=self._signature(),
+            codes=self.codes,
+            hpp=self.hpp,
+            margin=self.margin,
+            category_codes=self.category_codes,
+            categories=np.frombuffer('\x00'.join(map(str, self.categories)).encode('utf-8'), dtype=np.uint8)
+        )
+    
+    def lookup(self, codes):
+        """Posisi di katalog untuk setiap kode (-1 jika tidak ada), binary search"""
+        codes = np.asarray(codes, dtype=np.int64)
+        if not len(self.codes):
+            return np.full(len(codes), -1)
+        positions = np.minimum(np.searchsorted(self.codes, codes), len(self.codes) - 1)
+        return np.where(self.codes[positions] == codes, positions, -1)
+    
+    def join(self, df):
+        """Tambah HPP, Kategori & COGS per baris berdasarkan Kode_Produk"""
+        if 'Kode_Produk' not in df.columns or df.empty:
+            return df
+        
+        # Lookup hanya untuk kode unik di export, lalu disebar ke semua baris
+        row_codes, products = pd.factorize(df['Kode_Produk'])
+        numeric = pd.to_numeric(pd.Series(products, dtype='str').str.strip(), errors='coerce')
+        positions_unique = np.full(len(products), -1)
+        valid = numeric.notna().to_numpy()
+        positions_unique[valid] = self.lookup(numeric[valid].to_numpy(dtype=np.int64))
+        positions = np.append(positions_unique, -1)[row_codes]
+        
+        # Posisi -1 -> elemen terakhir (NaN / None) = tidak ada di katalog
+        hpp = np.append(self.hpp, np.nan)[positions]
+        margin = np.append(self.margin, np.nan)[positions]
+        category = np.append(self.categories, None)[np.append(self.category_codes, -1)[positions]]
+        
+        # COGS = unit x HPP; tanpa HPP -> Sales x (1 - margin); tidak ada di katalog -> NaN
+        # (biaya tidak diketahui, bukan 0: True_Profit & Margin_ROAS campaign ikut NaN)
+        units_column = 'Units' if 'Units' in df.columns else 'Orders'
+        units = df[units_column].to_numpy(dtype=np.float64)
+        sales = df['Sales'].to_numpy(dtype=np.float64)
+        cogs = np.where(~np.isnan(hpp), units * np.nan_to_num(hpp),
+                        np.where(~np.isnan(margin), sales * (1 - np.nan_to_num(margin) / 100), np.nan))
+        
+        print(f"   ✅ Produk ditemukan di katalog: {(positions_unique >= 0).sum()}/{len(products)}")
+        return df.assign(HPP=hpp, Kategori=category, COGS=cogs)
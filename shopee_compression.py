@@ -0,0 +1,91 @@
+"""
+Input export terkompresi (.gz / .xz / .bz2 / bundle .zip) dibaca streaming,
+tanpa ekstrak ke file sementara
+"""
+
+import io
+import bz2
+import gzip
+import lzma
+import zipfile
+
+# Format dideteksi dari magic bytes di awal file, bukan dari ekstensi
+MAGIC_BYTES = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'BZh', 'bz2'),
+    (b'PK\x03\x04', 'zip')
+]
+OPENERS = {'gzip': gzip.open, 'xz': lzma.open, 'bz2': bz2.open}
+STREAM_FORMATS = ['csv'] + list(OPENERS)
+
+def _detect(head, name, is_xlsx):
+    for magic, kind in MAGIC_BYTES:
+        if head.startswith(magic):
+            # .xlsx juga zip (berisi [Content_Types].xml)
+            return 'xlsx' if kind == 'zip' and is_xlsx() else kind
+    return 'csv' if name.lower().endswith('.csv') else None
+
+def _zip_is_xlsx(source):
+    with zipfile.ZipFile(source) as zf:
+        return '[Content_Types].xml' in zf.namelist()
+
+def detect_format(file_path):
+    """'csv' / 'xlsx' / 'gzip' / 'xz' / 'bz2' / 'zip' (None jika tidak didukung)"""
+    with open(file_path, 'rb') as f:
+        head = f.read(8)
+    return _detect(head, file_path, lambda: _zip_is_xlsx(file_path))
+
+def zip_members(file_path):
+    """Daftar (nama member, format) export di dalam bundle zip"""
+    members = []
+    with zipfile.ZipFile(file_path) as zf:
+        for info in zf.infolist():
+            base = info.filename.rsplit('/', 1)[-1]
+            if info.is_dir() or base.startswith('.') or info.filename.startswith('__MACOSX/'):
+                continue
+            with zf.open(info) as f:
+                head = f.read(8)
+            kind = _detect(head, info.filename,
+                           lambda: _zip_is_xlsx(io.BytesIO(zf.read(info))))
+            if kind == 'zip':
+                kind = None         # zip di dalam zip tidak didukung
+            if kind is not None:
+                members.append((info.filename, kind))
+    return members
+
+def open_binary(file_path, member=None):
+    """Stream biner yang sudah didekompresi (file biasa, .gz/.xz/.bz2 atau member zip)"""
+    if member is None:
+        kind = detect_format(file_path)
+        return OPENERS[kind](file_path, 'rb') if kind in OPENERS else open(file_path, 'rb')
+    
+    zf = zipfile.ZipFile(file_path)
+    with zf.open(member) as f:
+        head = f.read(8)
+    stream = zf.open(member)
+    zf.close()                      # file zip tetap terbuka selama stream member dipakai
+    kind = _detect(head, member, lambda: False)
+    return OPENERS[kind](stream, 'rb') if kind in OPENERS else stream
+
+def read_member_bytes(file_path, member):
+    """Isi member zip di memory (untuk .xlsx yang butuh akses acak)"""
+    with zipfile.ZipFile(file_path) as zf:
+        return io.BytesIO(zf.read(member))
+
+def uncompressed_size(file_path, chunk_size=1 << 20):
+    """Ukuran data setelah dekompresi (file terkompresi dibaca streaming sekali)"""
+    kind = detect_format(file_path)
+    if kind == 'zip':
+        with zipfile.ZipFile(file_path) as zf:
+            return sum(info.file_size for info in zf.infolist())
+    if kind not in OPENERS:
+        with open(file_path, 'rb') as f:
+            return f.seek(0, io.SEEK_END)
+    size = 0
+    with open_binary(file_path) as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                return size
+            size += len(block)
@@ -0,0 +1,131 @@
+"""
+Cube agregasi multi-dimensi (campaign, bidding, penempatan, status, produk, tanggal)
+"""
+
+import numpy as np
+import pandas as pd
+from config import CUBE
+from shopee_identity import campaign_keys
+from shopee_metrics import ADDITIVE_METRICS, DIRECT_METRICS, add_metrics
+
+METRICS = ADDITIVE_METRICS + DIRECT_METRICS
+
+# Dimensi turunan dari Tanggal (dihitung dari nilai unik, bukan per baris)
+DATE_GRAINS = {
+    'Minggu': lambda dates: dates.to_period('W-SUN').start_time,
+    'Bulan': lambda dates: dates.to_period('M').start_time,
+    'Hari': lambda dates: dates.dayofweek + 1     # 1 = Senin
+}
+
+class ShopeeCube:
+    """Class cube metrik aditif dengan key integer hasil factorize"""
+    
+    def __init__(self, dimensions=None):
+        self.dimensions = list(dimensions or CUBE['dimensions'])
+        self.codes = {}         # dimensi -> kode per sel cube
+        self.labels = {}        # dimensi -> nilai unik
+        self.values = {}        # metrik -> jumlah per sel cube
+        self.n_rows = 0
+    
+    def build(self, df):
+        """Bangun cube sekali dari data yang sudah dibersihkan"""
+        print("\n🧊 Building aggregation cube...")
+        dimensions = [d for d in self.dimensions if d in df.columns]
+        metrics = [m for m in METRICS if m in df.columns]
+        self.dimensions = dimensions
+        
+        # Factorize tiap dimensi -> key gabungan mixed-radix
+        row_codes, sizes = [], []
+        for dim in dimensions:
+            column = df[dim]
+            if dim == 'Campaign' and 'Campaign_ID' in df.columns:
+                # Index identitas aktif: sel cube per Campaign_ID, label = nama campaign
+                codes, labels = campaign_keys(df)
+            else:
+                if dim == 'Tanggal':
+                    column = pd.to_datetime(column, errors='coerce').dt.normalize()
+                elif column.dtype == object or pd.api.types.is_string_dtype(column):
+                    column = column.fillna('(kosong)')
+                codes, labels = pd.factorize(column, use_na_sentinel=False)
+            row_codes.append(codes)
+            sizes.append(len(labels))
+            self.labels[dim] = pd.Index(labels)
+        
+        if not dimensions:
+            keys = np.zeros(len(df), dtype=np.int64)
+        elif np.prod(np.array(sizes, dtype=np.float64)) < 2 ** 62:
+            keys = np.ravel_multi_index(row_codes, sizes)
+        else:
+            # Kombinasi terlalu besar untuk satu int64: factorize bertahap
+            keys = row_codes[0].astype(np.int64)
+            for codes, size in zip(row_codes[1:], sizes[1:]):
+                keys, _ = pd.factorize(keys * size + codes)
+        
+        cells, inverse = np.unique(keys, return_inverse=True)
+        first = np.zeros(len(cells), dtype=np.int64)
+        first[inverse[::-1]] = np.arange(len(keys))[::-1]
+        self.codes = {dim: codes[first].astype(np.int32) for dim, codes in zip(dimensions, row_codes)}
+        self.values = {m: np.bincount(inverse, weights=df[m].to_numpy(dtype=np.float64), minlength=len(cells))
+                       for m in metrics}
+        self.values['Rows'] = np.bincount(inverse, minlength=len(cells)).astype(np.float64)
+        self.n_rows = len(df)
+        
+        print(f"✅ Cube: {len(df):,} rows -> {len(cells):,} cells ({', '.join(dimensions)})")
+        return self
+    
+    def _dimension_codes(self, dim):
+        """Kode per sel + label untuk dimensi (termasuk turunan Tanggal)"""
+        if dim in self.codes:
+            return self.codes[dim], self.labels[dim]
+        if dim in DATE_GRAINS and 'Tanggal' in self.codes:
+            derived = DATE_GRAINS[dim](pd.DatetimeIndex(self.labels['Tanggal']))
+            mapping, labels = pd.factorize(derived, use_na_sentinel=False)
+            return mapping[self.codes['Tanggal']], pd.Index(labels)
+        raise KeyError(f"Dimensi cube tidak dikenal: {dim}")
+    
+    def query(self, dims, filters=None, metrics=None):
+        """Rollup dari cube: jumlah metrik + rasio per kombinasi dims
+        
+        Contoh: cube.query(['Mode_Bidding', 'Minggu'])
+                cube.query(['Kode_Produk'], filters={'Penempatan_Iklan': 'Pencarian'})
+        """
+        dims = [dims] if isinstance(dims, str) else list(dims)
+        metrics = metrics or list(self.values)
+        n_cells = len(self.values['Rows'])
+        
+        mask = np.ones(n_cells, dtype=bool)
+        for dim, allowed in (filters or {}).items():
+            codes, labels = self._dimension_codes(dim)
+            allowed = allowed if isinstance(allowed, (list, tuple, set)) else [allowed]
+            mask &= np.isin(codes, labels.get_indexer(list(allowed)))
+        
+        group_codes, group_labels = [], []
+        for dim in dims:
+            codes, labels = self._dimension_codes(dim)
+            group_codes.append(codes[mask])
+            group_labels.append(labels)
+        
+        if dims:
+            keys = np.ravel_multi_index(group_codes, [len(labels) for labels in group_labels])
+            groups, inverse = np.unique(keys, return_inverse=True)
+            positions = np.unravel_index(groups, [len(labels) for labels in group_labels])
+        else:
+            groups, inverse, positions = np.zeros(1), np.zeros(mask.sum(), dtype=np.int64), []
+        
+        result = pd.DataFrame({dim: labels[pos] for dim, labels, pos in zip(dims, group_labels, positions)})
+        for m in metrics:
+            result[m] = np.bincount(inverse, weights=self.values[m][mask], minlength=len(groups))
+        if 'Rows' in result.columns:
+            result['Rows'] = result['Rows'].astype(np.int64)
+        return add_metrics(result, ['CTR', 'ROAS', 'CPC', 'Conversion_Rate', 'ACOS', 'Profit',
+                                    'Direct_ROAS', 'Direct_ACOS', 'Direct_Conversion_Rate'])
+    
+    def report_rollups(self):
+        """Rollup default untuk sheet laporan (dari CUBE['report_rollups'])"""
+        rollups = {}
+        for sheet_name, dims in CUBE['report_rollups'].items():
+            try:
+                rollups[sheet_name] = self.query(dims)
+            except KeyError:
+                continue
+        return rollups
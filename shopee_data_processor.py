@@ -2,14 +2,32 @@
 Processor data khusus untuk format Shopee export
 """
 
+import csv
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from config import DAILY_SCHEDULE, SHOPEE_REQUIRED_COLUMNS
+from shopee_xlsx_reader import ShopeeXlsxReader
+from shopee_rules_engine import campaign_status, status_label
+from shopee_metrics import ADDITIVE_METRICS, DIRECT_METRICS, compute_metrics, add_metrics
+from shopee_backend import ShopeeBackend
+from shopee_identity import campaign_keys
+from shopee_compression import STREAM_FORMATS, detect_format, open_binary, zip_members, read_member_bytes
+
+# Sumber hari & jam heatmap (ditulis di sheet Hour_Heatmap agar tidak salah baca)
+HEATMAP_BASIS = {
+    'start': 'Jam mulai campaign (Tanggal Mulai), bukan jam aktivitas',
+    'snapshot': 'Jam snapshot (aktivitas sejak snapshot sebelumnya)'
+}
+
 class ShopeeDataProcessor:
     """Class untuk memproses data export Shopee"""
     
-    def __init__(self):
+    def __init__(self, backend=None):
+        # Engine dataframe (pandas / pyarrow / polars, lihat config.BACKEND)
+        self.backend = backend or ShopeeBackend()
+        
         # Mapping kolom Shopee ke nama standar
         self.column_mapping = {
             # Kolom utama
@@ -20,6 +38,7 @@ class ShopeeDataProcessor:
             'Omzet Penjualan': 'Sales',
             'Biaya': 'Spend',
             'Tanggal Mulai': 'Tanggal',
+            'Produk Terjual': 'Units',
             
             # Kolom metrik
             'Persentase Klik': 'CTR',
@@ -27,6 +46,11 @@ class ShopeeDataProcessor:
             'Efektifitas Iklan': 'ROAS',
             'Persentase Biaya Iklan terhadap Penjualan dari Iklan (ACOS)': 'ACOS',
             
+            # Kolom atribusi langsung
+            'Konversi Langsung': 'Direct_Orders',
+            'Penjualan Langsung (GMV Langsung)': 'Direct_Sales',
+            'Terjual Langsung': 'Direct_Units',
+            
             # Kolom tambahan untuk referensi
             'Status': 'Status_Iklan',
             'Kode Produk': 'Kode_Produk',
@@ -49,24 +73,75 @@ class ShopeeDataProcessor:
             'Persentase Biaya Iklan terhadap Penjualan dari Iklan (ACOS)',
             'Persentase Biaya Iklan terhadap Penjualan dari Iklan Langsung (ACOS Langsung)'
         ]
+        
+        # Kolom rasio (titik = desimal, mis. Efektifitas Iklan 5.23)
+        self.ratio_columns = ['Efektifitas Iklan']
+        
+        # Kolom yang benar-benar dipakai pipeline
+        self.used_columns = list(dict.fromkeys(
+            list(self.column_mapping) + self.numeric_columns + self.percentage_columns + self.ratio_columns
+        ))
+        
+        # Kolom export Shopee yang dikenal tapi tidak dipakai
+        self.known_columns = self.used_columns + ['Urutan', 'Efektivitas Langsung']
+    
+    def _read_csv_header(self, file_path, member=None):
+        """Baca baris header saja: (kolom, delimiter, encoding); file boleh terkompresi"""
+        with open_binary(file_path, member) as f:
+            line = f.readline()
+        for encoding in ('utf-8-sig', 'latin-1'):
+            try:
+                first_line = line.decode(encoding)
+                break
+            except UnicodeDecodeError:
+                continue
+        
+        # Deteksi delimiter dari baris header
+        sep = max([',', ';', '\t'], key=first_line.count)
+        header = next(csv.reader([first_line], delimiter=sep), [])
+        return header, sep, encoding
+    
+    def validate_columns(self, columns):
+        """Validasi header terhadap SHOPEE_REQUIRED_COLUMNS (fail fast)"""
+        present = {str(col).strip() for col in columns}
+        missing = [col for col in SHOPEE_REQUIRED_COLUMNS if col not in present]
+        unknown = sorted(present - set(self.known_columns) - {''})
+        
+        if unknown:
+            print(f"   ⚠️ Kolom tidak dikenal (diabaikan): {unknown}")
+        if missing:
+            raise ValueError(
+                f"Format export tidak valid. Kolom wajib tidak ditemukan: {missing}"
+                + (f" | Kolom tidak dikenal: {unknown}" if unknown else "")
+            )
+        return True
+    
+    def _get_dtypes(self, columns):
+        """Dtype eksplisit untuk kolom angka yang dibersihkan di clean_data
+        
+        Format Indonesia (1.234 / 1,77% / 5.23) dibaca sebagai string supaya
+        pandas tidak salah tebak ('1.230' -> 1.23). Kolom lain (Kode Produk,
+        Status, ...) tetap di-infer seperti pd.read_csv biasa agar dtype di
+        Cleaned_Data tidak berubah.
+        """
+        return {col: 'str' for col in columns
+                if col.strip() in self.numeric_columns + self.percentage_columns + self.ratio_columns}
     
     def load_data(self, file_path):
         """Load data dari file CSV/Excel Shopee"""
         print(f"📂 Loading data from: {file_path}")
         
         try:
-            # Deteksi format file
-            if file_path.endswith('.csv'):
-                # Coba berbagai delimiter
-                try:
-                    df = pd.read_csv(file_path, sep=',', encoding='utf-8')
-                except:
-                    try:
-                        df = pd.read_csv(file_path, sep=';', encoding='utf-8')
-                    except:
-                        df = pd.read_csv(file_path, encoding='latin-1')
-            elif file_path.endswith('.xlsx'):
-                df = pd.read_excel(file_path)
+            # Deteksi format dari magic bytes (.csv.gz / .xz / .bz2 / bundle .zip)
+            kind = detect_format(file_path)
+            if kind == 'zip':
+                df = self._load_zip(file_path)
+            elif kind == 'xlsx':
+                df = self._load_xlsx(file_path)
+            elif kind in STREAM_FORMATS:
+                if kind != 'csv':
+                    print(f"   📦 Input {kind}, didekompresi streaming")
+                df = self._load_csv(file_path)
             else:
                 raise ValueError("Format file tidak didukung")
             
@@ -77,6 +152,43 @@ class ShopeeDataProcessor:
             print(f"❌ Error loading data: {e}")
             return None
     
+    def _load_csv(self, file_path, member=None):
+        """CSV biasa, terkompresi atau member zip (stream langsung ke parser)"""
+        # Validasi header dulu sebelum parse seluruh file
+        header, sep, encoding = self._read_csv_header(file_path, member)
+        self.validate_columns(header)
+        
+        usecols = [col for col in header if col.strip() in self.used_columns]
+        options = dict(sep=sep, encoding=encoding, usecols=usecols, dtype=self._get_dtypes(usecols))
+        if member is None and detect_format(file_path) == 'csv':
+            return self.backend.read_csv(file_path, **options)
+        with open_binary(file_path, member) as stream:
+            return self.backend.read_csv(stream, **options)
+    
+    def _load_xlsx(self, source):
+        """Streaming read-only, hanya kolom yang dipakai pipeline"""
+        reader = ShopeeXlsxReader(source)
+        return reader.read(SHOPEE_REQUIRED_COLUMNS, usecols=self.used_columns,
+                           validate=self.validate_columns)
+    
+    def _load_zip(self, file_path):
+        """Bundle zip: semua export di dalamnya digabung jadi satu input batch"""
+        members = zip_members(file_path)
+        if not members:
+            raise ValueError("Zip tidak berisi file export (.csv / .xlsx)")
+        
+        frames = []
+        for member, kind in members:
+            print(f"   📄 {member}")
+            if kind == 'xlsx':
+                df = self._load_xlsx(read_member_bytes(file_path, member))
+            else:
+                df = self._load_csv(file_path, member)
+            if len(members) > 1:
+                df['Sumber_File'] = member
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True)
+    
     def clean_data(self, df):
         """Cleaning data Shopee"""
         print("\n🧹 Cleaning Shopee data...")
@@ -89,19 +201,28 @@ class ShopeeDataProcessor:
         # 2. Clean numeric columns (remove thousand separators)
         for col in self.numeric_columns:
             if col in df_clean.columns:
-                df_clean[col] = df_clean[col].astype(str)
-                df_clean[col] = df_clean[col].str.replace('.', '', regex=False)
-                df_clean[col] = df_clean[col].str.replace(',', '.', regex=False)
-                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce').fillna(0)
+                if pd.api.types.is_numeric_dtype(df_clean[col]):
+                    # Sudah bertipe numerik (mis. dari sel angka .xlsx)
+                    df_clean[col] = df_clean[col].fillna(0)
+                    print(f"   ✅ Cleaned: {col}")
+                    continue
+                df_clean[col] = self.backend.parse_numbers(df_clean[col], remove=('.',)).fillna(0)
                 print(f"   ✅ Cleaned: {col}")
         
         # 3. Clean percentage columns
         for col in self.percentage_columns:
             if col in df_clean.columns:
-                df_clean[col] = df_clean[col].astype(str)
-                df_clean[col] = df_clean[col].str.replace('%', '', regex=False)
-                df_clean[col] = df_clean[col].str.replace(',', '.', regex=False)
-                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce') / 100
+                if pd.api.types.is_numeric_dtype(df_clean[col]):
+                    # Sel persen .xlsx sudah berupa pecahan (1.77% -> 0.0177)
+                    print(f"   ✅ Cleaned: {col}")
+                    continue
+                df_clean[col] = self.backend.parse_numbers(df_clean[col], remove=('%',)) / 100
+                print(f"   ✅ Cleaned: {col}")
+        
+        # 3b. Clean ratio columns (ROAS dari export)
+        for col in self.ratio_columns:
+            if col in df_clean.columns and not pd.api.types.is_numeric_dtype(df_clean[col]):
+                df_clean[col] = self.backend.parse_numbers(df_clean[col], remove=())
                 print(f"   ✅ Cleaned: {col}")
         
         # 4. Clean date columns
@@ -122,70 +243,39 @@ class ShopeeDataProcessor:
                         print(f"   ⚠️ Could not parse: {col}")
         
         # 5. Apply column mapping
-        for shopee_col, program_col in self.column_mapping.items():
-            if shopee_col in df_clean.columns and program_col not in df_clean.columns:
-                df_clean[program_col] = df_clean[shopee_col]
+        df_clean = self.apply_column_mapping(df_clean)
         
         print("✅ Data cleaning completed")
         return df_clean
     
+    def apply_column_mapping(self, df):
+        """Salin kolom Shopee ke nama standar (Campaign, Spend, dst.)"""
+        for shopee_col, program_col in self.column_mapping.items():
+            if shopee_col in df.columns and program_col not in df.columns:
+                df[program_col] = df[shopee_col]
+        return df
+    
     def calculate_additional_metrics(self, df):
         """Hitung metrik tambahan jika perlu"""
         print("\n🧮 Calculating additional metrics...")
         
-        df_calc = df.copy()
+        metrics = {}
         
         # Jika ROAS tidak ada, hitung dari Efektifitas Iklan
-        if 'ROAS' not in df_calc.columns and 'Efektifitas Iklan' in df_calc.columns:
-            df_calc['ROAS'] = df_calc['Efektifitas Iklan']
+        if 'ROAS' not in df.columns and 'Efektifitas Iklan' in df.columns:
+            metrics['ROAS'] = df['Efektifitas Iklan']
             print("   ✅ ROAS from Efektifitas Iklan")
         
-        # Hitung ACOS jika tidak ada
-        if 'ACOS' not in df_calc.columns and 'Sales' in df_calc.columns and 'Spend' in df_calc.columns:
-            df_calc['ACOS'] = np.where(
-                df_calc['Sales'] > 0,
-                (df_calc['Spend'] / df_calc['Sales']) * 100,
-                0
-            )
-            print("   ✅ Calculated ACOS")
-        
-        # Hitung CTR jika tidak ada
-        if 'CTR' not in df_calc.columns and 'Impressions' in df_calc.columns and 'Clicks' in df_calc.columns:
-            df_calc['CTR'] = np.where(
-                df_calc['Impressions'] > 0,
-                df_calc['Clicks'] / df_calc['Impressions'],
-                0
-            )
-            print("   ✅ Calculated CTR")
-        
-        # Hitung Conversion Rate jika tidak ada
-        if 'Conversion_Rate' not in df_calc.columns and 'Clicks' in df_calc.columns and 'Orders' in df_calc.columns:
-            df_calc['Conversion_Rate'] = np.where(
-                df_calc['Clicks'] > 0,
-                df_calc['Orders'] / df_calc['Clicks'],
-                0
-            )
-            print("   ✅ Calculated Conversion Rate")
-        
-        # Hitung CPC
-        if 'Clicks' in df_calc.columns and 'Spend' in df_calc.columns:
-            df_calc['CPC'] = np.where(
-                df_calc['Clicks'] > 0,
-                df_calc['Spend'] / df_calc['Clicks'],
-                0
-            )
-            print("   ✅ Calculated CPC")
-        
-        # Hitung Profit
-        if 'Sales' in df_calc.columns and 'Spend' in df_calc.columns:
-            df_calc['Profit'] = df_calc['Sales'] - df_calc['Spend']
-            df_calc['Profit_Margin'] = np.where(
-                df_calc['Sales'] > 0,
-                (df_calc['Profit'] / df_calc['Sales']) * 100,
-                0
-            )
-            print("   ✅ Calculated Profit & Margin")
+        # Semua rasio dihitung sekaligus lewat kernel metrik (kolom export dipertahankan)
+        names = [name for name in ['ROAS', 'ACOS', 'CTR', 'Conversion_Rate']
+                 if name not in df.columns and name not in metrics]
+        names += ['CPC', 'Profit', 'Profit_Margin', 'Direct_ROAS', 'Direct_ACOS', 'Direct_Conversion_Rate']
+        computed = compute_metrics(df, names)
+        metrics.update(computed)
+        if computed:
+            print(f"   ✅ Calculated: {', '.join(computed)}")
         
+        df_calc = df.assign(**metrics)
         return df_calc
     
     def get_campaign_summary(self, df):
@@ -193,64 +283,24 @@ class ShopeeDataProcessor:
         if 'Campaign' not in df.columns:
             return pd.DataFrame()
         
-        # Group by campaign
-        summary = df.groupby('Campaign').agg({
-            'Impressions': 'sum',
-            'Clicks': 'sum',
-            'Orders': 'sum',
-            'Sales': 'sum',
-            'Spend': 'sum'
-        }).reset_index()
+        # Group by campaign (Campaign_ID integer jika index identitas aktif)
+        metrics = [col for col in ADDITIVE_METRICS + DIRECT_METRICS if col in df.columns]
+        if 'Campaign_ID' in df.columns:
+            summary = self.backend.group_sum(df, 'Campaign_ID', metrics)
+            ids, first = np.unique(df['Campaign_ID'].to_numpy(), return_index=True)
+            labels = df['Campaign'].iloc[first].to_numpy()
+            summary.insert(0, 'Campaign', labels[np.searchsorted(ids, summary['Campaign_ID'].to_numpy())])
+        else:
+            summary = self.backend.group_sum(df, 'Campaign', metrics)
         
         # Calculate metrics
-        summary['CTR'] = np.where(
-            summary['Impressions'] > 0,
-            summary['Clicks'] / summary['Impressions'],
-            0
-        )
-        
-        summary['ROAS'] = np.where(
-            summary['Spend'] > 0,
-            summary['Sales'] / summary['Spend'],
-            0
-        )
-        
-        summary['CPC'] = np.where(
-            summary['Clicks'] > 0,
-            summary['Spend'] / summary['Clicks'],
-            0
-        )
-        
-        summary['Conversion_Rate'] = np.where(
-            summary['Clicks'] > 0,
-            summary['Orders'] / summary['Clicks'],
-            0
-        )
-        
-        summary['ACOS'] = np.where(
-            summary['Sales'] > 0,
-            (summary['Spend'] / summary['Sales']) * 100,
-            0
-        )
-        
-        summary['Profit'] = summary['Sales'] - summary['Spend']
-        
-        # Determine campaign status
-        def get_status(row):
-            if row['Spend'] == 0:
-                return 'TIDAK AKTIF'
-            elif row['ROAS'] < 0.5:
-                return 'BONCOS ⚠️'
-            elif row['ROAS'] < 1:
-                return 'RUGI ❌'
-            elif row['ROAS'] < 1.2:
-                return 'BREAK EVEN ⚖️'
-            elif row['ROAS'] < 2:
-                return 'UNTUNG ✅'
-            else:
-                return 'UNTUNG TINGGI 🚀'
+        add_metrics(summary, ['CTR', 'ROAS', 'CPC', 'Conversion_Rate', 'ACOS', 'Profit',
+                              'Direct_ROAS', 'Direct_ACOS', 'Direct_Conversion_Rate',
+                              'Gross_Profit', 'True_Profit', 'Break_Even_ROAS', 'Margin_ROAS'])
         
-        summary['Status'] = summary.apply(get_status, axis=1)
+        # Status dari rules engine (rules file + ladder bawaan), sama dengan analyzer
+        # & budget optimizer; ROAS relatif terhadap break-even jika HPP diketahui
+        summary['Status'] = status_label(campaign_status(summary)['Status']).to_numpy()
         
         return summary
     
@@ -260,31 +310,57 @@ class ShopeeDataProcessor:
             return pd.DataFrame()
         
         # Group by date
-        daily = df.groupby(df['Tanggal'].dt.date).agg({
-            'Impressions': 'sum',
-            'Clicks': 'sum',
-            'Orders': 'sum',
-            'Sales': 'sum',
-            'Spend': 'sum'
-        }).reset_index()
+        metrics = [col for col in ADDITIVE_METRICS + DIRECT_METRICS if col in df.columns]
+        daily = self.backend.group_sum(df[metrics].assign(Tanggal=df['Tanggal'].dt.date), 'Tanggal', metrics)
         
         # Calculate daily metrics
-        daily['CTR'] = np.where(
-            daily['Impressions'] > 0,
-            daily['Clicks'] / daily['Impressions'],
-            0
-        )
-        
-        daily['ROAS'] = np.where(
-            daily['Spend'] > 0,
-            daily['Sales'] / daily['Spend'],
-            0
-        )
-        
-        daily['CPC'] = np.where(
-            daily['Clicks'] > 0,
-            daily['Spend'] / daily['Clicks'],
-            0
-        )
-        
-        return daily
\ No newline at end of file
+        add_metrics(daily, ['CTR', 'ROAS', 'CPC', 'Direct_ROAS'])
+        
+        return daily
+    
+    def get_hourly_heatmap(self, df, basis='start'):
+        """Agregasi performa per campaign x hari x jam (heatmap)
+        
+        basis 'start': Tanggal = Tanggal Mulai, jadi hari/jam adalah waktu campaign
+        DIMULAI (bukan waktu aktivitas terjadi). basis 'snapshot': df = interval
+        ShopeeSnapshotIngestor, Tanggal = akhir interval -> jam aktivitas tercatat.
+        """
+        if 'Campaign' not in df.columns or 'Tanggal' not in df.columns:
+            return pd.DataFrame()
+        
+        metrics = [col for col in ADDITIVE_METRICS if col in df.columns]
+        valid = df['Tanggal'].notna().to_numpy()
+        data = df.loc[valid]
+        if data.empty:
+            return pd.DataFrame()
+        
+        # Integer-coded keys: campaign (Campaign_ID jika aktif) x hari (1=Senin) x jam
+        campaign_codes, campaigns = campaign_keys(data)
+        weekday = data['Tanggal'].dt.dayofweek.to_numpy(dtype=np.int64)
+        hour = data['Tanggal'].dt.hour.to_numpy(dtype=np.int64)
+        keys = (campaign_codes.astype(np.int64) * 7 + weekday) * 24 + hour
+        
+        # Satu grouped pass: unique key + bincount per metrik
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        heatmap = pd.DataFrame({
+            'Campaign': campaigns[unique_keys // (7 * 24)],
+            'Hari': (unique_keys // 24) % 7 + 1,
+            'Jam': unique_keys % 24
+        })
+        for col in metrics:
+            heatmap[col] = np.bincount(
+                inverse,
+                weights=data[col].to_numpy(dtype=np.float64),
+                minlength=len(unique_keys)
+            )
+        
+        add_metrics(heatmap, ['CTR', 'ROAS', 'CPC'])
+        
+        # Label window jadwal harian (config.DAILY_SCHEDULE, jam end tidak termasuk)
+        window = np.full(24, 'other', dtype=object)
+        for period, info in DAILY_SCHEDULE.items():
+            window[info['start']:info['end']] = period
+        heatmap['Window'] = window[heatmap['Jam'].to_numpy()]
+        heatmap['Basis'] = HEATMAP_BASIS[basis]
+        
+        return heatmap
@@ -0,0 +1,213 @@
+"""
+History performa campaign Shopee dalam bentuk array NumPy memory-mapped
+
+Export Shopee bersifat kumulatif (total sejak Tanggal Mulai), jadi yang disimpan
+per tanggal adalah selisih terhadap snapshot sebelumnya (aktivitas harian).
+"""
+
+import os
+import json
+import pandas as pd
+import numpy as np
+
+from config import HISTORY, SCALE_UP_CRITERIA
+
+class ShopeeHistoryStore:
+    """Class untuk history append-only per metrik (baris = tanggal, kolom = campaign)
+    
+    Setiap sel berisi delta harian; total kumulatif terakhir per campaign
+    disimpan terpisah (totals.npz) sebagai dasar selisih snapshot berikutnya.
+    """
+    
+    metrics = ['Impressions', 'Clicks', 'Orders', 'Sales', 'Spend']
+    
+    def __init__(self, directory=None):
+        self.directory = directory or HISTORY['directory']
+        os.makedirs(self.directory, exist_ok=True)
+        
+        self.meta_file = os.path.join(self.directory, 'meta.json')
+        self.campaigns_file = os.path.join(self.directory, 'campaigns.json')
+        self.totals_file = os.path.join(self.directory, 'totals.npz')
+        
+        self.capacity = 0
+        self.dates = []
+        self.campaigns = []         # nama tampilan per kolom
+        self.keys = []              # key per kolom: "#<Campaign_ID>" atau nama campaign
+        if os.path.exists(self.meta_file):
+            with open(self.meta_file, encoding='utf-8') as f:
+                meta = json.load(f)
+            self.capacity = meta['capacity']
+            self.dates = meta['dates']
+        if os.path.exists(self.campaigns_file):
+            with open(self.campaigns_file, encoding='utf-8') as f:
+                campaigns = json.load(f)
+            # Format lama: list nama saja (key = nama)
+            if isinstance(campaigns, list):
+                campaigns = {'keys': campaigns, 'labels': campaigns}
+            self.keys = campaigns['keys']
+            self.campaigns = campaigns['labels']
+        
+        # Dictionary key campaign -> integer id (kolom)
+        self.campaign_ids = {key: i for i, key in enumerate(self.keys)}
+        self.date_index = {d: i for i, d in enumerate(self.dates)}
+        
+        # Per campaign: total kumulatif terakhir, total sebelum tanggal terakhir
+        # (dasar jika tanggal yang sama di-append ulang) & baris tanggal terakhir
+        n = len(self.campaigns)
+        self.last_totals = np.zeros((n, len(self.metrics)))
+        self.base_totals = np.zeros((n, len(self.metrics)))
+        self.last_row = np.full(n, -1, dtype=np.int64)
+        if os.path.exists(self.totals_file):
+            with np.load(self.totals_file, allow_pickle=False) as totals:
+                self.last_totals = totals['last']
+                self.base_totals = totals['base']
+                self.last_row = totals['row']
+    
+    def _metric_file(self, metric):
+        return os.path.join(self.directory, f'{metric}.f8')
+    
+    def _save_meta(self):
+        with open(self.meta_file, 'w', encoding='utf-8') as f:
+            json.dump({'capacity': self.capacity, 'dates': self.dates,
+                       'metrics': self.metrics}, f)
+        with open(self.campaigns_file, 'w', encoding='utf-8') as f:
+            json.dump({'keys': self.keys, 'labels': self.campaigns}, f, ensure_ascii=False)
+        np.savez(self.totals_file, last=self.last_totals, base=self.base_totals, row=self.last_row)
+    
+    def _open(self, metric, mode='r'):
+        """Memmap (tanggal x capacity) untuk satu metrik"""
+        if not self.dates or self.capacity == 0:
+            return np.empty((0, self.capacity))
+        return np.memmap(self._metric_file(metric), dtype=np.float64, mode=mode,
+                         shape=(len(self.dates), self.capacity))
+    
+    def _grow_capacity(self, n_campaigns):
+        """Perbesar kapasitas kolom (jarang terjadi, kapasitas x2)"""
+        new_capacity = max(n_campaigns, self.capacity * 2, 64)
+        n_dates = len(self.dates)
+        for metric in self.metrics:
+            new_file = self._metric_file(metric) + '.tmp'
+            if n_dates:
+                new = np.memmap(new_file, dtype=np.float64, mode='w+',
+                                shape=(n_dates, new_capacity))
+                new[:] = np.nan
+                if self.capacity:
+                    new[:, :self.capacity] = self._open(metric)
+                new.flush()
+                del new
+            else:
+                open(new_file, 'wb').close()
+            os.replace(new_file, self._metric_file(metric))
+        self.capacity = new_capacity
+    
+    def _get_ids(self, keys, labels):
+        """Integer id (kolom) untuk setiap key campaign, tambahkan yang baru"""
+        for key, label in zip(keys, labels):
+            if key not in self.campaign_ids:
+                self.campaign_ids[key] = len(self.keys)
+                self.keys.append(key)
+                self.campaigns.append(label)
+            else:
+                # Nama tampilan ikut nama terbaru
+                self.campaigns[self.campaign_ids[key]] = label
+        missing = len(self.campaigns) - len(self.last_row)
+        if missing:
+            self.last_totals = np.vstack([self.last_totals, np.zeros((missing, len(self.metrics)))])
+            self.base_totals = np.vstack([self.base_totals, np.zeros((missing, len(self.metrics)))])
+            self.last_row = np.concatenate([self.last_row, np.full(missing, -1, dtype=np.int64)])
+        return np.array([self.campaign_ids[key] for key in keys], dtype=np.int64)
+    
+    def _daily_delta(self, ids, row, current):
+        """Selisih total kumulatif terhadap snapshot sebelumnya per campaign
+        
+        Campaign baru (dasar 0) atau total yang turun (campaign di-reset) memakai
+        total apa adanya; append ulang tanggal yang sama memakai dasar sebelumnya.
+        """
+        same_row = self.last_row[ids] == row
+        base = np.where(same_row[:, None], self.base_totals[ids], self.last_totals[ids])
+        continuing = ~(current < base).any(axis=1)
+        delta = np.where(continuing[:, None], current - base, current)
+        
+        self.base_totals[ids] = np.where(continuing[:, None], base, 0.0)
+        self.last_totals[ids] = current
+        self.last_row[ids] = row
+        return delta
+    
+    def append(self, campaign_summary, snapshot_date):
+        """Tambahkan ringkasan campaign (kumulatif) untuk tanggal export"""
+        if campaign_summary.empty:
+            return
+        
+        snapshot_date = snapshot_date.isoformat()
+        if self.dates and snapshot_date < self.dates[-1]:
+            raise ValueError(f"History append-only: {snapshot_date} < {self.dates[-1]}")
+        
+        # Campaign_ID (index identitas) jika ada: nama yang berganti tetap satu kolom
+        labels = campaign_summary['Campaign'].astype(str).tolist()
+        if 'Campaign_ID' in campaign_summary.columns:
+            keys = ['#' + str(i) for i in campaign_summary['Campaign_ID'].tolist()]
+        else:
+            keys = labels
+        ids = self._get_ids(keys, labels)
+        if len(self.campaigns) > self.capacity:
+            self._grow_capacity(len(self.campaigns))
+        
+        # Tanggal baru = tambah satu baris di akhir file (NaN = tidak ada data)
+        if snapshot_date not in self.date_index:
+            self.date_index[snapshot_date] = len(self.dates)
+            self.dates.append(snapshot_date)
+            empty_row = np.full(self.capacity, np.nan).tobytes()
+            for metric in self.metrics:
+                with open(self._metric_file(metric), 'ab') as f:
+                    f.write(empty_row)
+        
+        row = self.date_index[snapshot_date]
+        current = campaign_summary[self.metrics].to_numpy(dtype=np.float64)
+        delta = self._daily_delta(ids, row, current)
+        for i, metric in enumerate(self.metrics):
+            mm = self._open(metric, mode='r+')
+            mm[row, ids] = delta[:, i]
+            mm.flush()
+            del mm
+        
+        self._save_meta()
+        print(f"✅ History updated: {snapshot_date} ({len(ids)} campaigns, "
+              f"{len(self.dates)} days)")
+    
+    def window(self, metric, days):
+        """Slice zero-copy N hari terakhir (tanggal x campaign)"""
+        mm = self._open(metric)
+        return mm[max(len(self.dates) - days, 0):, :len(self.campaigns)]
+    
+    def rolling_roas(self, days=None):
+        """ROAS N hari terakhir per campaign"""
+        days = days or HISTORY['window_days']
+        sales = np.nansum(self.window('Sales', days), axis=0)
+        spend = np.nansum(self.window('Spend', days), axis=0)
+        roas = np.divide(sales, spend, out=np.zeros_like(sales), where=spend > 0)
+        return pd.DataFrame({
+            'Campaign': self.campaigns,
+            f'Sales_{days}D': sales,
+            f'Spend_{days}D': spend,
+            f'ROAS_{days}D': roas
+        })
+    
+    def consecutive_growth(self, metric='Sales', days=None):
+        """True jika metrik naik N hari berturut-turut"""
+        days = days or SCALE_UP_CRITERIA['consecutive_days']
+        values = self.window(metric, days + 1)
+        if values.shape[0] < days + 1:
+            return np.zeros(len(self.campaigns), dtype=bool)
+        return np.all(np.diff(values, axis=0) > 0, axis=0)
+    
+    def trend_summary(self, days=None):
+        """Ringkasan tren: ROAS rolling & pertumbuhan berturut-turut"""
+        if not self.dates or not self.campaigns:
+            return pd.DataFrame()
+        
+        days = days or HISTORY['window_days']
+        trends = self.rolling_roas(days)
+        trends['Days_Recorded'] = np.sum(~np.isnan(self.window('Spend', days)), axis=0)
+        trends['Sales_Growth'] = self.consecutive_growth('Sales')
+        trends['Clicks_Growth'] = self.consecutive_growth('Clicks')
+        return trends
@@ -0,0 +1,288 @@
+"""
+Dashboard HTML statis (satu file) untuk analisis Shopee
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from config import HTML_DASHBOARD
+from shopee_metrics import PROFIT_LABELS, profit_total
+
+# Kolom tabel campaign: (nama, sumber, tipe) - 'n' angka, 'c' kategori, 's' teks
+TABLE_COLUMNS = [
+    ('Campaign', 'summary', 's'),
+    ('Status', 'summary', 'c'),
+    ('Priority', 'analysis', 'c'),
+    ('Performance_Score', 'analysis', 'n'),
+    ('Spend', 'summary', 'n'),
+    ('Sales', 'summary', 'n'),
+    ('Profit', 'summary', 'n'),
+    ('True_Profit', 'summary', 'n'),
+    ('ROAS', 'summary', 'n'),
+    ('CTR', 'summary', 'n'),
+    ('ACOS', 'summary', 'n'),
+    ('Clicks', 'summary', 'n'),
+    ('Orders', 'summary', 'n'),
+    ('Recommendations', 'analysis', 'c')
+]
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body{font-family:Calibri,Arial,sans-serif;margin:20px;color:#222;background:#f5f7fa}
+h1{color:#366092;margin:0 0 4px}h2{color:#366092;font-size:18px;margin:24px 0 8px}
+.muted{color:#777;font-size:12px}
+.cards{display:flex;flex-wrap:wrap;gap:12px}
+.card{background:#fff;border-radius:6px;padding:12px 16px;min-width:150px;box-shadow:0 1px 3px #0002}
+.card b{display:block;font-size:20px}
+.pos{color:#00B050}.neg{color:#C00000}
+table{border-collapse:collapse;background:#fff;font-size:13px;width:100%}
+th{background:#366092;color:#fff;padding:6px;cursor:pointer;white-space:nowrap;text-align:left}
+td{padding:4px 6px;border-bottom:1px solid #e3e3e3;white-space:nowrap}
+td.n{text-align:right}
+.bar{background:#4F81BD;height:14px;display:inline-block;vertical-align:middle;margin-right:6px}
+.pager{margin:8px 0}.pager button{margin-right:6px}
+svg{background:#fff;border-radius:6px;box-shadow:0 1px 3px #0002}
+details summary{cursor:pointer;font-size:18px;color:#366092;margin:24px 0 8px}
+</style>
+</head>
+<body>
+<h1>📊 Shopee Ad Performance Dashboard</h1>
+<div class="muted" id="generated"></div>
+<h2>Overall Performance</h2><div class="cards" id="totals"></div>
+<h2>Campaign Status Distribution</h2><div id="status"></div>
+<h2>Daily Trend</h2><div id="daily"></div>
+<h2>Top Performers (by ROAS)</h2><div id="top"></div>
+<h2>Needs Attention (ROAS &lt; 1)</h2><div id="bottom"></div>
+<details id="all"><summary>Semua Campaign</summary>
+<input id="search" placeholder="Cari campaign..." size="40">
+<div class="pager" id="pager"></div><div id="table"></div></details>
+<script type="application/json" id="summary-data">__SUMMARY__</script>
+<script type="application/json" id="table-data">__TABLE__</script>
+<script>
+(function(){
+var S=JSON.parse(document.getElementById('summary-data').textContent);
+var PAGE=__PAGE_SIZE__;
+function esc(v){return String(v).replace(/[&<>"]/g,function(c){return{'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;'}[c];});}
+function num(v,d){return v===null?'':Number(v).toLocaleString('id-ID',{minimumFractionDigits:d||0,maximumFractionDigits:d||0});}
+function rp(v){return v===null?'N/A':'Rp '+num(v);}
+function fmt(col,v){
+  if(v===null||v===undefined)return '';
+  if(col==='ROAS')return num(v,2);
+  if(col==='CTR')return num(v*100,2)+'%';
+  if(col==='ACOS')return num(v,2)+'%';
+  if(col==='Spend'||col==='Sales'||col==='Profit'||col==='True_Profit')return rp(v);
+  return typeof v==='number'?num(v):esc(v);
+}
+function table(cols,rows,num){
+  var h='<table><tr>'+cols.map(function(c){return '<th>'+esc(c)+'</th>';}).join('')+'</tr>';
+  for(var i=0;i<rows.length;i++){
+    h+='<tr>'+rows[i].map(function(v,j){return '<td'+(num&&num[j]?' class="n"':'')+'>'+v+'</td>';}).join('')+'</tr>';
+  }
+  return h+'</table>';
+}
+document.getElementById('generated').textContent='Generated: '+S.generated;
+var T=S.totals;
+document.getElementById('totals').innerHTML=[
+  ['Total Campaigns',num(T.campaigns)],['Total Spend',rp(T.spend)],['Total Sales',rp(T.sales)],
+  ['Total '+esc(T.profit_label),'<span class="'+(T.profit>=0?'pos':'neg')+'">'+rp(T.profit)+'</span>'],
+  ['Overall ROAS',num(T.roas,2)+(T.roas>1.5?' ✅':' ⚠️')]
+].map(function(c){return '<div class="card">'+c[0]+'<b>'+c[1]+'</b></div>';}).join('');
+document.getElementById('status').innerHTML=table(['Status','Count','Percentage'],S.status.map(function(s){
+  var pct=T.campaigns?s[1]/T.campaigns*100:0;
+  return [esc(s[0]),num(s[1]),'<span class="bar" style="width:'+(pct*2).toFixed(0)+'px"></span>'+num(pct,1)+'%'];
+}),[0,1,0]);
+function campaigns(list){return table(['Campaign','ROAS','Spend',T.profit_basis],list.map(function(r){
+  return [esc(r[0]),num(r[1],2),rp(r[2]),rp(r[3])];}),[0,1,1,1]);}
+document.getElementById('top').innerHTML=campaigns(S.top);
+document.getElementById('bottom').innerHTML=S.bottom.length?campaigns(S.bottom):'<p>Tidak ada campaign dengan ROAS &lt; 1 ✅</p>';
+(function(){
+  var D=S.daily,n=D.date.length,el=document.getElementById('daily');
+  if(!n){el.innerHTML='<p class="muted">Tidak ada data tanggal</p>';return;}
+  var W=900,H=220,P=40,max=Math.max.apply(null,D.roas.concat([1]));
+  function x(i){return P+(n>1?i*(W-2*P)/(n-1):0);}
+  function y(v){return H-P-v/max*(H-2*P);}
+  var pts=D.roas.map(function(v,i){return x(i).toFixed(1)+','+y(v).toFixed(1);}).join(' ');
+  var svg='<svg width="'+W+'" height="'+H+'">'+
+    '<line x1="'+P+'" x2="'+(W-P)+'" y1="'+y(1)+'" y2="'+y(1)+'" stroke="#C00000" stroke-dasharray="4"/>'+
+    '<polyline fill="none" stroke="#366092" stroke-width="2" points="'+pts+'"/>'+
+    '<text x="'+P+'" y="'+(H-P+16)+'" font-size="11">'+esc(D.date[0])+'</text>'+
+    '<text x="'+(W-P)+'" y="'+(H-P+16)+'" font-size="11" text-anchor="end">'+esc(D.date[n-1])+'</text>'+
+    '<text x="4" y="'+(y(max)+4)+'" font-size="11">'+num(max,2)+'</text>'+
+    '<text x="4" y="'+(y(1)+4)+'" font-size="11">1.00</text></svg>';
+  el.innerHTML=svg+'<div class="muted">ROAS harian (garis merah = break even)</div>';
+})();
+// Tabel lengkap: payload baru di-parse saat section dibuka, hanya satu halaman yang dirender
+var C=null,order=null,view=null,page=0,sortCol=-1,sortDir=1;
+function decode(){
+  C=JSON.parse(document.getElementById('table-data').textContent);
+  C.values=C.data.map(function(col,j){
+    if(C.types[j]!=='c')return col;
+    var labels=C.categories[C.columns[j]];
+    return col.map(function(code){return code<0?null:labels[code];});
+  });
+  order=new Uint32Array(C.rows);for(var i=0;i<C.rows;i++)order[i]=i;
+  view=order;
+}
+function render(){
+  var pages=Math.max(1,Math.ceil(view.length/PAGE));page=Math.min(page,pages-1);
+  var start=page*PAGE,end=Math.min(view.length,start+PAGE),rows=[];
+  for(var k=start;k<end;k++){
+    var i=view[k];rows.push(C.values.map(function(col,j){return fmt(C.columns[j],col[i]);}));
+  }
+  document.getElementById('table').innerHTML=table(C.columns.map(function(c,j){
+    return c+(j===sortCol?(sortDir>0?' ▲':' ▼'):'');}),rows,C.types.map(function(t){return t==='n';}));
+  document.getElementById('pager').innerHTML='<button id="prev">‹</button><button id="next">›</button>'+
+    'Halaman '+(page+1)+' / '+pages+' ('+num(view.length)+' campaign)';
+  document.getElementById('prev').onclick=function(){if(page>0){page--;render();}};
+  document.getElementById('next').onclick=function(){if(page<pages-1){page++;render();}};
+  var ths=document.querySelectorAll('#table th');
+  for(var j=0;j<ths.length;j++)ths[j].onclick=sorter(j);
+}
+function sorter(j){return function(){
+  sortDir=(sortCol===j)?-sortDir:(C.types[j]==='n'?-1:1);sortCol=j;
+  var col=C.values[j],dir=sortDir,idx=Array.prototype.slice.call(order);
+  idx.sort(function(a,b){
+    var va=col[a],vb=col[b];
+    if(va===vb)return a-b;if(va===null)return 1;if(vb===null)return -1;
+    return (va<vb?-1:1)*dir;
+  });
+  order=Uint32Array.from(idx);filter();
+};}
+function filter(){
+  var q=document.getElementById('search').value.toLowerCase();
+  if(!q){view=order;}else{
+    var names=C.values[0];view=order.filter(function(i){return String(names[i]).toLowerCase().indexOf(q)>=0;});
+  }
+  page=0;render();
+}
+document.getElementById('all').addEventListener('toggle',function(){
+  if(this.open&&C===null){decode();render();}
+});
+document.getElementById('search').addEventListener('input',function(){if(C)filter();});
+})();
+</script>
+</body>
+</html>
+"""
+
+class ShopeeHtmlDashboard:
+    """Class untuk generate dashboard HTML statis dari hasil analisis"""
+    
+    def __init__(self, top_n=None, page_size=None):
+        self.top_n = top_n or HTML_DASHBOARD['top_n']
+        self.page_size = page_size or HTML_DASHBOARD['page_size']
+    
+    def _json(self, data):
+        """JSON ringkas yang aman disisipkan di tag <script>"""
+        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False, allow_nan=False)
+        return text.replace('</', '<\\/')
+    
+    def _column_values(self, values, kind):
+        """Array kolom -> list JSON (angka dibulatkan, NaN -> null)"""
+        if kind == 'n':
+            numbers = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64)
+            rounded = np.round(numbers, 4).tolist()
+            return [None if v != v or v in (np.inf, -np.inf) else int(v) if v.is_integer() else v
+                    for v in rounded], None
+        if kind == 'c':
+            codes, categories = pd.factorize(pd.Series(values))
+            return codes.tolist(), categories.astype(str).tolist()
+        return pd.Series(values).astype(str).tolist(), None
+    
+    def _ranked_row(self, row):
+        """[campaign, ROAS, spend, profit] untuk tabel top/bottom (profit NaN -> null)"""
+        name, roas, spend, profit = row
+        return [str(name), float(roas), float(spend), float(profit) if pd.notna(profit) else None]
+    
+    def build_summary(self, analysis_results, campaign_summary, daily_summary=None):
+        """Agregat dashboard: total, distribusi status, top/bottom, tren harian"""
+        total_spend = float(campaign_summary['Spend'].sum())
+        total_sales = float(campaign_summary['Sales'].sum())
+        status = analysis_results['Status'] if 'Status' in analysis_results.columns else campaign_summary['Status']
+        
+        # Profit setelah HPP jika katalog produk tersedia (cakupan HPP di label), selain itu Sales - Spend
+        profit_col, profit_label, total_profit = profit_total(campaign_summary)
+        ranked = campaign_summary[['Campaign', 'ROAS', 'Spend', profit_col]]
+        top = ranked.nlargest(self.top_n, 'ROAS')
+        bottom = ranked[ranked['ROAS'] < 1].nsmallest(self.top_n, 'ROAS')
+        
+        daily = {'date': [], 'spend': [], 'sales': [], 'roas': []}
+        if daily_summary is not None and not daily_summary.empty:
+            daily = {
+                'date': daily_summary['Tanggal'].astype(str).tolist(),
+                'spend': self._column_values(daily_summary['Spend'], 'n')[0],
+                'sales': self._column_values(daily_summary['Sales'], 'n')[0],
+                'roas': self._column_values(daily_summary['ROAS'], 'n')[0]
+            }
+        
+        return {
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'totals': {
+                'campaigns': len(campaign_summary),
+                'spend': total_spend,
+                'sales': total_sales,
+                'profit': total_profit,
+                'profit_label': profit_label,
+                'profit_basis': PROFIT_LABELS[profit_col],
+                'roas': total_sales / total_spend if total_spend > 0 else 0
+            },
+            'status': [[str(s), int(c)] for s, c in status.value_counts().items()],
+            'top': [self._ranked_row(r) for r in top.itertuples(index=False)],
+            'bottom': [self._ranked_row(r) for r in bottom.itertuples(index=False)],
+            'daily': daily
+        }
+    
+    def build_table(self, analysis_results, campaign_summary):
+        """Tabel campaign kolumnar (kategori di-encode sebagai kode)"""
+        # Kolom analysis diselaraskan ke urutan campaign summary
+        positions = pd.Index(analysis_results['Campaign']).get_indexer(campaign_summary['Campaign'])
+        sources = {'summary': campaign_summary, 'analysis': analysis_results}
+        
+        columns, types, data, categories = [], [], [], {}
+        for name, source, kind in TABLE_COLUMNS:
+            df = sources[source]
+            if name not in df.columns:
+                continue
+            values = df[name].to_numpy()
+            if source == 'analysis':
+                values = np.where(positions >= 0, values[np.maximum(positions, 0)], None)
+            encoded, labels = self._column_values(values, kind)
+            columns.append(name)
+            types.append(kind)
+            data.append(encoded)
+            if labels is not None:
+                categories[name] = labels
+        
+        return {
+            'rows': len(campaign_summary),
+            'columns': columns,
+            'types': types,
+            'categories': categories,
+            'data': data
+        }
+    
+    def generate(self, analysis_results, campaign_summary, daily_summary=None, file_name=None):
+        """Tulis dashboard HTML self-contained"""
+        if file_name is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            file_name = f"shopee_dashboard_{timestamp}.html"
+        
+        print(f"\n🌐 Generating HTML dashboard: {file_name}")
+        summary = self.build_summary(analysis_results, campaign_summary, daily_summary)
+        table = self.build_table(analysis_results, campaign_summary)
+        
+        html = (HTML_TEMPLATE
+                .replace('__TITLE__', 'Shopee Ad Performance Dashboard')
+                .replace('__PAGE_SIZE__', str(int(self.page_size)))
+                .replace('__SUMMARY__', self._json(summary))
+                .replace('__TABLE__', self._json(table)))
+        with open(file_name, 'w', encoding='utf-8') as f:
+            f.write(html)
+        
+        print(f"✅ HTML dashboard generated: {file_name}")
+        return file_name
@@ -0,0 +1,136 @@
+"""
+Index identitas campaign: nama iklan yang berganti suffix, terpotong atau
+terduplikasi dipetakan ke satu Campaign_ID integer yang persisten
+"""
+
+import os
+import json
+from bisect import bisect_left, insort
+import numpy as np
+import pandas as pd
+
+from config import CAMPAIGN_IDENTITY
+
+# Suffix varian di akhir nama: "[3]", "(2)", "[copy]"
+VARIANT_SUFFIX = r'(?:\s*[\[\(][^\[\]\(\)]*[\]\)])+\s*$'
+# Penanda nama terpotong: "..." atau "…"
+TRUNCATED_SUFFIX = r'\s*(?:\.{3,}|…)\s*$'
+
+def campaign_keys(df):
+    """(kode integer per baris, nama campaign per kode) untuk groupby campaign
+    
+    Jika index identitas aktif (kolom Campaign_ID) key-nya Campaign_ID, jadi
+    nama yang berganti tetap satu campaign; selain itu key = nama Campaign.
+    """
+    if 'Campaign_ID' not in df.columns:
+        codes, names = pd.factorize(df['Campaign'])
+        return codes, names
+    codes, _ = pd.factorize(df['Campaign_ID'])
+    # Nama tampilan = nama di baris pertama tiap id (kode factorize urut kemunculan)
+    first = np.unique(codes, return_index=True)[1]
+    return codes, pd.Index(df['Campaign'].to_numpy()[first])
+
+class ShopeeCampaignIdentity:
+    """Class untuk mapping baris -> Campaign_ID stabil (dictionary key -> id di JSON)"""
+    
+    def __init__(self, file_path=None):
+        self.file_path = file_path or CAMPAIGN_IDENTITY['file']
+        self.keys = []              # key identitas per id ("P:<kode>" / "N:<nama>")
+        self.labels = []            # nama tampilan unik per id (nama pertama yang terlihat)
+        self.aliases = {}           # key nama terpotong -> id campaign yang cocok
+        if os.path.exists(self.file_path):
+            with open(self.file_path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.keys = state['keys']
+            self.labels = state['labels']
+            self.aliases = state.get('aliases', {})
+        self.ids = {key: i for i, key in enumerate(self.keys)}
+        self.ids.update(self.aliases)
+        self._label_set = set(self.labels)
+        # Key nama terurut: cari nama terpotong per prefix dengan bisect
+        self._name_keys = sorted(key for key in self.keys if key.startswith('N:'))
+    
+    def save(self):
+        """Simpan dictionary identitas"""
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            json.dump({'keys': self.keys, 'labels': self.labels, 'aliases': self.aliases},
+                      f, ensure_ascii=False)
+    
+    @staticmethod
+    def normalize(names):
+        """Nama campaign -> bentuk normal (huruf kecil, spasi rapi, tanpa suffix varian)"""
+        names = pd.Series(names, dtype='str').fillna('')
+        names = names.str.replace(r'\s+', ' ', regex=True).str.strip().str.lower()
+        names = names.str.replace(TRUNCATED_SUFFIX, '', regex=True)
+        return names.str.replace(VARIANT_SUFFIX, '', regex=True).str.strip()
+    
+    def _match_truncated(self, stem):
+        """Id campaign yang namanya diawali `stem` (hanya jika tepat satu)"""
+        prefix = 'N:' + stem
+        start = bisect_left(self._name_keys, prefix)
+        end = bisect_left(self._name_keys, prefix + '\U0010ffff', lo=start)
+        return self.ids[self._name_keys[start]] if end - start == 1 else None
+    
+    def _unique_label(self, label, key):
+        """Label tampilan yang belum dipakai id lain (Campaign tetap 1:1 dengan Campaign_ID)"""
+        label = ' '.join(label.split())
+        if label not in self._label_set:
+            return label
+        # Nama sama untuk produk berbeda -> dibedakan dengan kode produk, selain itu nomor urut
+        if key.startswith('P:') and f"{label} ({key[2:]})" not in self._label_set:
+            return f"{label} ({key[2:]})"
+        n = 2
+        while f"{label} #{n}" in self._label_set:
+            n += 1
+        return f"{label} #{n}"
+    
+    def _get_id(self, key, label, truncated):
+        if key not in self.ids and truncated and key.startswith('N:'):
+            match = self._match_truncated(key[2:])
+            if match is not None:
+                self.ids[key] = match
+                self.aliases[key] = match
+        if key not in self.ids:
+            label = self._unique_label(label, key)
+            self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            if key.startswith('N:'):
+                insort(self._name_keys, key)
+            self.labels.append(label)
+            self._label_set.add(label)
+        return self.ids[key]
+    
+    def assign(self, df, save=True):
+        """Tambah kolom Campaign_ID dan ganti Campaign dengan nama stabil & unik per id"""
+        if 'Campaign' not in df.columns or df.empty:
+            return df
+        
+        # Identitas unik dihitung sekali per kombinasi (nama, kode), bukan per baris
+        names = df['Campaign'].astype('str').fillna('')
+        if 'Kode_Produk' in df.columns:
+            codes = df['Kode_Produk'].astype('str').fillna('').str.strip()
+        else:
+            codes = pd.Series('', index=df.index)
+        row_codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([names, codes]))
+        pair_names = pairs.get_level_values(0)
+        pair_codes = pairs.get_level_values(1)
+        
+        normalized = self.normalize(pair_names)
+        truncated = pair_names.str.contains(TRUNCATED_SUFFIX, regex=True)
+        keys = np.where(pair_codes != '', 'P:' + pair_codes, 'N:' + normalized.to_numpy(dtype=object))
+        
+        known = len(self.keys)
+        pair_ids = np.array([self._get_id(key, label, is_truncated)
+                             for key, label, is_truncated in zip(keys, pair_names, truncated)],
+                            dtype=np.int32)
+        
+        ids = pair_ids[row_codes]
+        df = df.assign(Campaign_ID=ids,
+                       Campaign=pd.Series(np.asarray(self.labels, dtype=object)[ids],
+                                          index=df.index, dtype=df['Campaign'].dtype))
+        
+        print(f"🆔 Campaign identity: {len(pairs)} nama -> {len(np.unique(pair_ids))} campaign "
+              f"({len(self.keys) - known} baru)")
+        if save:
+            self.save()
+        return df
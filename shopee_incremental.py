@@ -0,0 +1,189 @@
+"""
+Update incremental: hanya campaign yang berubah yang dihitung ulang
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from config import INCREMENTAL
+from shopee_cache import config_hash
+from shopee_metrics import ADDITIVE_METRICS, DIRECT_METRICS
+
+# Kolom yang menentukan hasil summary per campaign
+HASH_COLUMNS = ['Campaign', 'Tanggal'] + ADDITIVE_METRICS + DIRECT_METRICS
+
+def _frame_to_json(df):
+    """DataFrame -> dict JSON (nilai Python asli, float tetap eksak lewat repr)"""
+    if df is None:
+        return None
+    return {
+        'columns': [str(col) for col in df.columns],
+        'dtypes': [str(dtype) for dtype in df.dtypes],
+        'data': [df[col].tolist() for col in df.columns]
+    }
+
+def _frame_from_json(state):
+    if state is None:
+        return None
+    return pd.DataFrame({
+        col: pd.Series(values, dtype=dtype)
+        for col, dtype, values in zip(state['columns'], state['dtypes'], state['data'])
+    }, columns=state['columns'])
+
+class ShopeeIncrementalUpdater:
+    """Class untuk patch Campaign_Summary & Campaign_Analysis per campaign yang berubah"""
+    
+    def __init__(self, processor, state_file=None):
+        self.processor = processor
+        self.state_file = state_file or INCREMENTAL['state_file']
+        self.campaign_hashes = pd.Series(dtype=np.uint64)
+        self.campaign_summary = None
+        self.analysis_results = None
+        self.config_hash = None
+        self.changed = []
+        self.removed = []
+        self._row_codes = None
+        self.stats = {}
+        self._load()
+    
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            # JSON (bukan pickle): file state di cwd tidak bisa menjalankan kode
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.campaign_hashes = pd.Series(state['hashes'], index=state['campaigns'], dtype=np.uint64)
+            self.campaign_summary = _frame_from_json(state['campaign_summary'])
+            self.analysis_results = _frame_from_json(state['analysis_results'])
+            self.config_hash = state['config_hash']
+        except Exception as e:
+            print(f"⚠️ State incremental tidak bisa dibaca, hitung ulang penuh: {e}")
+    
+    def save(self):
+        """Simpan hash & tabel hasil untuk refresh berikutnya"""
+        if not self.state_file:
+            return
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'campaigns': self.campaign_hashes.index.tolist(),
+                'hashes': self.campaign_hashes.tolist(),
+                'campaign_summary': _frame_to_json(self.campaign_summary),
+                'analysis_results': _frame_to_json(self.analysis_results),
+                'config_hash': self.config_hash
+            }, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.state_file)
+    
+    def hash_campaigns(self, df):
+        """Hash per campaign dari hash baris (tidak tergantung urutan baris)"""
+        # Nilai numerik disamakan ke float64 agar int/float yang sama = hash sama
+        values = {}
+        for column in HASH_COLUMNS[1:]:
+            if column not in df.columns:
+                continue
+            if column == 'Tanggal':
+                values[column] = pd.to_datetime(df[column], errors='coerce').to_numpy().view(np.int64)
+            else:
+                values[column] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+        row_hashes = pd.util.hash_pandas_object(pd.DataFrame(values), index=False).to_numpy()
+        
+        codes, campaigns = pd.factorize(df['Campaign'])
+        self._row_codes = codes
+        # Jumlah per campaign untuk 32-bit bawah & atas (eksak di float64) + jumlah baris
+        n = len(campaigns)
+        low = np.bincount(codes, weights=(row_hashes & np.uint64(0xFFFFFFFF)).astype(np.float64), minlength=n)
+        high = np.bincount(codes, weights=(row_hashes >> np.uint64(32)).astype(np.float64), minlength=n)
+        counts = np.bincount(codes, minlength=n)
+        combined = pd.util.hash_pandas_object(
+            pd.DataFrame({'low': low, 'high': high, 'count': counts}), index=False
+        ).to_numpy()
+        return pd.Series(combined, index=campaigns)
+    
+    def _patch(self, table, updates, removed):
+        """Ganti baris campaign yang berubah, hapus yang hilang, tambah yang baru"""
+        if table is None:
+            return updates.reset_index(drop=True)
+        table = table.set_index('Campaign', drop=False)
+        updates = updates.set_index('Campaign', drop=False)
+        if len(removed):
+            table = table.drop(index=removed)
+        
+        existing = updates.index.isin(table.index)
+        if existing.any():
+            # Baris lama di-update langsung (in place)
+            rows = updates.index[existing]
+            for column in updates.columns:
+                if column not in table.columns:
+                    table[column] = None
+                if table[column].dtype != updates[column].dtype:
+                    # Mis. Spend int -> float di export baru: naikkan tipe kolom lama
+                    try:
+                        common = np.result_type(table[column].dtype, updates[column].dtype)
+                    except TypeError:
+                        common = object
+                    table[column] = table[column].astype(common)
+                table.loc[rows, column] = updates.loc[existing, column].to_numpy()
+        if (~existing).any() or len(removed):
+            table = pd.concat([table, updates.loc[~existing]]).sort_index()
+        return table.reset_index(drop=True)
+    
+    def update_summary(self, processed_data, rules=None):
+        """Campaign summary dengan agregasi ulang hanya untuk campaign yang berubah"""
+        current_hash = config_hash(rules)
+        hashes = self.hash_campaigns(processed_data)
+        
+        if self.campaign_summary is None or current_hash != self.config_hash:
+            changed = hashes.index
+        else:
+            positions = self.campaign_hashes.index.get_indexer(hashes.index)
+            previous = self.campaign_hashes.to_numpy()[np.maximum(positions, 0)]
+            is_changed = (positions < 0) | (previous != hashes.to_numpy())
+            changed = hashes.index[is_changed].sort_values()
+        removed = self.campaign_hashes.index.difference(hashes.index)
+        
+        if self.campaign_summary is None or current_hash != self.config_hash:
+            self.campaign_summary = self.processor.get_campaign_summary(processed_data)
+            self.analysis_results = None
+        elif len(changed) or len(removed):
+            # Pilih baris lewat kode factorize (tanpa isin pada string)
+            subset = processed_data[hashes.index.isin(changed)[self._row_codes]]
+            updates = self.processor.get_campaign_summary(subset)
+            self.campaign_summary = self._patch(self.campaign_summary, updates, removed)
+        
+        self.changed = list(changed)
+        self.removed = list(removed)
+        self.campaign_hashes = hashes
+        self.config_hash = current_hash
+        self.stats = {
+            'campaigns': len(hashes),
+            'changed': len(changed),
+            'removed': len(removed),
+            'unchanged': len(hashes) - len(changed)
+        }
+        print(f"🔁 Incremental: {self.stats['changed']} campaign berubah, "
+              f"{self.stats['removed']} hilang, {self.stats['unchanged']} tetap")
+        return self.campaign_summary.copy()
+    
+    def update_analysis(self, analyzer, anomalies=None):
+        """Analisis ulang campaign yang berubah (+ yang punya anomali) lalu patch"""
+        summary = self.campaign_summary
+        if self.analysis_results is None:
+            self.analysis_results = analyzer.analyze_campaigns(summary, anomalies=anomalies)
+            return self.analysis_results.copy()
+        
+        targets = set(self.changed)
+        if anomalies is not None and not anomalies.empty:
+            targets.update(anomalies['Campaign'])
+        if 'Anomaly' in self.analysis_results.columns:
+            # Anomali lama yang sudah hilang juga perlu dihitung ulang
+            targets.update(self.analysis_results.loc[
+                self.analysis_results['Anomaly'].fillna('') != '', 'Campaign'])
+        
+        subset = summary[summary['Campaign'].isin(targets)]
+        if not subset.empty or self.removed:
+            updates = analyzer.analyze_campaigns(subset, anomalies=anomalies) if not subset.empty \
+                else self.analysis_results.iloc[:0]
+            self.analysis_results = self._patch(self.analysis_results, updates, self.removed)
+        return self.analysis_results.copy()
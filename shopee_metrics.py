@@ -0,0 +1,121 @@
+"""
+Kernel metrik turunan Shopee (rasio, profit & metrik atribusi langsung)
+
+Satu definisi rumus untuk data per baris maupun data agregat (summary
+campaign, harian, heatmap, cube).
+"""
+
+import numpy as np
+import pandas as pd
+
+# Metrik aditif yang dijumlahkan sebelum rasio dihitung
+ADDITIVE_METRICS = ['Impressions', 'Clicks', 'Orders', 'Sales', 'Spend', 'Units', 'COGS']
+DIRECT_METRICS = ['Direct_Orders', 'Direct_Sales', 'Direct_Units']
+
+# Rasio: nama -> (pembilang, penyebut, faktor); 0 jika penyebut <= 0 (kecuali UNDEFINED_RATIOS)
+RATIO_METRICS = {
+    'CTR': ('Clicks', 'Impressions', 1),
+    'ROAS': ('Sales', 'Spend', 1),
+    'CPC': ('Spend', 'Clicks', 1),
+    'Conversion_Rate': ('Orders', 'Clicks', 1),
+    'ACOS': ('Spend', 'Sales', 100),
+    'Profit_Margin': ('Profit', 'Sales', 100),
+    'Direct_ROAS': ('Direct_Sales', 'Spend', 1),
+    'Direct_ACOS': ('Spend', 'Direct_Sales', 100),
+    'Direct_Conversion_Rate': ('Direct_Orders', 'Clicks', 1),
+    'Direct_Share': ('Direct_Sales', 'Sales', 1),
+    'Break_Even_ROAS': ('Sales', 'Gross_Profit', 1),
+    'Margin_ROAS': ('Gross_Profit', 'Spend', 1)
+}
+
+# Rasio tanpa nilai jika penyebut <= 0: HPP >= omzet -> tidak ada ROAS yang balik modal
+UNDEFINED_RATIOS = {'Break_Even_ROAS': np.nan}
+
+# Selisih: nama -> (kolom awal, kolom pengurang); COGS dari katalog produk
+DIFFERENCE_METRICS = {
+    'Profit': ('Sales', ['Spend']),
+    'Gross_Profit': ('Sales', ['COGS']),
+    'True_Profit': ('Sales', ['Spend', 'COGS'])
+}
+
+# Label profit utama: setelah HPP jika katalog produk tersedia, selain itu hanya Sales - Spend
+PROFIT_LABELS = {
+    'True_Profit': 'Profit (Sales - Spend - HPP)',
+    'Profit': 'Profit (Sales - Spend)'
+}
+
+def profit_column(df):
+    """Kolom profit utama: True_Profit jika COGS ada, selain itu Profit"""
+    return 'True_Profit' if 'True_Profit' in df.columns else 'Profit'
+
+def profit_total(summary):
+    """(kolom, label, total) profit utama untuk ringkasan
+    
+    True_Profit hanya dijumlah dari campaign yang HPP-nya diketahui; cakupan
+    katalog ditulis di label supaya total parsial tidak terbaca sebagai total.
+    """
+    profit_col = profit_column(summary)
+    values = summary[profit_col]
+    label = PROFIT_LABELS[profit_col]
+    if profit_col == 'True_Profit':
+        label += f" - HPP diketahui {int(values.notna().sum())}/{len(values)} campaign"
+    return profit_col, label, float(values.sum())
+
+def format_rupiah(value):
+    """'Rp 1,234' atau 'N/A' jika nilai tidak diketahui (NaN)"""
+    return f"Rp {value:,.0f}" if pd.notna(value) else 'N/A'
+
+def _operands(name):
+    base, subtract = DIFFERENCE_METRICS[name]
+    return [base] + subtract
+
+def compute_metrics(df, names):
+    """Hitung metrik turunan sekaligus: {nama: array} untuk yang kolomnya tersedia
+    
+    Kolom sumber diambil sekali sebagai float64, output dialokasikan di awal
+    dan pembagian hanya dievaluasi di posisi dengan penyebut > 0.
+    """
+    n = len(df)
+    columns = {}
+    
+    def column(name):
+        if name not in columns:
+            if name in df.columns:
+                columns[name] = df[name].to_numpy(dtype=np.float64)
+            elif name in DIFFERENCE_METRICS and all(col in df.columns for col in _operands(name)):
+                base, subtract = DIFFERENCE_METRICS[name]
+                columns[name] = column(base) - sum(column(col) for col in subtract)
+            else:
+                columns[name] = None
+        return columns[name]
+    
+    results = {}
+    for name in names:
+        if name in DIFFERENCE_METRICS:
+            if all(col in df.columns for col in _operands(name)):
+                # Tipe asli dipertahankan (int - int tetap int)
+                base, subtract = DIFFERENCE_METRICS[name]
+                values = df[base].to_numpy()
+                for col in subtract:
+                    values = np.subtract(values, df[col].to_numpy())
+                results[name] = values
+            continue
+        if name not in RATIO_METRICS:
+            continue
+        numerator, denominator, factor = RATIO_METRICS[name]
+        numerator, denominator = column(numerator), column(denominator)
+        if numerator is None or denominator is None:
+            continue
+        valid = denominator > 0
+        out = np.full(n, UNDEFINED_RATIOS.get(name, 0.0))
+        np.divide(numerator, denominator, out=out, where=valid)
+        if factor != 1:
+            np.multiply(out, factor, out=out, where=valid)
+        results[name] = out
+    return results
+
+def add_metrics(df, names):
+    """Tambahkan metrik turunan ke df (in place) dan kembalikan df"""
+    for name, values in compute_metrics(df, names).items():
+        df[name] = values
+    return df
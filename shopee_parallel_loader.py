@@ -0,0 +1,191 @@
+"""
+Loader CSV paralel: file dipecah per rentang byte, tiap rentang diparse &
+dibersihkan di proses terpisah, hasil dikirim balik lewat shared memory
+"""
+
+import io
+import os
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+from config import PARALLEL_LOAD
+from shopee_compression import detect_format
+
+def _parse_range(args):
+    """Worker proses: parse + clean satu rentang byte, tulis kolom ke shared memory
+    
+    Kolom numerik/tanggal dikirim sebagai byte mentah; kolom teks sebagai kode
+    integer + daftar nilai unik (kecil). Yang di-pickle hanya metadata. Kolom
+    export asli (teks) dikirim untuk Raw_Data, kolom hasil clean hanya yang
+    berubah tipe. Jumlah tanda kutip ikut dikirim untuk cek batas rentang.
+    """
+    processor, file_path, start, end, header, sep, encoding, usecols = args
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        raw = pd.read_csv(io.BytesIO(data), sep=sep, encoding=encoding, header=None, names=header,
+                          usecols=usecols, dtype=processor._get_dtypes(usecols))
+        cleaned = processor.clean_data(raw)
+    
+    # Kolom hasil mapping cukup dibuat ulang di proses utama
+    columns = [(('raw', name), raw[name]) for name in raw.columns]
+    columns += [(('clean', name.strip()), cleaned[name.strip()]) for name in raw.columns
+                if cleaned[name.strip()].dtype != raw[name].dtype]
+    
+    arrays, layout = [], []
+    offset = 0
+    for key, column in columns:
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in 'biufmM':
+            values, labels = column.to_numpy(), None
+        else:
+            values, labels = pd.factorize(column)
+            values = values.astype(np.int32)
+            labels = (np.asarray(labels, dtype=object), column.dtype)
+        values = np.ascontiguousarray(values)
+        layout.append((key, values.dtype.str, offset, len(values), labels))
+        arrays.append((offset, values))
+        offset += values.nbytes
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for offset, values in arrays:
+        shm.buf[offset:offset + values.nbytes] = values.view(np.uint8)
+    # Pemilik segmen pindah ke proses utama (yang akan unlink)
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    shm.close()
+    return shm.name, len(raw), layout, data.count(b'"')
+
+class ShopeeParallelLoader:
+    """Class untuk load + clean export CSV besar memakai beberapa core"""
+    
+    def __init__(self, processor, workers=None, min_bytes=None):
+        self.processor = processor
+        self.workers = workers or PARALLEL_LOAD['workers'] or os.cpu_count() or 1
+        self.min_bytes = min_bytes if min_bytes is not None else PARALLEL_LOAD['min_bytes']
+    
+    def split_ranges(self, file_path, parts):
+        """Rentang byte [start, end) yang selalu berakhir di batas baris"""
+        size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            f.readline()                # lewati header
+            data_start = f.tell()
+            bounds = [data_start]
+            for i in range(1, parts):
+                target = max(data_start + (size - data_start) * i // parts, bounds[-1])
+                f.seek(target)
+                if target > data_start:
+                    f.readline()        # maju sampai awal baris berikutnya
+                position = min(f.tell(), size)
+                if position > bounds[-1]:
+                    bounds.append(position)
+        bounds.append(size)
+        return [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+    
+    def _release(self, results):
+        for name, *_ in results:
+            shm = shared_memory.SharedMemory(name=name)
+            shm.close()
+            shm.unlink()
+    
+    def _column(self, segments, i, labels):
+        """Satu kolom gabungan (salinan baru, view ke shared memory tidak disimpan)"""
+        parts = []
+        for shm, layout in segments:
+            _, dtype, offset, length, part_labels = layout[i]
+            parts.append((np.frombuffer(shm.buf, dtype=dtype, count=length, offset=offset), part_labels))
+        if not parts:
+            return pd.Series([], dtype=object)
+        if labels is None:
+            # Unit datetime / int-float bisa beda antar rentang -> samakan
+            common = np.result_type(*[values.dtype for values, _ in parts])
+            return np.concatenate([values.astype(common, copy=False) for values, _ in parts])
+        
+        # Kode lokal per worker -> kode global, nilai kosong (-1) tetap kosong
+        uniques = pd.Index(np.concatenate([part_labels[0] for _, part_labels in parts])).unique()
+        codes = np.concatenate([
+            np.append(uniques.get_indexer(part_labels[0]), -1)[values]
+            for values, part_labels in parts
+        ])
+        values = np.append(uniques.to_numpy(dtype=object), None)[codes]
+        return pd.Series(values).astype(labels[1])
+    
+    def _collect(self, results):
+        """Gabungkan kolom dari shared memory semua worker -> {key: kolom}"""
+        segments = [(shared_memory.SharedMemory(name=name), layout)
+                    for name, n_rows, layout, _ in results if n_rows > 0]
+        try:
+            return {key: self._column(segments, i, labels)
+                    for i, (key, _, _, _, labels) in enumerate(results[0][2])}
+        finally:
+            for shm, _ in segments:
+                shm.close()
+            self._release(results)
+    
+    def _run_workers(self, jobs):
+        """Hasil semua worker; None jika ada yang gagal"""
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+            futures = [executor.submit(_parse_range, job) for job in jobs]
+            results, errors = [], []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+        if errors:
+            self._release(results)
+            print(f"   ⚠️ Worker gagal ({errors[0]}), load berurutan")
+            return None
+        
+        # Batas rentang di dalam field berkutip (mis. newline di nama iklan):
+        # jumlah tanda kutip sebelum batas ganjil -> split tidak valid
+        quotes = np.cumsum([count for *_, count in results])[:-1]
+        if (quotes % 2).any():
+            self._release(results)
+            print("   ⚠️ Field berkutip melewati batas baris, load berurutan")
+            return None
+        return results
+    
+    def _load_sequential(self, file_path):
+        raw_data = self.processor.load_data(file_path)
+        if raw_data is None:
+            return None, None
+        return raw_data, self.processor.clean_data(raw_data)
+    
+    def load(self, file_path):
+        """(raw_data, cleaned_data) sama persis dengan load_data + clean_data"""
+        processor = self.processor
+        # Rentang byte hanya untuk CSV tanpa kompresi; format lain lewat load_data
+        if detect_format(file_path) != 'csv' or self.workers < 2 or \
+                os.path.getsize(file_path) < self.min_bytes:
+            return self._load_sequential(file_path)
+        
+        print(f"📂 Loading data from: {file_path} ({self.workers} workers)")
+        try:
+            header, sep, encoding = processor._read_csv_header(file_path)
+            processor.validate_columns(header)
+            usecols = [col for col in header if col.strip() in processor.used_columns]
+            ranges = self.split_ranges(file_path, self.workers)
+            jobs = [(processor, file_path, start, end, header, sep, encoding, usecols)
+                    for start, end in ranges]
+            results = self._run_workers(jobs)
+            if results is None:
+                return self._load_sequential(file_path)
+            columns = self._collect(results)
+        except Exception as e:
+            print(f"❌ Error loading data: {e}")
+            return None, None
+        
+        raw_data = pd.DataFrame({name: values for (kind, name), values in columns.items() if kind == 'raw'})
+        print(f"✅ Data loaded: {len(raw_data)} rows, {len(raw_data.columns)} columns")
+        print("\n🧹 Cleaning Shopee data... (paralel per rentang)")
+        cleaned_data = raw_data.copy()
+        cleaned_data.columns = [col.strip() for col in cleaned_data.columns]
+        for (kind, name), values in columns.items():
+            if kind == 'clean':
+                cleaned_data[name] = values
+        cleaned_data = processor.apply_column_mapping(cleaned_data)
+        print("✅ Data cleaning completed")
+        return raw_data, cleaned_data
@@ -0,0 +1,85 @@
+"""
+Pipeline analisis sebagai dependency graph: node dihitung lazy (hanya yang
+dibutuhkan target), hasilnya di-memoize, node independen bisa jalan paralel
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from config import PIPELINE
+
+class ShopeePipeline:
+    """Class graph node (nama -> fungsi + dependensi) dengan evaluasi lazy"""
+    
+    def __init__(self, workers=None):
+        self.workers = workers or PIPELINE['workers']
+        self.nodes = {}         # nama -> (fungsi, [dependensi])
+        self.results = {}       # hasil node yang sudah dihitung (memo)
+    
+    def add(self, name, func, deps=()):
+        """Daftarkan node; fungsi dipanggil dengan hasil dependensi (urut)"""
+        self.nodes[name] = (func, list(deps))
+        self.results.pop(name, None)
+        return self
+    
+    def node(self, name, *deps):
+        """Decorator untuk add()"""
+        def register(func):
+            self.add(name, func, deps)
+            return func
+        return register
+    
+    def resolve_targets(self, targets):
+        """Nama preset (config.PIPELINE['targets']) / daftar node -> daftar node"""
+        if isinstance(targets, str):
+            targets = PIPELINE['targets'].get(targets, targets.split(','))
+        return [target.strip() for target in targets if target.strip()]
+    
+    def plan(self, targets):
+        """Node yang perlu dihitung untuk target, urut topologis (tanpa yang sudah ada)"""
+        order, visiting, done = [], set(), set()
+        
+        def visit(name):
+            if name in done or name in self.results:
+                return
+            if name not in self.nodes:
+                raise ValueError(f"Node pipeline tidak dikenal: {name} (tersedia: {', '.join(self.nodes)})")
+            if name in visiting:
+                raise ValueError(f"Dependensi melingkar di node: {name}")
+            visiting.add(name)
+            for dep in self.nodes[name][1]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+        
+        for target in self.resolve_targets(targets):
+            visit(target)
+        return order
+    
+    def _compute(self, name):
+        func, deps = self.nodes[name]
+        return func(*[self.results[dep] for dep in deps])
+    
+    def run(self, targets):
+        """Hitung target beserta dependensinya -> {target: hasil}"""
+        targets = self.resolve_targets(targets)
+        order = self.plan(targets)
+        
+        if self.workers <= 1:
+            # Berurutan sesuai urutan topologis (urutan target dipertahankan)
+            for name in order:
+                self.results[name] = self._compute(name)
+            return {target: self.results[target] for target in targets}
+        
+        # Level = panjang rantai dependensi; node selevel tidak saling bergantung
+        level = {}
+        for name in order:
+            level[name] = 1 + max([level[dep] for dep in self.nodes[name][1] if dep in level], default=0)
+        for i in range(1, max(level.values(), default=0) + 1):
+            names = [name for name in order if level[name] == i]
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(names))) as executor:
+                self.results.update(zip(names, executor.map(self._compute, names)))
+        return {target: self.results[target] for target in targets}
+    
+    def get(self, name):
+        """Hasil satu node (dihitung jika belum ada)"""
+        return self.run([name])[name]
@@ -0,0 +1,227 @@
+"""
+Preview cepat untuk export Shopee besar (sampling + estimasi dengan error bound)
+"""
+
+import io
+import heapq
+import contextlib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from config import PREVIEW, SHOPEE_REQUIRED_COLUMNS
+from shopee_xlsx_reader import ShopeeXlsxReader
+from shopee_compression import STREAM_FORMATS, detect_format, open_binary, zip_members, read_member_bytes
+
+METRICS = ['Impressions', 'Clicks', 'Orders', 'Sales', 'Spend']
+
+class ShopeePreview:
+    """Class untuk preview: reservoir sample per campaign + top spender eksak"""
+    
+    def __init__(self, processor, rows_per_campaign=None, top_n=None, chunk_size=None, seed=None):
+        self.processor = processor
+        self.rows_per_campaign = rows_per_campaign or PREVIEW['rows_per_campaign']
+        self.top_n = top_n or PREVIEW['top_n']
+        self.chunk_size = chunk_size or PREVIEW['chunk_size']
+        self.rng = np.random.default_rng(seed if seed is not None else PREVIEW['seed'])
+        # Kolom Shopee yang dibutuhkan preview saja
+        self.source_columns = [col for col, name in processor.column_mapping.items()
+                               if name in ['Campaign'] + METRICS]
+    
+    def _clean(self, chunk, columns):
+        """Cleaning lewat ShopeeDataProcessor tanpa log per chunk"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            cleaned = self.processor.clean_data(chunk)
+        return cleaned[columns]
+    
+    def _iter_csv(self, file_path, member=None):
+        """Chunk CSV (boleh terkompresi / member zip), hanya kolom preview"""
+        header, sep, encoding = self.processor._read_csv_header(file_path, member)
+        self.processor.validate_columns(header)
+        usecols = [col for col in header if col.strip() in self.source_columns]
+        # Angka format Indonesia (1.234,5) langsung diparse parser C; kolom yang
+        # gagal diparse tetap string dan dibersihkan clean_data seperti biasa
+        dtypes = {col: 'str' for col in usecols
+                  if self.processor.column_mapping.get(col.strip()) == 'Campaign'}
+        with open_binary(file_path, member) as stream:
+            reader = pd.read_csv(stream, sep=sep, encoding=encoding, usecols=usecols,
+                                 dtype=dtypes, thousands='.', decimal=',', chunksize=self.chunk_size)
+            for chunk in reader:
+                chunk.columns = [col.strip() for col in chunk.columns]
+                yield chunk
+    
+    def _iter_xlsx(self, source):
+        df = ShopeeXlsxReader(source).read(SHOPEE_REQUIRED_COLUMNS, usecols=self.source_columns,
+                                           validate=self.processor.validate_columns)
+        for start in range(0, len(df), self.chunk_size):
+            yield df.iloc[start:start + self.chunk_size]
+    
+    def _iter_chunks(self, file_path):
+        """Generator chunk mentah (string, hanya kolom preview)"""
+        kind = detect_format(file_path)
+        if kind in STREAM_FORMATS:
+            yield from self._iter_csv(file_path)
+        elif kind == 'xlsx':
+            yield from self._iter_xlsx(file_path)
+        elif kind == 'zip':
+            # Bundle zip: semua export dipreview sebagai satu batch
+            for member, member_kind in zip_members(file_path):
+                if member_kind == 'xlsx':
+                    yield from self._iter_xlsx(read_member_bytes(file_path, member))
+                else:
+                    yield from self._iter_csv(file_path, member)
+        else:
+            raise ValueError("Format file tidak didukung")
+    
+    def sample(self, file_path):
+        """Streaming satu kali: jumlah baris per campaign, reservoir & heap top spender"""
+        columns = ['Campaign'] + METRICS
+        campaigns = pd.Index([])
+        counts = np.zeros(0, dtype=np.int64)
+        thresholds = np.zeros(0)            # key ke-k per campaign (inf jika reservoir belum penuh)
+        reservoir = None
+        heap = []
+        row_offset = 0
+        spend_pos, row_pos = columns.index('Spend'), len(columns) + 1
+        
+        for chunk in self._iter_chunks(file_path):
+            chunk = self._clean(chunk.reset_index(drop=True), columns)
+            names = chunk['Campaign'].fillna('')
+            new_names = pd.Index(names.unique()).difference(campaigns)
+            if len(new_names):
+                campaigns = campaigns.append(new_names)
+                counts = np.r_[counts, np.zeros(len(new_names), dtype=np.int64)]
+                thresholds = np.r_[thresholds, np.full(len(new_names), np.inf)]
+            codes = campaigns.get_indexer(names)
+            counts += np.bincount(codes, minlength=len(campaigns))
+            
+            chunk = chunk.assign(_code=codes, _row=np.arange(row_offset, row_offset + len(chunk)),
+                                 _key=self.rng.random(len(chunk)))
+            row_offset += len(chunk)
+            
+            # Heap top spender (min-heap ukuran top_n), kandidat = top_n baris chunk
+            for values in chunk.nlargest(self.top_n, 'Spend').itertuples(index=False, name=None):
+                item = (values[spend_pos], values[row_pos], values)
+                if len(heap) < self.top_n:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            
+            # Reservoir per campaign = k baris dengan random key terkecil (bottom-k);
+            # baris dengan key di atas key ke-k campaign-nya langsung dilewati
+            candidates = chunk[chunk['_key'].to_numpy() < thresholds[codes]]
+            merged = candidates if reservoir is None else pd.concat([reservoir, candidates], ignore_index=True)
+            merged = merged.iloc[np.lexsort((merged['_key'].to_numpy(), merged['_code'].to_numpy()))]
+            sorted_codes = merged['_code'].to_numpy()
+            starts = np.r_[0, np.flatnonzero(np.diff(sorted_codes)) + 1]
+            rank = np.arange(len(merged)) - np.repeat(starts, np.diff(np.r_[starts, len(merged)]))
+            reservoir = merged[rank < self.rows_per_campaign]
+            
+            last = rank == self.rows_per_campaign - 1
+            thresholds[sorted_codes[last]] = merged['_key'].to_numpy()[last]
+        
+        top_rows = pd.DataFrame([values for _, _, values in sorted(heap, reverse=True)],
+                                columns=columns + ['_code', '_row', '_key'])
+        return pd.Series(counts, index=campaigns), reservoir, top_rows, row_offset
+    
+    def estimate(self, counts, reservoir, top_rows, z=None):
+        """Estimasi total per campaign & keseluruhan (stratified, top spender = pasti)"""
+        z = z or PREVIEW['confidence_z']
+        campaigns = counts.index
+        
+        # Baris top spender dihitung eksak, sisanya diestimasi dari sample
+        sample = reservoir[~reservoir['_row'].isin(top_rows['_row'])]
+        certain = top_rows.groupby('Campaign')[METRICS].sum().reindex(campaigns, fill_value=0)
+        certain_rows = top_rows.groupby('Campaign').size().reindex(campaigns, fill_value=0)
+        
+        grouped = sample.groupby('Campaign')
+        n = grouped.size().reindex(campaigns, fill_value=0).to_numpy()
+        means = grouped[METRICS].mean().reindex(campaigns).fillna(0)
+        variances = grouped[METRICS].var(ddof=1).reindex(campaigns).fillna(0)
+        remaining = (counts - certain_rows).to_numpy()
+        
+        # Estimator stratified + finite population correction
+        fpc = np.divide(remaining - n, remaining, out=np.zeros(len(n)), where=remaining > 0)
+        scale = np.divide(remaining ** 2 * fpc, n, out=np.zeros(len(n)), where=n > 0)
+        totals = certain + means.mul(remaining, axis=0)
+        total_var = variances.mul(scale, axis=0)
+        
+        # Kovarians Sales-Spend untuk error bound ROAS keseluruhan
+        centered = sample[['Sales', 'Spend']] - means.loc[sample['Campaign'], ['Sales', 'Spend']].to_numpy()
+        cross = (centered['Sales'] * centered['Spend']).groupby(sample['Campaign']).sum()
+        covariance = (cross.reindex(campaigns, fill_value=0) /
+                      np.maximum(n - 1, 1)).to_numpy() * scale
+        
+        estimates = totals.reset_index().rename(columns={'index': 'Campaign'})
+        estimates.columns = ['Campaign'] + METRICS
+        summary = self.processor.get_campaign_summary(estimates)
+        order = pd.Index(campaigns).get_indexer(summary['Campaign'])
+        summary['Rows'] = counts.to_numpy()[order]
+        summary['Sampled_Rows'] = (n + certain_rows.to_numpy())[order]
+        summary['Spend_CI'] = z * np.sqrt(total_var['Spend'].to_numpy()[order])
+        summary['Sales_CI'] = z * np.sqrt(total_var['Sales'].to_numpy()[order])
+        
+        spend = totals['Spend'].sum()
+        sales = totals['Sales'].sum()
+        roas = sales / spend if spend > 0 else 0
+        var_spend = total_var['Spend'].sum()
+        var_sales = total_var['Sales'].sum()
+        var_roas = (var_sales + roas ** 2 * var_spend - 2 * roas * covariance.sum()) / spend ** 2 \
+            if spend > 0 else 0
+        overall = {
+            'rows': int(counts.sum()),
+            'sampled_rows': int(n.sum() + len(top_rows)),
+            'campaigns': len(campaigns),
+            'spend': spend, 'spend_ci': z * np.sqrt(var_spend),
+            'sales': sales, 'sales_ci': z * np.sqrt(var_sales),
+            'roas': roas, 'roas_ci': z * np.sqrt(max(var_roas, 0))
+        }
+        return summary, overall
+    
+    def run(self, file_path, output_file=None):
+        """Preview lengkap: sampling, estimasi, tampilkan di console & simpan CSV ringan"""
+        print(f"\n⚡ PREVIEW MODE: {file_path}")
+        try:
+            counts, reservoir, top_rows, total_rows = self.sample(file_path)
+        except Exception as e:
+            print(f"❌ Error loading data: {e}")
+            return None
+        if total_rows == 0:
+            print("❌ No data to analyze")
+            return None
+        
+        summary, overall = self.estimate(counts, reservoir, top_rows)
+        self.display(summary, overall, top_rows)
+        
+        if output_file is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"shopee_preview_{timestamp}.csv"
+        summary.to_csv(output_file, index=False)
+        print(f"\n📁 Preview saved: {output_file}")
+        return summary, overall
+    
+    def display(self, summary, overall, top_rows):
+        """Tampilkan estimasi di console"""
+        print("\n" + "="*70)
+        print("⚡ PREVIEW (ESTIMASI DARI SAMPLE)")
+        print("="*70)
+        print(f"   Rows: {overall['rows']:,} | Sampled: {overall['sampled_rows']:,} | "
+              f"Campaigns: {overall['campaigns']:,}")
+        print(f"   Total Spend: Rp {overall['spend']:,.0f} ± {overall['spend_ci']:,.0f}")
+        print(f"   Total Sales: Rp {overall['sales']:,.0f} ± {overall['sales_ci']:,.0f}")
+        print(f"   Overall ROAS: {overall['roas']:.2f} ± {overall['roas_ci']:.2f} (95%)")
+        
+        print("\n📊 STATUS MIX (estimasi):")
+        for status, count in summary['Status'].value_counts().items():
+            print(f"   {status}: {count} campaign ({count / len(summary) * 100:.1f}%)")
+        
+        print("\n🔥 WORST SPENDERS (ROAS < 1, spend terbesar):")
+        worst = summary[summary['ROAS'] < 1].nlargest(10, 'Spend')
+        if worst.empty:
+            print("   Tidak ada campaign dengan ROAS < 1 ✅")
+        for _, row in worst.iterrows():
+            print(f"   • {row['Campaign'][:40]}: Spend Rp {row['Spend']:,.0f} ± {row['Spend_CI']:,.0f} | "
+                  f"ROAS {row['ROAS']:.2f}")
+        
+        print(f"\n💸 TOP {len(top_rows)} BARIS SPEND TERBESAR (eksak):")
+        for _, row in top_rows.head(10).iterrows():
+            print(f"   • {row['Campaign'][:40]}: Rp {row['Spend']:,.0f} → Sales Rp {row['Sales']:,.0f}")
@@ -0,0 +1,332 @@
+"""
+Service HTTP lokal (asyncio, stdlib) untuk query hasil analisis Shopee
+
+Data diproses sekali lewat ShopeeDataProcessor lalu disimpan di memory
+beserta index nama campaign & kode produk. File export dipantau dan
+dimuat ulang otomatis saat ada export baru.
+
+Contoh:
+    python shopee_query_service.py data_shopee.csv
+    curl "http://127.0.0.1:8765/campaign?name=Produk 1"
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import asyncio
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_metrics import profit_total
+from shopee_setup import build_analyzer, enrich_processed_data
+from config import QUERY_SERVICE
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+class ShopeeQueryService:
+    """Class untuk melayani query JSON dari data yang tetap hangat di memory"""
+    
+    def __init__(self, source, host=None, port=None, poll_interval=None):
+        self.source = source
+        self.host = host or QUERY_SERVICE['host']
+        self.port = port if port is not None else QUERY_SERVICE['port']
+        self.poll_interval = poll_interval or QUERY_SERVICE['poll_interval']
+        self.processor = ShopeeDataProcessor()
+        # Sama seperti run_analysis: rules engine, cache hasil, identitas & katalog
+        self.analyzer = build_analyzer(self.processor)
+        self.state = None
+        self.server = None
+        self.routes = {
+            '/health': self._health,
+            '/summary': self._summary,
+            '/campaigns': self._campaigns,
+            '/campaign': self._campaign,
+            '/product': self._product,
+            '/priority': self._priority,
+            '/daily': self._daily
+        }
+    
+    def _resolve_source(self):
+        """File export terbaru (source boleh berupa file atau folder)"""
+        if os.path.isdir(self.source):
+            files = [f for pattern in ('*.csv', '*.csv.gz', '*.csv.xz', '*.csv.bz2', '*.zip', '*.xlsx')
+                     for f in glob.glob(os.path.join(self.source, pattern))]
+            return max(files, key=os.path.getmtime) if files else None
+        return self.source if os.path.exists(self.source) else None
+    
+    def _signature(self, file_path):
+        stat = os.stat(file_path)
+        return (file_path, stat.st_mtime_ns, stat.st_size)
+    
+    def _records(self, df):
+        """DataFrame -> list dict yang aman untuk JSON (NaN -> null)"""
+        if df is None or df.empty:
+            return []
+        return json.loads(df.to_json(orient='records', date_format='iso'))
+    
+    def build_state(self, file_path):
+        """Proses export & bangun snapshot + index (dipanggil di thread terpisah)"""
+        raw_data = self.processor.load_data(file_path)
+        if raw_data is None or raw_data.empty:
+            return None
+        
+        cleaned_data = self.processor.clean_data(raw_data)
+        processed_data = self.processor.calculate_additional_metrics(cleaned_data)
+        processed_data = enrich_processed_data(self.processor, processed_data)
+        campaign_summary = self.analyzer.summarize(processed_data)
+        daily_summary = self.processor.get_daily_summary(processed_data)
+        analysis_results = self.analyzer.analyze_campaigns(campaign_summary)
+        
+        # Satu record per campaign: metrik numerik + hasil analisis (Status dari analisis/rules)
+        extra = ['Campaign', 'Status'] + [c for c in analysis_results.columns
+                                          if c not in campaign_summary.columns]
+        merged = campaign_summary.drop(columns=['Status']).merge(
+            analysis_results[extra], on='Campaign', how='left'
+        )
+        campaigns = self._records(merged)
+        
+        by_name = {}
+        for pos, record in enumerate(campaigns):
+            by_name[record['Campaign']] = pos
+            by_name.setdefault(record['Campaign'].strip().lower(), pos)
+        
+        by_product = {}
+        if 'Kode_Produk' in processed_data.columns:
+            pairs = processed_data[['Kode_Produk', 'Campaign']].dropna().drop_duplicates()
+            for code, campaign in zip(pairs['Kode_Produk'].astype(str), pairs['Campaign']):
+                if campaign in by_name:
+                    by_product.setdefault(code.strip(), []).append(by_name[campaign])
+        
+        by_priority, by_status = {}, {}
+        for pos, record in enumerate(campaigns):
+            by_priority.setdefault(str(record.get('Priority')), []).append(pos)
+            by_status.setdefault(str(record.get('Status')), []).append(pos)
+        
+        total_spend = float(campaign_summary['Spend'].sum())
+        total_sales = float(campaign_summary['Sales'].sum())
+        # Profit setelah HPP jika katalog produk tersedia (cakupan HPP di label), selain itu Sales - Spend
+        _, profit_label, total_profit = profit_total(campaign_summary)
+        return {
+            'file': file_path,
+            'signature': self._signature(file_path),
+            'loaded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'campaigns': campaigns,
+            'by_name': by_name,
+            'by_product': by_product,
+            'by_priority': by_priority,
+            'by_status': by_status,
+            'sort_cache': {},
+            'daily': self._records(daily_summary),
+            'summary': {
+                'campaigns': len(campaigns),
+                'rows': len(processed_data),
+                'spend': total_spend,
+                'sales': total_sales,
+                'profit': total_profit,
+                'profit_basis': profit_label,
+                'roas': total_sales / total_spend if total_spend > 0 else 0,
+                # Status analisis (rules), sama dengan filter ?status= & by_priority
+                'status': {k: len(v) for k, v in by_status.items()},
+                'priority': {k: len(v) for k, v in by_priority.items()}
+            }
+        }
+    
+    def reload(self):
+        """Muat ulang jika ada export baru; True jika snapshot berganti"""
+        file_path = self._resolve_source()
+        if file_path is None:
+            return False
+        if self.state is not None and self.state['signature'] == self._signature(file_path):
+            return False
+        
+        print(f"🔄 Loading export: {file_path}")
+        state = self.build_state(file_path)
+        if state is None:
+            print("⚠️ Export tidak bisa dimuat, tetap memakai data sebelumnya")
+            return False
+        # Ganti snapshot sekaligus: request yang berjalan tetap memakai snapshot lama
+        self.state = state
+        print(f"✅ Data siap: {state['summary']['campaigns']} campaign dari {file_path}")
+        return True
+    
+    async def _watch(self):
+        """Polling mtime file export, reload di thread agar query tetap dilayani"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await loop.run_in_executor(None, self.reload)
+            except Exception as e:
+                print(f"❌ Error reloading data: {e}")
+    
+    # --- Handler query (semua mengembalikan (status, payload)) ---
+    
+    def _health(self, state, params):
+        if state is None:
+            return 503, {'status': 'loading'}
+        return 200, {'status': 'ok', 'file': state['file'], 'loaded_at': state['loaded_at'],
+                     'campaigns': len(state['campaigns'])}
+    
+    def _summary(self, state, params):
+        return 200, state['summary']
+    
+    def _sort_order(self, state, column, descending):
+        """Urutan posisi campaign per kolom (di-cache per snapshot, null di akhir)"""
+        key = (column, descending)
+        order = state['sort_cache'].get(key)
+        if order is None:
+            records = state['campaigns']
+            values = [p for p in range(len(records)) if records[p][column] is not None]
+            order = sorted(values, key=lambda p: records[p][column], reverse=descending) + \
+                [p for p in range(len(records)) if records[p][column] is None]
+            state['sort_cache'][key] = order
+        return order
+    
+    def _campaigns(self, state, params):
+        records = state['campaigns']
+        limit = int(params.get('limit', QUERY_SERVICE['default_limit']))
+        sort = params.get('sort')
+        if sort and records and sort not in records[0]:
+            return 400, {'error': f"Kolom sort tidak dikenal: {sort}"}
+        order = self._sort_order(state, sort, params.get('order', 'desc') == 'desc') if sort \
+            else range(len(records))
+        
+        status = params.get('status')
+        if status:
+            # Prefix status ("UNTUNG" cocok dengan "UNTUNG ✅"), lewat index status
+            allowed = set()
+            for label, positions in state['by_status'].items():
+                if label.upper().startswith(status.upper()):
+                    allowed.update(positions)
+            selected = []
+            for p in order:
+                if p in allowed:
+                    selected.append(p)
+                    if len(selected) == limit:
+                        break
+            count = len(allowed)
+        else:
+            selected = order[:limit]
+            count = len(records)
+        return 200, {'count': count, 'campaigns': [records[p] for p in selected]}
+    
+    def _campaign(self, state, params):
+        name = params.get('name')
+        if not name:
+            return 400, {'error': "Parameter 'name' wajib diisi"}
+        pos = state['by_name'].get(name, state['by_name'].get(name.strip().lower()))
+        if pos is None:
+            return 404, {'error': f"Campaign tidak ditemukan: {name}"}
+        return 200, state['campaigns'][pos]
+    
+    def _product(self, state, params):
+        code = params.get('code')
+        if not code:
+            return 400, {'error': "Parameter 'code' wajib diisi"}
+        positions = state['by_product'].get(code.strip())
+        if not positions:
+            return 404, {'error': f"Kode produk tidak ditemukan: {code}"}
+        return 200, {'code': code, 'campaigns': [state['campaigns'][p] for p in positions]}
+    
+    def _priority(self, state, params):
+        level = params.get('level', 'HIGH').upper()
+        positions = state['by_priority'].get(level, [])
+        return 200, {'level': level, 'count': len(positions),
+                     'campaigns': [state['campaigns'][p] for p in positions]}
+    
+    def _daily(self, state, params):
+        return 200, {'days': state['daily']}
+    
+    def handle_query(self, path, query=''):
+        """Routing query -> (status, payload); bisa dipanggil tanpa HTTP"""
+        handler = self.routes.get(path.rstrip('/') or '/health')
+        if handler is None:
+            return 404, {'error': f"Endpoint tidak dikenal: {path}", 'endpoints': list(self.routes)}
+        state = self.state
+        if state is None and handler != self._health:
+            return 503, {'error': 'Data belum dimuat'}
+        params = {k: v[-1] for k, v in parse_qs(query).items()}
+        try:
+            return handler(state, params)
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            # Error lain tetap dijawab JSON, koneksi tidak diputus
+            return 500, {'error': f"{type(e).__name__}: {e}"}
+    
+    async def _handle_connection(self, reader, writer):
+        """HTTP/1.1 minimal dengan keep-alive"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                
+                parts = request_line.decode('latin-1').split()
+                if len(parts) < 2:
+                    status, payload = 400, {'error': 'Request tidak valid'}
+                elif parts[0] != 'GET':
+                    status, payload = 405, {'error': 'Hanya GET yang didukung'}
+                else:
+                    url = urlsplit(parts[1])
+                    status, payload = self.handle_query(url.path, url.query)
+                
+                body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close' and \
+                    (len(parts) > 2 and parts[2] == 'HTTP/1.1')
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+    
+    async def start(self):
+        """Muat data awal lalu buka server (tanpa blocking)"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.reload)
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._watcher = asyncio.create_task(self._watch())
+        print(f"🌐 Query service: http://{self.host}:{self.port}  (endpoint: {', '.join(self.routes)})")
+    
+    async def stop(self):
+        self._watcher.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+    
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+def main():
+    """Jalankan service: python shopee_query_service.py [file_atau_folder_export]"""
+    source = sys.argv[1] if len(sys.argv) > 1 else QUERY_SERVICE['source']
+    service = ShopeeQueryService(source)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\n👋 Query service stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Perbandingan laporan Shopee antar periode (period-over-period)
+"""
+
+import os
+import re
+import glob
+import pandas as pd
+import numpy as np
+import openpyxl
+
+class ShopeeReportDiff:
+    """Class untuk membandingkan Campaign_Summary dengan laporan sebelumnya"""
+    
+    report_pattern = re.compile(r'shopee_analysis_report_(\d{8}_\d{6})\.xlsx$')
+    columns = ['Campaign', 'Spend', 'Sales', 'ROAS', 'Status']
+    
+    def find_previous_report(self, directory='.', exclude=None):
+        """Cari laporan terbaru berdasarkan timestamp di nama file"""
+        reports = []
+        for path in glob.glob(os.path.join(directory, 'shopee_analysis_report_*.xlsx')):
+            match = self.report_pattern.search(os.path.basename(path))
+            if match and (exclude is None or os.path.abspath(path) != os.path.abspath(exclude)):
+                reports.append((match.group(1), path))
+        
+        if not reports:
+            return None
+        return max(reports)[1]
+    
+    def load_campaign_summary(self, file_path):
+        """Load hanya sheet Campaign_Summary (read-only, kolom yang diperlukan)"""
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if 'Campaign_Summary' not in wb.sheetnames:
+                return pd.DataFrame(columns=self.columns)
+            
+            rows = wb['Campaign_Summary'].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame(columns=self.columns)
+            
+            positions = {col: header.index(col) for col in self.columns if col in header}
+            data = {col: [] for col in positions}
+            for row in rows:
+                for col, pos in positions.items():
+                    data[col].append(row[pos] if pos < len(row) else None)
+        finally:
+            wb.close()
+        
+        summary = pd.DataFrame(data)
+        return summary.reindex(columns=self.columns)
+    
+    def _status_base(self, status):
+        """'UNTUNG ✅' -> 'UNTUNG' (hilangkan emoji)"""
+        return (status.fillna('').astype(str)
+                .str.replace(r'[^A-Za-z ]', '', regex=True).str.strip())
+    
+    def compare(self, previous, current):
+        """Join previous & current pada Campaign, hitung delta & transisi status"""
+        previous = previous.drop_duplicates('Campaign', keep='last')
+        current = current.reindex(columns=self.columns)
+        
+        # Hash index pada Campaign laporan sebelumnya
+        prev_index = pd.Index(previous['Campaign'])
+        pos = prev_index.get_indexer(current['Campaign'])
+        matched = pos >= 0
+        removed = np.ones(len(previous), dtype=bool)
+        removed[pos[matched]] = False
+        
+        if len(previous):
+            prev_rows = previous.iloc[np.where(matched, pos, 0)].reset_index(drop=True)
+        else:
+            prev_rows = pd.DataFrame(index=range(len(current)), columns=self.columns)
+        changes = pd.DataFrame({'Campaign': current['Campaign'].to_numpy()})
+        updated = np.zeros(len(current), dtype=bool)
+        for col in ['Spend', 'Sales', 'ROAS']:
+            now = pd.to_numeric(current[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+            prev = pd.to_numeric(prev_rows[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+            prev = np.where(matched, prev, 0)
+            changes[f'{col}_Prev'] = prev
+            changes[f'{col}_Now'] = now
+            changes[f'{col}_Delta'] = now - prev
+            # Toleransi presisi float dari nilai yang dibaca ulang dari Excel
+            updated |= ~np.isclose(now, prev, rtol=1e-9, atol=0)
+        
+        status_prev = self._status_base(prev_rows['Status']).where(matched, '')
+        status_now = self._status_base(current['Status'].reset_index(drop=True))
+        changes['Status_Prev'] = status_prev.to_numpy()
+        changes['Status_Now'] = status_now.to_numpy()
+        changes['Status_Transition'] = np.where(
+            matched & (status_prev != status_now).to_numpy(),
+            status_prev + ' → ' + status_now,
+            ''
+        )
+        # UPDATED hanya jika ada metrik yang berubah
+        changes['Change_Type'] = np.select(
+            [~matched, changes['Status_Transition'] != '', updated],
+            ['NEW', 'STATUS CHANGED', 'UPDATED'],
+            'UNCHANGED'
+        )
+        
+        # Campaign yang hilang dari laporan sekarang
+        if removed.any():
+            gone = previous[removed]
+            removed_df = pd.DataFrame({'Campaign': gone['Campaign'].to_numpy()})
+            for col in ['Spend', 'Sales', 'ROAS']:
+                prev = pd.to_numeric(gone[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+                removed_df[f'{col}_Prev'] = prev
+                removed_df[f'{col}_Now'] = 0.0
+                removed_df[f'{col}_Delta'] = -prev
+            removed_df['Status_Prev'] = self._status_base(gone['Status']).to_numpy()
+            removed_df['Status_Now'] = ''
+            removed_df['Status_Transition'] = ''
+            removed_df['Change_Type'] = 'REMOVED'
+            changes = pd.concat([changes, removed_df], ignore_index=True)
+        
+        return changes
+    
+    def diff_with_previous(self, campaign_summary, directory='.', exclude=None):
+        """Bandingkan ringkasan sekarang dengan laporan sebelumnya (jika ada)"""
+        previous_report = self.find_previous_report(directory, exclude)
+        if previous_report is None:
+            print("\nℹ️ No previous report found, skipping comparison")
+            return pd.DataFrame()
+        
+        print(f"\n🔁 Comparing with previous report: {previous_report}")
+        previous = self.load_campaign_summary(previous_report)
+        changes = self.compare(previous, campaign_summary)
+        
+        transitions = (changes['Status_Transition'] != '').sum()
+        unchanged = (changes['Change_Type'] == 'UNCHANGED').sum()
+        print(f"   ✅ {len(changes)} campaigns compared, {transitions} status transitions, "
+              f"{unchanged} unchanged")
+        return changes
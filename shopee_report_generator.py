@@ -2,12 +2,38 @@
 Generator laporan Excel untuk analisis Shopee
 """
 
+import os
+import re
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from config import SEGMENTED_REPORT
+from shopee_metrics import PROFIT_LABELS, format_rupiah, profit_total
+
+def _write_segment_report(kwargs):
+    """Worker proses: ringkasan dari baris segmen lalu tulis workbook satu segmen
+    
+    Return (file, jumlah campaign, spend, sales) untuk workbook index.
+    """
+    kwargs = dict(kwargs)
+    processor = kwargs.pop('processor', None)
+    rows = kwargs.pop('segment_rows', None)
+    if kwargs.get('campaign_summary') is None:
+        kwargs['campaign_summary'] = pd.DataFrame()
+    kwargs['daily_summary'] = pd.DataFrame()
+    if processor is not None and rows is not None and not rows.empty:
+        if kwargs['campaign_summary'].empty:
+            kwargs['campaign_summary'] = processor.get_campaign_summary(rows)
+        kwargs['daily_summary'] = processor.get_daily_summary(rows)
+    summary = kwargs['campaign_summary']
+    file_name = ShopeeReportGenerator().generate_excel_report(**kwargs)
+    if summary.empty:
+        return file_name, 0, 0, 0
+    return file_name, len(summary), summary['Spend'].sum(), summary['Sales'].sum()
 
 class ShopeeReportGenerator:
     """Class untuk generate laporan Excel Shopee"""
@@ -32,9 +58,11 @@ class ShopeeReportGenerator:
         self.subheader_font = Font(name='Calibri', size=11, bold=True)
         self.normal_font = Font(name='Calibri', size=10)
         self.bold_font = Font(name='Calibri', size=10, bold=True)
-        
+    
     def generate_excel_report(self, raw_data, cleaned_data, analysis_results, 
-                             campaign_summary, daily_summary, file_name=None):
+                             campaign_summary, daily_summary, file_name=None,
+                             hourly_heatmap=None, budget_plan=None, history_trends=None,
+                             changes=None, cube_rollups=None):
         """Generate comprehensive Excel report"""
         if file_name is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -44,17 +72,22 @@ class ShopeeReportGenerator:
         
         # Create Excel writer
         with pd.ExcelWriter(file_name, engine='openpyxl') as writer:
-            # Sheet 1: Raw Data
-            raw_data.to_excel(writer, sheet_name='Raw_Data', index=False)
+            # Sheet 1: Raw Data = kolom export yang dipakai pipeline (usecols), nilai asli;
+            # kolom lain (mis. Urutan) tidak dimuat. None di spill mode: data tidak dimuat utuh
+            if raw_data is not None:
+                raw_data.to_excel(writer, sheet_name='Raw_Data', index=False)
             
             # Sheet 2: Cleaned Data
-            cleaned_data.to_excel(writer, sheet_name='Cleaned_Data', index=False)
+            if cleaned_data is not None:
+                cleaned_data.to_excel(writer, sheet_name='Cleaned_Data', index=False)
             
             # Sheet 3: Campaign Analysis
             analysis_results.to_excel(writer, sheet_name='Campaign_Analysis', index=False)
             
             # Sheet 4: Campaign Summary
-            campaign_summary.to_excel(writer, sheet_name='Campaign_Summary', index=False)
+            # Break_Even_ROAS NaN (margin <= 0) ditampilkan N/A
+            campaign_summary.fillna({'Break_Even_ROAS': 'N/A'}).to_excel(
+                writer, sheet_name='Campaign_Summary', index=False)
             
             # Sheet 5: Daily Summary
             if not daily_summary.empty:
@@ -68,6 +101,27 @@ class ShopeeReportGenerator:
             
             # Sheet 8: Performance Dashboard
             self._create_dashboard_sheet(writer, analysis_results, campaign_summary)
+            
+            # Sheet 9: Hour Heatmap
+            if hourly_heatmap is not None and not hourly_heatmap.empty:
+                self._create_hour_heatmap_sheet(writer, hourly_heatmap)
+            
+            # Sheet 10: Budget Plan
+            if budget_plan is not None and not budget_plan.empty:
+                budget_plan.to_excel(writer, sheet_name='Budget_Plan', index=False)
+            
+            # Sheet 11: History Trends
+            if history_trends is not None and not history_trends.empty:
+                history_trends.to_excel(writer, sheet_name='History_Trends', index=False)
+            
+            # Sheet 12: Changes vs previous report
+            if changes is not None and not changes.empty:
+                changes.to_excel(writer, sheet_name='Changes', index=False)
+            
+            # Sheet 13+: Rollup dari cube (satu sheet per rollup)
+            for sheet_name, rollup in (cube_rollups or {}).items():
+                if rollup is not None and not rollup.empty:
+                    rollup.to_excel(writer, sheet_name=sheet_name[:31], index=False)
         
         # Apply formatting
         self._apply_excel_formatting(file_name)
@@ -75,6 +129,173 @@ class ShopeeReportGenerator:
         print(f"✅ Excel report generated: {file_name}")
         return file_name
     
+    def _segment_rows(self, segment_by, rows, campaign_summary):
+        """Segmen -> (posisi baris data, label campaign), atau None jika kolom tidak ada
+        
+        Kolom campaign summary (mis. Status) dipetakan per campaign; kolom data
+        (mis. Mode_Bidding, Penempatan_Iklan) per baris, karena satu campaign
+        bisa memakai beberapa nilai.
+        """
+        key = 'Campaign_ID' if 'Campaign_ID' in campaign_summary.columns and \
+            rows is not None and 'Campaign_ID' in rows.columns else 'Campaign'
+        labels = pd.Series(campaign_summary['Campaign'].to_numpy(), index=campaign_summary[key].to_numpy())
+        if segment_by in campaign_summary.columns:
+            by_row = False
+            summary_values = pd.Series(campaign_summary[segment_by].fillna('(kosong)').astype(str).to_numpy(),
+                                       index=labels.index)
+            row_values = rows[key].map(summary_values) if rows is not None else None
+        elif rows is not None and segment_by in rows.columns:
+            by_row = True
+            row_values = rows[segment_by].fillna('(kosong)').astype(str)
+        else:
+            return None, False
+        
+        segments = {}
+        if row_values is not None:
+            values = row_values.to_numpy(dtype=object)
+            for segment, positions in pd.Series(values).groupby(values).indices.items():
+                keys = rows[key].iloc[positions].unique()
+                segments[segment] = (positions, labels.reindex(keys).dropna().unique())
+        if not by_row:
+            # Campaign per segmen langsung dari summary (juga tanpa data per baris)
+            segments = {segment: (segments.get(segment, (np.zeros(0, dtype=np.int64),))[0],
+                                  labels.to_numpy()[(summary_values == segment).to_numpy()])
+                        for segment in summary_values.unique()}
+        return segments, by_row
+    
+    def _rows_of(self, df, positions, n_rows):
+        """Baris segmen dari data per baris (urutan sama dengan data sumber)"""
+        if df is None or len(df) != n_rows:
+            return None
+        return df.iloc[positions]
+    
+    def _campaign_rows(self, df, campaigns):
+        """Baris tabel level campaign untuk campaign di segmen"""
+        if df is None or df.empty:
+            return None
+        campaign_col = 'Campaign' if 'Campaign' in df.columns else 'Nama Iklan'
+        if campaign_col not in df.columns:
+            return None
+        return df[df[campaign_col].isin(campaigns)]
+    
+    def generate_segmented_reports(self, raw_data, cleaned_data, analysis_results,
+                                   campaign_summary, segment_by=None, processor=None,
+                                   output_dir=None, max_workers=None,
+                                   hourly_heatmap=None, budget_plan=None,
+                                   history_trends=None, changes=None, processed_data=None):
+        """Generate satu workbook per segmen secara paralel + workbook index
+        
+        Segmen diambil dari kolom campaign summary (mis. Status) atau data
+        (mis. Mode_Bidding, Penempatan_Iklan). Untuk kolom data, baris
+        dipilih per nilai segmen dan Campaign_Summary dihitung ulang dari
+        baris tersebut; daily summary per segmen dihitung di proses worker
+        jika processor diberikan.
+        """
+        segment_by = segment_by or SEGMENTED_REPORT['segment_by']
+        max_workers = max_workers or SEGMENTED_REPORT['max_workers'] or os.cpu_count()
+        rows = processed_data if processed_data is not None else cleaned_data
+        segments, by_row = self._segment_rows(segment_by, rows, campaign_summary)
+        if segments is None:
+            print(f"❌ Kolom segmen tidak ditemukan: {segment_by}")
+            return None
+        if by_row and processor is None:
+            print(f"❌ Segmen per baris ({segment_by}) butuh processor untuk Campaign_Summary")
+            return None
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = output_dir or SEGMENTED_REPORT['output_dir'] or f"shopee_segment_reports_{timestamp}"
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"\n💾 Generating segmented reports by {segment_by}: {output_dir}")
+        
+        n_rows = len(rows) if rows is not None else 0
+        if by_row:
+            shared = pd.Series([name for _, names in segments.values() for name in names]).value_counts()
+            mixed = int((shared > 1).sum())
+            if mixed:
+                print(f"   ⚠️ {mixed} campaign memakai lebih dari satu {segment_by}: Campaign_Summary & "
+                      f"Daily per segmen dari baris segmen, sheet level campaign memuat campaign utuh")
+        
+        campaign_frames = {
+            'analysis_results': analysis_results,
+            'hourly_heatmap': hourly_heatmap,
+            'budget_plan': budget_plan,
+            'history_trends': history_trends,
+            'changes': changes
+        }
+        jobs = []
+        for segment in sorted(segments):
+            positions, campaigns = segments[segment]
+            slug = re.sub(r'[^0-9A-Za-z]+', '_', segment).strip('_') or 'segmen'
+            kwargs = {name: self._campaign_rows(df, campaigns) for name, df in campaign_frames.items()}
+            kwargs['raw_data'] = self._rows_of(raw_data, positions, n_rows)
+            kwargs['cleaned_data'] = self._rows_of(cleaned_data, positions, n_rows)
+            if kwargs['analysis_results'] is None and analysis_results is not None:
+                kwargs['analysis_results'] = analysis_results.iloc[:0]
+            # Kolom data: summary dari baris segmen (di worker); kolom summary: baris summary
+            kwargs['campaign_summary'] = None if by_row else self._campaign_rows(campaign_summary, campaigns)
+            kwargs['processor'] = processor
+            kwargs['segment_rows'] = self._rows_of(rows, positions, n_rows) if processor is not None else None
+            kwargs['file_name'] = os.path.join(output_dir, f"segment_{len(jobs) + 1:02d}_{slug}.xlsx")
+            jobs.append((segment, kwargs))
+        
+        # Tiap workbook diringkas, ditulis & diformat di proses terpisah
+        if max_workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+                results = list(executor.map(_write_segment_report, [kwargs for _, kwargs in jobs]))
+        else:
+            results = [_write_segment_report(kwargs) for _, kwargs in jobs]
+        
+        index_file = self._create_segment_index(
+            output_dir, segment_by, [(segment,) + result for (segment, _), result in zip(jobs, results)])
+        print(f"✅ {len(results)} segment reports generated, index: {index_file}")
+        return index_file
+    
+    def generate_parquet_outputs(self, tables, output_dir, backend):
+        """Tulis tabel hasil ke Parquet (satu file per tabel) lewat backend Arrow"""
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"\n💾 Writing Parquet outputs: {output_dir}")
+        files = []
+        for name, df in tables.items():
+            if df is None or df.empty:
+                continue
+            try:
+                file_path = backend.write_parquet(df, os.path.join(output_dir, f"{name}.parquet"))
+            except Exception as e:
+                print(f"   ⚠️ {name} tidak bisa ditulis ke Parquet: {e}")
+                continue
+            if file_path is None:
+                return []
+            files.append(file_path)
+            print(f"   ✅ {name}.parquet")
+        return files
+    
+    def _create_segment_index(self, output_dir, segment_by, segments):
+        """Workbook index dengan link ke workbook tiap segmen"""
+        index_file = os.path.join(output_dir, 'index.xlsx')
+        rows = []
+        for segment, file_name, campaigns, spend, sales in segments:
+            rows.append({
+                segment_by: segment,
+                'Campaigns': campaigns,
+                'Spend': spend,
+                'Sales': sales,
+                'ROAS': round(sales / spend, 2) if spend > 0 else 0,
+                'File': os.path.basename(file_name)
+            })
+        
+        index_df = pd.DataFrame(rows)
+        with pd.ExcelWriter(index_file, engine='openpyxl') as writer:
+            index_df.to_excel(writer, sheet_name='Index', index=False)
+            ws = writer.sheets['Index']
+            file_col = index_df.columns.get_loc('File') + 1
+            for row in range(2, len(index_df) + 2):
+                cell = ws.cell(row=row, column=file_col)
+                cell.hyperlink = cell.value
+                cell.style = 'Hyperlink'
+            self._format_headers(ws, 'Index')
+            self._auto_adjust_columns(ws)
+        return index_file
+    
     def _create_recommendations_sheet(self, writer, analysis_results):
         """Create recommendations sheet"""
         recommendations_data = []
@@ -164,7 +385,8 @@ class ShopeeReportGenerator:
         total_campaigns = len(campaign_summary)
         total_spend = campaign_summary['Spend'].sum()
         total_sales = campaign_summary['Sales'].sum()
-        total_profit = campaign_summary['Profit'].sum()
+        # Profit setelah HPP jika katalog produk tersedia (cakupan HPP di label), selain itu Sales - Spend
+        profit_col, profit_label, total_profit = profit_total(campaign_summary)
         overall_roas = total_sales / total_spend if total_spend > 0 else 0
         
         # Campaign status distribution
@@ -179,7 +401,7 @@ class ShopeeReportGenerator:
         dashboard_data.append(['Total Campaigns', total_campaigns, ''])
         dashboard_data.append(['Total Spend', f"Rp {total_spend:,.0f}", ''])
         dashboard_data.append(['Total Sales', f"Rp {total_sales:,.0f}", ''])
-        dashboard_data.append(['Total Profit', f"Rp {total_profit:,.0f}", 
+        dashboard_data.append([f"Total {profit_label}", f"Rp {total_profit:,.0f}", 
                              'Green if profit, Red if loss'])
         dashboard_data.append(['Overall ROAS', f"{overall_roas:.2f}", 
                              f"{'✅ Excellent' if overall_roas > 1.5 else '⚠️ Needs attention'}"])
@@ -191,12 +413,12 @@ class ShopeeReportGenerator:
             dashboard_data.append([status, count, f"{percentage:.1f}%"])
         dashboard_data.append(['', '', ''])
         
-        dashboard_data.append(['TOP 3 PERFORMERS (by ROAS)', 'ROAS', 'Profit'])
+        dashboard_data.append(['TOP 3 PERFORMERS (by ROAS)', 'ROAS', PROFIT_LABELS[profit_col]])
         for _, row in top_3.iterrows():
             dashboard_data.append([
                 row['Campaign'][:30] + ('...' if len(row['Campaign']) > 30 else ''),
                 f"{row['ROAS']:.2f}",
-                f"Rp {row['Profit']:,.0f}"
+                format_rupiah(row[profit_col])
             ])
         dashboard_data.append(['', '', ''])
         
@@ -206,7 +428,7 @@ class ShopeeReportGenerator:
                 dashboard_data.append([
                     row['Campaign'][:30] + ('...' if len(row['Campaign']) > 30 else ''),
                     f"{row['ROAS']:.2f}",
-                    f"Rp {row['Spend'] - row['Sales']:,.0f}"
+                    format_rupiah(-row[profit_col])
                 ])
         
         # Convert to DataFrame
@@ -214,6 +436,38 @@ class ShopeeReportGenerator:
         dashboard_df.to_excel(writer, sheet_name='Performance_Dashboard', 
                              index=False, header=False)
     
+    def _create_hour_heatmap_sheet(self, writer, hourly_heatmap):
+        """Create hour heatmap sheet"""
+        # ROAS per window jadwal harian (07-09, 12-13, 20-22, 00-01, lainnya)
+        window_totals = hourly_heatmap.groupby(['Campaign', 'Window']).agg({
+            'Sales': 'sum',
+            'Spend': 'sum'
+        })
+        window_roas = np.where(
+            window_totals['Spend'] > 0,
+            window_totals['Sales'] / window_totals['Spend'],
+            0
+        )
+        window_df = pd.Series(window_roas, index=window_totals.index).unstack('Window')
+        window_order = ['morning', 'noon', 'evening', 'midnight', 'other']
+        window_df = window_df.reindex(columns=[w for w in window_order if w in window_df.columns])
+        window_df.columns = [f'ROAS_{w}' for w in window_df.columns]
+        window_df['Best_Window'] = window_df.idxmax(axis=1).str.replace('ROAS_', '', regex=False)
+        window_df = window_df.reset_index()
+        
+        # Detail campaign x hari x jam (hanya sel yang ada datanya)
+        detail_df = hourly_heatmap.sort_values(['Campaign', 'Hari', 'Jam'])
+        
+        window_df.to_excel(writer, sheet_name='Hour_Heatmap', startrow=0, index=False)
+        if 'Basis' in detail_df.columns:
+            # Basis jam (Tanggal Mulai vs snapshot) di atas tabel detail
+            note = pd.DataFrame([[f"Basis hari/jam: {detail_df['Basis'].iloc[0]}"]])
+            note.to_excel(writer, sheet_name='Hour_Heatmap', startrow=len(window_df) + 2,
+                          index=False, header=False)
+            detail_df = detail_df.drop(columns='Basis')
+        detail_df.to_excel(writer, sheet_name='Hour_Heatmap', 
+                          startrow=len(window_df) + 3, index=False)
+    
     def _get_timeline_by_priority(self, priority):
         """Get timeline based on priority"""
         timelines = {
@@ -243,7 +497,7 @@ class ShopeeReportGenerator:
             
             wb.save(file_path)
             print("✅ Excel formatting applied")
-            
+        
         except Exception as e:
             print(f"⚠️ Could not apply Excel formatting: {e}")
     
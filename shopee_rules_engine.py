@@ -0,0 +1,239 @@
+"""
+Rules engine rekomendasi campaign Shopee (aturan deklaratif -> mask NumPy)
+"""
+
+import os
+import re
+import json
+import pandas as pd
+import numpy as np
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from config import RULES_FILE, PERFORMANCE_THRESHOLDS
+
+CONDITION_PATTERN = re.compile(r'^\s*(\w+)\s*(<=|>=|==|!=|<|>)\s*(-?[\d.]+)\s*$')
+
+# Emoji status di Campaign_Summary (nama rule lain ditampilkan apa adanya)
+STATUS_EMOJI = {
+    'BONCOS': '⚠️', 'RUGI': '❌', 'BREAK EVEN': '⚖️', 'UNTUNG': '✅', 'UNTUNG TINGGI': '🚀'
+}
+
+def default_status_rules():
+    """Ladder status bawaan dari PERFORMANCE_THRESHOLDS (jika rules file tidak mencakup)"""
+    ladder = [
+        ('TIDAK AKTIF', 'MEDIUM', [{'metric': 'Spend', 'op': '==', 'value': 0}]),
+        ('BONCOS', 'HIGH', [{'metric': 'ROAS', 'op': '<', 'value': PERFORMANCE_THRESHOLDS['ROAS_CRITICAL']}]),
+        ('RUGI', 'HIGH', [{'metric': 'ROAS', 'op': '<', 'value': PERFORMANCE_THRESHOLDS['ROAS_MINIMUM']}]),
+        ('BREAK EVEN', 'MEDIUM', [{'metric': 'ROAS', 'op': '<', 'value': PERFORMANCE_THRESHOLDS['ROAS_BREAK_EVEN']}]),
+        ('UNTUNG', 'LOW', [{'metric': 'ROAS', 'op': '<', 'value': PERFORMANCE_THRESHOLDS['ROAS_EXCELLENT']}]),
+        ('UNTUNG TINGGI', 'LOW', [])
+    ]
+    return [{'name': name, 'group': 'status', 'priority': i + 1, 'level': level, 'when': conditions}
+            for i, (name, level, conditions) in enumerate(ladder)]
+
+def status_input(df):
+    """Data untuk rule: dengan HPP, ROAS dibaca sebagai Margin_ROAS (break-even = 1.0)"""
+    if 'Margin_ROAS' in df.columns:
+        return df.assign(ROAS=df['Margin_ROAS'].fillna(df['ROAS']))
+    return df
+
+class ShopeeRulesEngine:
+    """Class untuk evaluasi aturan rekomendasi secara vectorized"""
+    
+    operators = {
+        '<': np.less, '<=': np.less_equal, '>': np.greater,
+        '>=': np.greater_equal, '==': np.equal, '!=': np.not_equal
+    }
+    
+    def __init__(self, rules_file=None, chunk_size=8192, rules=None):
+        self.rules_file = rules_file or RULES_FILE
+        self.chunk_size = chunk_size
+        self.rules = []
+        self._status_engines = None
+        if rules is not None:
+            self.compile(rules)
+        elif os.path.exists(self.rules_file):
+            self.load_rules(self.rules_file)
+    
+    def load_rules(self, rules_file):
+        """Load & compile aturan dari file JSON/YAML"""
+        with open(rules_file, encoding='utf-8') as f:
+            if rules_file.endswith(('.yaml', '.yml')):
+                if yaml is None:
+                    raise ImportError("PyYAML belum terpasang, gunakan rules .json")
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        
+        rules = data['rules'] if isinstance(data, dict) else data
+        self.compile(rules)
+        print(f"✅ Rules loaded: {len(self.rules)} rules from {rules_file}")
+    
+    def _parse_conditions(self, rule):
+        """Kondisi rule: string 'ROAS > 1.2 & CTR > 0.02' atau list dict"""
+        conditions = rule.get('when', rule.get('conditions', []))
+        if isinstance(conditions, str):
+            parsed = []
+            for part in conditions.split('&'):
+                match = CONDITION_PATTERN.match(part)
+                if not match:
+                    raise ValueError(f"Kondisi tidak valid di rule '{rule['name']}': {part.strip()}")
+                parsed.append({'metric': match.group(1), 'op': match.group(2),
+                               'value': float(match.group(3))})
+            return parsed
+        return conditions
+    
+    def compile(self, rules):
+        """Compile semua kondisi sekali: dikelompokkan per (metrik, operator)
+        
+        Kondisi dengan metrik & operator yang sama dievaluasi sebagai satu
+        broadcast kolom-vs-baris, lalu setiap rule = AND dari slot kondisinya.
+        """
+        self.rules = sorted(rules, key=lambda r: (r.get('group', 'default'), r.get('priority', 0)))
+        self._status_engines = None
+        self.groups = list(dict.fromkeys(r.get('group', 'default') for r in self.rules))
+        self.rule_groups = np.array([r.get('group', 'default') for r in self.rules])
+        
+        conditions = []
+        rule_conditions = []
+        for rule in self.rules:
+            positions = []
+            for cond in self._parse_conditions(rule):
+                if cond['op'] not in self.operators:
+                    raise ValueError(f"Operator tidak dikenal di rule '{rule['name']}': {cond['op']}")
+                positions.append(len(conditions))
+                conditions.append((cond['metric'], cond['op'], float(cond['value'])))
+            rule_conditions.append(positions)
+        
+        self.metrics = list(dict.fromkeys(metric for metric, _, _ in conditions))
+        
+        # Urutkan kondisi per (metrik, operator) -> blok kolom bersebelahan
+        order = sorted(range(len(conditions)),
+                       key=lambda c: (self.metrics.index(conditions[c][0]), conditions[c][1]))
+        new_position = np.empty(len(conditions), dtype=np.int64)
+        new_position[order] = np.arange(len(conditions))
+        self.cond_value = np.array([conditions[c][2] for c in order], dtype=np.float64)
+        
+        self.blocks = []
+        for pos, c in enumerate(order):
+            key = (self.metrics.index(conditions[c][0]), conditions[c][1])
+            if self.blocks and self.blocks[-1][:2] == key:
+                self.blocks[-1][3] = pos + 1
+            else:
+                self.blocks.append([key[0], key[1], pos, pos + 1])
+        
+        # Slot kondisi per rule, dipadding dengan kolom "selalu True"
+        n_slots = max((len(p) for p in rule_conditions), default=0)
+        always_true = len(conditions)
+        self.rule_slots = np.full((len(self.rules), max(n_slots, 1)), always_true, dtype=np.int64)
+        for r, positions in enumerate(rule_conditions):
+            self.rule_slots[r, :len(positions)] = new_position[positions]
+    
+    def _metric_matrix(self, df):
+        """Matriks nilai metrik (campaign x metrik)"""
+        missing = [m for m in self.metrics if m not in df.columns]
+        if missing:
+            raise KeyError(f"Metrik rule tidak ada di data: {missing}")
+        if not self.metrics:
+            return np.zeros((len(df), 0))
+        return np.column_stack([df[m].to_numpy(dtype=np.float64) for m in self.metrics])
+    
+    def rule_masks(self, df):
+        """Mask boolean (campaign x rule) untuk semua rule sekaligus"""
+        values = self._metric_matrix(df)
+        n = len(df)
+        masks = np.empty((n, len(self.rules)), dtype=bool)
+        
+        # Dievaluasi per blok campaign agar memori tetap kecil
+        cond_masks = np.ones((min(n, self.chunk_size), len(self.cond_value) + 1), dtype=bool)
+        for begin in range(0, n, self.chunk_size):
+            block = values[begin:begin + self.chunk_size]
+            out = cond_masks[:len(block)]
+            for metric, op, start, end in self.blocks:
+                self.operators[op](block[:, metric, None], self.cond_value[None, start:end],
+                                   out=out[:, start:end])
+            
+            rule_block = masks[begin:begin + len(block)]
+            np.take(out, self.rule_slots[:, 0], axis=1, out=rule_block)
+            for slot in range(1, self.rule_slots.shape[1]):
+                rule_block &= out[:, self.rule_slots[:, slot]]
+        return masks
+    
+    def evaluate(self, df, mode='first'):
+        """Evaluasi rule: mode 'first' (first-match per group) atau 'all'"""
+        masks = self.rule_masks(df)
+        names = np.array([r['name'] for r in self.rules], dtype=object)
+        results = pd.DataFrame(index=df.index)
+        if 'Campaign' in df.columns:
+            results['Campaign'] = df['Campaign']
+        
+        if mode == 'all':
+            rows, cols = np.nonzero(masks)
+            matched = pd.Series(names[cols]).groupby(rows).agg('; '.join)
+            results['Rules'] = matched.reindex(range(len(df)), fill_value='').to_numpy()
+            return results
+        
+        for group in self.groups:
+            in_group = np.flatnonzero(self.rule_groups == group)
+            group_masks = masks[:, in_group]
+            first = in_group[np.argmax(group_masks, axis=1)] if len(in_group) else []
+            found = group_masks.any(axis=1)
+            label = group.title()
+            for field in ('name', 'action', 'level', 'budget', 'focus'):
+                if not any(field in self.rules[i] for i in in_group):
+                    continue
+                column = 'Rule' if field == 'name' else field.title()
+                values = np.array([self.rules[i].get(field, '') for i in range(len(self.rules))],
+                                  dtype=object)
+                results[f'{column}_{label}'] = np.where(found, values[first], '')
+        return results
+    
+    def status(self, df):
+        """Status & level per campaign (kolom Status, Level)
+        
+        Rule group 'status' di rules file (first-match) menentukan status;
+        campaign yang tidak cocok dengan rule mana pun memakai ladder bawaan.
+        Dipakai Campaign_Summary, analyzer & budget optimizer supaya status
+        di semua sheet sama.
+        """
+        if self._status_engines is None:
+            rules = [rule for rule in self.rules if rule.get('group', 'default') == 'status']
+            self._status_engines = (ShopeeRulesEngine(rules=default_status_rules()),
+                                    ShopeeRulesEngine(rules=rules) if rules else None)
+        ladder, custom = self._status_engines
+        data = status_input(df)
+        
+        result = ladder.evaluate(data)
+        status = result['Rule_Status'].to_numpy(dtype=object)
+        level = result['Level_Status'].to_numpy(dtype=object)
+        if custom is not None:
+            result = custom.evaluate(data)
+            found = result['Rule_Status'].to_numpy() != ''
+            status = np.where(found, result['Rule_Status'].to_numpy(dtype=object), status)
+            if 'Level_Status' in result.columns:
+                custom_level = result['Level_Status'].to_numpy(dtype=object)
+                level = np.where(found & (custom_level != ''), custom_level, level)
+        return pd.DataFrame({'Status': status, 'Level': level}, index=df.index)
+
+_default_engine = None
+
+def default_rules_engine():
+    """Rules engine dari RULES_FILE (di-load sekali, dipakai bersama)"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = ShopeeRulesEngine()
+    return _default_engine
+
+def campaign_status(df, rules_engine=None):
+    """Status & level per campaign dari rules engine (default: RULES_FILE)"""
+    if rules_engine is None:
+        rules_engine = default_rules_engine()
+    return rules_engine.status(df)
+
+def status_label(status):
+    """'UNTUNG' -> 'UNTUNG ✅' untuk tampilan Campaign_Summary"""
+    return status.map(lambda name: f"{name} {STATUS_EMOJI[name]}" if name in STATUS_EMOJI else name)
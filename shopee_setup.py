@@ -0,0 +1,35 @@
+"""
+Komponen yang dirakit sesuai config, dipakai bersama run_analysis & query service
+"""
+
+from config import RESULT_CACHE, CAMPAIGN_IDENTITY, PRODUCT_CATALOG
+from shopee_analyzer import ShopeeAdAnalyzer
+from shopee_rules_engine import default_rules_engine
+from shopee_cache import ShopeeResultCache
+from shopee_identity import ShopeeCampaignIdentity
+from shopee_catalog import ShopeeProductCatalog
+
+def build_analyzer(processor, history=None):
+    """Analyzer dengan rules engine & cache hasil sesuai config"""
+    rules_engine = default_rules_engine()
+    cache = ShopeeResultCache() if RESULT_CACHE['enabled'] else None
+    return ShopeeAdAnalyzer(processor, history=history, rules_engine=rules_engine, cache=cache)
+
+def enrich_processed_data(processor, processed_data, identity=None):
+    """Campaign_ID (index identitas) & HPP/COGS (katalog produk) sesuai config
+    
+    Jika identity diberikan, id baru tidak langsung disimpan (caller yang
+    memanggil identity.save(), mis. node save_state pipeline).
+    """
+    if CAMPAIGN_IDENTITY['enabled']:
+        # Nama campaign yang berganti suffix / terpotong -> satu Campaign_ID
+        save = identity is None
+        identity = identity or ShopeeCampaignIdentity()
+        processed_data = identity.assign(processed_data, save=save)
+    
+    if PRODUCT_CATALOG['file']:
+        # HPP per produk -> COGS, True_Profit & break-even ROAS di summary
+        catalog = ShopeeProductCatalog(backend=processor.backend)
+        if catalog.load():
+            processed_data = catalog.join(processed_data)
+    return processed_data
@@ -0,0 +1,180 @@
+"""
+Ingest snapshot export kumulatif Shopee menjadi baris interval (delta antar export)
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from config import SNAPSHOT, DAILY_SCHEDULE
+from shopee_metrics import ADDITIVE_METRICS, DIRECT_METRICS, add_metrics
+
+NAT = np.iinfo(np.int64).min        # NaT sebagai int64 (datetime64[ns])
+
+class ShopeeSnapshotIngestor:
+    """Class untuk menyimpan snapshot terakhir per campaign & menghitung delta interval"""
+    
+    def __init__(self, state_file=None, intervals_file=None):
+        self.state_file = state_file or SNAPSHOT['state_file']
+        self.intervals_file = intervals_file if intervals_file is not None else SNAPSHOT['intervals_file']
+        self.metrics = ADDITIVE_METRICS + DIRECT_METRICS
+        self._reset_state()
+        self.load_state()
+    
+    def _reset_state(self):
+        """State kosong"""
+        self.keys = np.array([], dtype=object)
+        self.values = np.zeros((0, len(self.metrics)))     # nilai kumulatif terakhir
+        self.start = np.zeros(0, dtype=np.int64)           # Tanggal Mulai (ns, NAT jika kosong)
+        self.last_time = np.zeros(0, dtype=np.int64)       # waktu snapshot terakhir (ns)
+        self._index = pd.Index(self.keys)
+    
+    def load_state(self):
+        """Load state dari file (jika ada)"""
+        if not os.path.exists(self.state_file):
+            return False
+        
+        try:
+            with np.load(self.state_file, allow_pickle=False) as state:
+                metrics = state['metrics'].tobytes().decode('utf-8').split('\x00')
+                keys_blob = state['keys'].tobytes().decode('utf-8')
+                self.keys = np.array(keys_blob.split('\x00') if keys_blob else [], dtype=object)
+                self.values = state['values'].astype(np.float64)
+                self.start = state['start']
+                self.last_time = state['last_time']
+            if metrics != self.metrics:
+                raise ValueError(f"metrik state {metrics} berbeda")
+            self._index = pd.Index(self.keys)
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not load snapshot state: {e}")
+            self._reset_state()
+            return False
+    
+    def save_state(self):
+        """Simpan snapshot terakhir per campaign"""
+        np.savez(
+            self.state_file,
+            metrics=np.frombuffer('\x00'.join(self.metrics).encode('utf-8'), dtype=np.uint8),
+            keys=np.frombuffer('\x00'.join(self.keys).encode('utf-8'), dtype=np.uint8),
+            values=self.values,
+            start=self.start,
+            last_time=self.last_time
+        )
+    
+    def _aggregate(self, df):
+        """Satu baris per key (Kode Produk + Campaign): total kumulatif & Tanggal Mulai"""
+        campaign = df['Campaign'].fillna('').astype(str)
+        if 'Kode_Produk' in df.columns:
+            product = df['Kode_Produk'].fillna('').astype(str).str.strip()
+        else:
+            product = pd.Series('', index=df.index)
+        codes, keys = pd.factorize((product + '\x1f' + campaign).to_numpy(dtype=object))
+        n = len(keys)
+        
+        first = np.full(n, len(df), dtype=np.int64)
+        np.minimum.at(first, codes, np.arange(len(df)))
+        values = np.column_stack([
+            np.bincount(codes, weights=df[m].to_numpy(dtype=np.float64), minlength=n)
+            if m in df.columns else np.zeros(n)
+            for m in self.metrics
+        ])
+        
+        # Tanggal Mulai paling awal per key (NaT jika tidak ada)
+        start = np.full(n, NAT, dtype=np.int64)
+        if 'Tanggal' in df.columns:
+            dates = pd.to_datetime(df['Tanggal'], errors='coerce').to_numpy(dtype='datetime64[ns]').view(np.int64)
+            earliest = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+            np.minimum.at(earliest, codes, np.where(dates == NAT, np.iinfo(np.int64).max, dates))
+            start = np.where(earliest == np.iinfo(np.int64).max, NAT, earliest)
+        
+        return np.asarray(keys, dtype=object), campaign.to_numpy()[first], product.to_numpy()[first], \
+            values, start
+    
+    def ingest(self, df, snapshot_time=None, save=True):
+        """Snapshot kumulatif baru -> DataFrame baris interval sejak snapshot sebelumnya"""
+        print("\n📸 Ingesting cumulative snapshot...")
+        snapshot_time = pd.Timestamp(snapshot_time or datetime.now())
+        now = snapshot_time.value
+        keys, campaigns, products, current, start = self._aggregate(df)
+        
+        # Join lewat hash index key -> posisi state (O(campaign), bukan O(history))
+        idx = self._index.get_indexer(keys)
+        known = idx >= 0
+        previous = np.zeros_like(current)
+        previous[known] = self.values[idx[known]]
+        previous_start = np.full(len(keys), NAT, dtype=np.int64)
+        previous_start[known] = self.start[idx[known]]
+        previous_time = np.full(len(keys), NAT, dtype=np.int64)
+        previous_time[known] = self.last_time[idx[known]]
+        
+        # Reset: Tanggal Mulai berubah atau nilai kumulatif turun -> hitung dari nol
+        reset = known & ((previous_start != start) | (current < previous).any(axis=1))
+        continuing = known & ~reset
+        delta = np.where(continuing[:, None], current - previous, current)
+        
+        intervals = pd.DataFrame({
+            'Campaign': campaigns,
+            'Kode_Produk': products,
+            'Interval_Start': np.where(continuing, previous_time, start).view('datetime64[ns]'),
+            'Interval_End': np.full(len(keys), now).view('datetime64[ns]')
+        })
+        intervals['Tanggal'] = intervals['Interval_End']
+        # Selalu semua metrik (yang tidak ada di export = 0) agar kolom file interval tetap
+        for i, metric in enumerate(self.metrics):
+            intervals[metric] = delta[:, i]
+        intervals['Snapshot_Type'] = np.select([~known, reset], ['NEW', 'RESET'], 'DELTA')
+        add_metrics(intervals, ['CTR', 'ROAS', 'CPC', 'Conversion_Rate', 'ACOS'])
+        
+        # Window jadwal harian saat snapshot diambil (mis. noon = cek CTR siang)
+        hour = snapshot_time.hour
+        intervals['Window'] = next((period for period, info in DAILY_SCHEDULE.items()
+                                    if info['start'] <= hour < info['end']), 'other')
+        
+        # Update state: key baru ditambah, key lama ditimpa (campaign yang hilang tetap disimpan)
+        new_keys = keys[~known]
+        if len(new_keys):
+            self.keys = np.concatenate([self.keys, new_keys])
+            self.values = np.vstack([self.values, np.zeros((len(new_keys), len(self.metrics)))])
+            self.start = np.concatenate([self.start, np.full(len(new_keys), NAT, dtype=np.int64)])
+            self.last_time = np.concatenate([self.last_time, np.full(len(new_keys), NAT, dtype=np.int64)])
+            self._index = pd.Index(self.keys)
+            idx = self._index.get_indexer(keys)
+        self.values[idx] = current
+        self.start[idx] = start
+        self.last_time[idx] = now
+        
+        counts = intervals['Snapshot_Type'].value_counts()
+        print(f"   ✅ {len(intervals)} interval: {counts.get('DELTA', 0)} delta, "
+              f"{counts.get('NEW', 0)} baru, {counts.get('RESET', 0)} reset")
+        
+        if save:
+            self.save_state()
+            self._append_intervals(intervals)
+        return intervals
+    
+    def _append_intervals(self, intervals):
+        """Tambahkan baris interval ke file (append, tanpa baca ulang history)"""
+        if not self.intervals_file:
+            return
+        options = dict(index=False, date_format='%Y-%m-%d %H:%M:%S')
+        if os.path.exists(self.intervals_file):
+            with open(self.intervals_file, encoding='utf-8') as f:
+                header = f.readline().rstrip('\r\n').split(',')
+            if header != list(intervals.columns):
+                # Kolom berubah (mis. metrik baru): tulis ulang file dengan kolom gabungan
+                print(f"   ⚠️ Kolom {self.intervals_file} berubah, file ditulis ulang")
+                history = pd.concat([self.load_intervals(), intervals], ignore_index=True)
+                history.to_csv(self.intervals_file, **options)
+                return
+            intervals.to_csv(self.intervals_file, mode='a', header=False, **options)
+        else:
+            intervals.to_csv(self.intervals_file, **options)
+    
+    def load_intervals(self):
+        """Semua baris interval yang tersimpan"""
+        if not self.intervals_file or not os.path.exists(self.intervals_file):
+            return pd.DataFrame()
+        return pd.read_csv(self.intervals_file, dtype={'Campaign': 'str', 'Kode_Produk': 'str'},
+                           parse_dates=['Interval_Start', 'Interval_End', 'Tanggal'])
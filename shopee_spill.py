@@ -0,0 +1,214 @@
+"""
+Eksekusi dengan batas memory: export besar diproses per chunk dan
+partisinya di-spill ke file kolom sementara (.npy per kolom)
+"""
+
+import io
+import os
+import pickle
+import shutil
+import weakref
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+from config import MEMORY_BUDGET, CUBE
+from shopee_metrics import ADDITIVE_METRICS, DIRECT_METRICS
+from shopee_compression import STREAM_FORMATS, detect_format, open_binary, uncompressed_size
+
+# Kolom yang dibutuhkan summary, heatmap, cube & incremental
+SUMMARY_COLUMNS = list(dict.fromkeys(['Campaign', 'Tanggal'] + ADDITIVE_METRICS + DIRECT_METRICS +
+                                     CUBE['dimensions']))
+
+class ShopeeSpillExecutor:
+    """Class untuk load -> clean -> metrik per chunk dengan partisi di disk"""
+    
+    def __init__(self, processor, budget_bytes=None, chunk_rows=None, spill_dir=None):
+        self.processor = processor
+        self.budget_bytes = budget_bytes or MEMORY_BUDGET['budget_bytes']
+        self.chunk_rows = chunk_rows or MEMORY_BUDGET['chunk_rows']
+        self.spill_dir = spill_dir or MEMORY_BUDGET['spill_dir']
+        self.directory = None
+        self.partitions = []        # (folder, metadata kolom)
+        self.bytes_per_row = None
+        self._finalizer = None
+    
+    def _quiet(self, func, *args):
+        """Jalankan tahap processor tanpa log per chunk"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args)
+    
+    def _read_options(self, file_path):
+        header, sep, encoding = self.processor._read_csv_header(file_path)
+        self.processor.validate_columns(header)
+        usecols = [col for col in header if col.strip() in self.processor.used_columns]
+        return dict(sep=sep, encoding=encoding, usecols=usecols,
+                    dtype=self.processor._get_dtypes(usecols))
+    
+    def estimate_working_set(self, file_path):
+        """Perkiraan memory raw + cleaned + processed dari sample baris awal"""
+        options = self._read_options(file_path)
+        sample_rows = MEMORY_BUDGET['sample_rows']
+        with open_binary(file_path) as stream:
+            raw = pd.read_csv(stream, nrows=sample_rows, **options)
+        if raw.empty:
+            return 0
+        cleaned = self._quiet(self.processor.clean_data, raw)
+        processed = self._quiet(self.processor.calculate_additional_metrics, cleaned)
+        self.bytes_per_row = sum(int(df.memory_usage(deep=True).sum())
+                                 for df in (raw, cleaned, processed)) / len(raw)
+        
+        # Jumlah baris diperkirakan dari rata-rata panjang baris di sample
+        # (ukuran setelah dekompresi untuk input .gz / .xz / .bz2)
+        with open_binary(file_path) as f:
+            header_bytes = len(f.readline())
+            sample_bytes = sum(len(f.readline()) for _ in range(len(raw)))
+        data_bytes = uncompressed_size(file_path) - header_bytes
+        estimated_rows = data_bytes / max(sample_bytes / len(raw), 1)
+        return int(self.bytes_per_row * estimated_rows)
+    
+    def should_spill(self, file_path):
+        """True jika export CSV diperkirakan melebihi budget memory"""
+        if not self.budget_bytes or detect_format(file_path) not in STREAM_FORMATS:
+            return False
+        try:
+            estimate = self.estimate_working_set(file_path)
+        except Exception as e:
+            # Error format ditangani load_data biasa
+            print(f"⚠️ Perkiraan memory gagal, pakai mode in-memory: {e}")
+            return False
+        print(f"🧠 Perkiraan memory: {estimate / 1024 ** 2:,.0f} MB "
+              f"(budget {self.budget_bytes / 1024 ** 2:,.0f} MB)")
+        return estimate > self.budget_bytes
+    
+    def _spill(self, df):
+        """Tulis satu partisi: kolom numerik/tanggal apa adanya, teks = kode + label"""
+        folder = os.path.join(self.directory, f"part_{len(self.partitions):05d}")
+        os.makedirs(folder)
+        meta = {}
+        for i, name in enumerate(df.columns):
+            column = df[name]
+            # Metrik & tanggal apa adanya; key lain (termasuk Kode Produk numerik) di-factorize
+            kind = column.dtype.kind if isinstance(column.dtype, np.dtype) else 'O'
+            if kind in 'mM' or (kind in 'biuf' and name in ADDITIVE_METRICS + DIRECT_METRICS):
+                values, labels = column.to_numpy(), None
+            else:
+                values, labels = pd.factorize(column)
+                labels = (np.asarray(labels, dtype=object), column.dtype)
+            np.save(os.path.join(folder, f"{i}.npy"), values, allow_pickle=False)
+            meta[name] = (f"{i}.npy", labels)
+        with open(os.path.join(folder, 'meta.pkl'), 'wb') as f:
+            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.partitions.append((folder, meta))
+    
+    def run(self, file_path):
+        """Proses export per chunk dan spill setiap partisi ke disk"""
+        self.cleanup()
+        self.directory = tempfile.mkdtemp(prefix='shopee_spill_', dir=self.spill_dir)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+        
+        options = self._read_options(file_path)
+        chunk_rows = self.chunk_rows
+        if self.bytes_per_row:
+            # Satu chunk (3 tahap sekaligus) maksimal ~1/4 budget
+            chunk_rows = max(1000, min(chunk_rows, int(self.budget_bytes / 4 / self.bytes_per_row)))
+        
+        print(f"💽 Spill mode: chunk {chunk_rows:,} baris -> {self.directory}")
+        rows = 0
+        with open_binary(file_path) as stream:
+            for chunk in pd.read_csv(stream, chunksize=chunk_rows, **options):
+                cleaned = self._quiet(self.processor.clean_data, chunk)
+                del chunk
+                processed = self._quiet(self.processor.calculate_additional_metrics, cleaned)
+                del cleaned
+                self._spill(processed)
+                rows += len(processed)
+        print(f"✅ {rows:,} rows diproses dalam {len(self.partitions)} partisi")
+        return rows
+    
+    def _group(self, codes):
+        """(key unik per grup, index grup per baris) untuk matriks kode key
+        
+        Kode per kolom digabung jadi satu int64 (radix campuran) supaya cukup
+        satu sort 1 dimensi; jika terlalu besar untuk int64, unique per baris.
+        """
+        offsets = codes.min(axis=0)
+        spans = codes.max(axis=0) - offsets + 1
+        if np.prod(spans.astype(np.float64)) >= 2 ** 62:
+            return np.unique(codes, axis=0, return_inverse=True)
+        composite = np.zeros(len(codes), dtype=np.int64)
+        for i in range(codes.shape[1]):
+            composite = composite * spans[i] + (codes[:, i] - offsets[i])
+        _, first, inverse = np.unique(composite, return_index=True, return_inverse=True)
+        return codes[first], inverse
+    
+    def read_columns(self, columns=None):
+        """Data terpilih dari partisi, sudah diagregasi per kombinasi dimensi
+        
+        Tiap partisi dijumlahkan per key (Campaign, dimensi cube, Tanggal per jam)
+        begitu dibaca lalu digabung dengan total sebelumnya, jadi memory puncak
+        mengikuti jumlah grup, bukan jumlah baris export. Key teks diganti kode
+        integer global selama agregasi. Summary, heatmap & cube dihitung dari
+        jumlah metrik aditif sehingga hasilnya sama.
+        """
+        if not self.partitions:
+            return pd.DataFrame()
+        available = self.partitions[0][1]
+        columns = [col for col in (columns or SUMMARY_COLUMNS) if col in available]
+        metrics = [col for col in columns if col in ADDITIVE_METRICS + DIRECT_METRICS]
+        keys = [col for col in columns if col not in metrics]
+        uniques = {}            # key teks -> pd.Index label global
+        dtypes = {}
+        
+        group_keys, sums = None, None
+        for folder, meta in self.partitions:
+            codes, values = [], []
+            for name in columns:
+                file_name, labels = meta[name]
+                column = np.load(os.path.join(folder, file_name))
+                if name in metrics:
+                    dtypes[name] = np.result_type(dtypes.get(name, column.dtype), column.dtype)
+                    values.append(column.astype(np.float64))
+                elif labels is not None:
+                    # Kode lokal partisi -> kode global (kosong tetap -1)
+                    known = uniques.get(name, pd.Index([], dtype=object))
+                    uniques[name] = known.append(pd.Index(labels[0], dtype=object).difference(known, sort=False))
+                    dtypes[name] = labels[1]
+                    codes.append(np.append(uniques[name].get_indexer(labels[0]), -1)[column])
+                else:
+                    # Tanggal per jam sejak epoch (NaT = -1)
+                    dtypes[name] = column.dtype
+                    hours = column.astype('datetime64[h]')
+                    codes.append(np.where(np.isnat(hours), -1, hours.view(np.int64)))
+            
+            # Gabung dengan total sebelumnya lalu jumlahkan per kombinasi key
+            codes = np.column_stack(codes)
+            values = np.column_stack(values)
+            if group_keys is not None:
+                codes = np.vstack([group_keys, codes])
+                values = np.vstack([sums, values])
+            group_keys, inverse = self._group(codes)
+            del codes
+            sums = np.column_stack([np.bincount(inverse.ravel(), weights=values[:, i], minlength=len(group_keys))
+                                    for i in range(values.shape[1])])
+            del values, inverse
+        
+        result = {}
+        for i, name in enumerate(keys):
+            if name in uniques:
+                labels = np.append(uniques[name].to_numpy(dtype=object), None)
+                result[name] = pd.Series(labels[group_keys[:, i]]).astype(dtypes[name])
+            else:
+                hours = group_keys[:, i]
+                result[name] = np.where(hours < 0, np.datetime64('NaT'),
+                                        hours.view('datetime64[h]')).astype(dtypes[name])
+        for i, name in enumerate(metrics):
+            result[name] = sums[:, i].astype(dtypes[name])
+        return pd.DataFrame(result)[columns]
+    
+    def cleanup(self):
+        """Hapus file partisi sementara"""
+        if self._finalizer is not None:
+            self._finalizer()
+        self.directory = None
+        self.partitions = []
@@ -0,0 +1,108 @@
+"""
+Reader .xlsx untuk export Shopee (openpyxl read-only + column projection)
+"""
+
+from datetime import datetime
+from operator import itemgetter
+import pandas as pd
+import numpy as np
+import openpyxl
+
+def unique_headers(header):
+    """Nama kolom unik: duplikat diberi suffix .1, .2 (seperti pandas read_csv)"""
+    seen = {}
+    names = []
+    for name in header:
+        if name in seen:
+            seen[name] += 1
+            suffixed = f'{name}.{seen[name]}'
+            while suffixed in seen:
+                seen[name] += 1
+                suffixed = f'{name}.{seen[name]}'
+            print(f"⚠️ Kolom '{name}' muncul lebih dari sekali, dibaca sebagai '{suffixed}'")
+            seen[suffixed] = 0
+            names.append(suffixed)
+        else:
+            seen[name] = 0
+            names.append(name)
+    return names
+
+class ShopeeXlsxReader:
+    """Class untuk membaca sheet .xlsx baris per baris tanpa memuat workbook utuh"""
+    
+    def __init__(self, file_path):
+        self.file_path = file_path
+    
+    def _find_header(self, wb, required, max_scan):
+        """Sheet & baris header dengan kolom wajib terbanyak"""
+        best = None
+        required = set(required)
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(max_row=max_scan, values_only=True)
+            for row_num, row in enumerate(rows, start=1):
+                header = ['' if value is None else str(value).strip() for value in row]
+                score = len(set(header) & required)
+                if score and (best is None or score > best[3]):
+                    best = (ws.title, row_num, header, score)
+        return best
+    
+    def _to_typed_array(self, values):
+        """Satu kolom -> array bertipe (sel kosong = NaN/None)"""
+        filled = [value for value in values if value is not None]
+        if filled and all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                          for value in filled):
+            numbers = np.array([np.nan if value is None else value for value in values],
+                               dtype=np.float64)
+            if len(filled) == len(values) and np.all(np.mod(numbers, 1) == 0):
+                return numbers.astype(np.int64)
+            return numbers
+        if filled and all(isinstance(value, datetime) for value in filled):
+            return pd.to_datetime(values).round('s').to_numpy(dtype='datetime64[ns]')
+        return np.array(values, dtype=object)
+    
+    def read(self, required, usecols=None, validate=None, max_scan=10):
+        """Baca sheet export Shopee sebagai DataFrame bertipe
+        
+        Sheet dipilih otomatis (header paling cocok dengan kolom wajib),
+        hanya kolom di usecols yang dikonversi. validate(header) dipanggil
+        sebelum baris data dibaca.
+        """
+        wb = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            best = self._find_header(wb, required, max_scan)
+            if best is None:
+                raise ValueError("Header export Shopee tidak ditemukan di file Excel")
+            sheet_name, header_row, header, _ = best
+            while header and not header[-1]:
+                header.pop()
+            if validate is not None:
+                validate([name for name in header if name])
+            
+            # Column projection berdasarkan header (posisi kolom)
+            names = unique_headers(header)
+            selected = [(pos, name) for pos, name in enumerate(names)
+                        if name and (usecols is None or name in usecols)]
+            if not selected:
+                return pd.DataFrame()
+            positions = [pos for pos, _ in selected]
+            width = max(positions) + 1
+            pick = itemgetter(*positions)
+            
+            data = []
+            for row in wb[sheet_name].iter_rows(min_row=header_row + 1, values_only=True):
+                if len(row) < width:
+                    row = row + (None,) * (width - len(row))
+                values = pick(row)
+                if len(positions) == 1:
+                    values = (values,)
+                # Baris = semua baris yang punya minimal satu sel terpilih
+                if any(value is not None for value in values):
+                    data.append(values)
+        finally:
+            wb.close()
+        
+        columns = list(zip(*data)) if data else [()] * len(selected)
+        return pd.DataFrame({
+            name: self._to_typed_array(list(values))
+            for (_, name), values in zip(selected, columns)
+        })
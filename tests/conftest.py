@@ -0,0 +1,59 @@
+"""
+Konfigurasi pytest: modul analyzer ada di root repo (bukan package)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+EXPORT_HEADER = (
+    'Urutan,Nama Iklan,Status,Kode Produk,Mode Bidding,Penempatan Iklan,Tanggal Mulai,'
+    'Tanggal Selesai,Dilihat,Jumlah Klik,Persentase Klik,Konversi,Konversi Langsung,'
+    'Tingkat konversi,Tingkat Konversi Langsung,Biaya per Konversi,Biaya per Konversi Langsung,'
+    'Produk Terjual,Terjual Langsung,Omzet Penjualan,Penjualan Langsung (GMV Langsung),Biaya,'
+    'Efektifitas Iklan,Efektivitas Langsung,'
+    'Persentase Biaya Iklan terhadap Penjualan dari Iklan (ACOS),'
+    'Persentase Biaya Iklan terhadap Penjualan dari Iklan Langsung (ACOS Langsung)'
+)
+EXPORT_ROWS = [
+    '1,Kemeja A [1],Berjalan,56702316365,GMV Max ROAS,Semua Penempatan,03/12/2025 20:00:00,'
+    'Tidak Terbatas,3.736,146,"3,91%",8,4,"5,48%","2,74%",0.00,0.00,8,4,488.000,244.000,58.838,'
+    '8.29,4.15,"12,06%","24,11%"',
+    '2,Kemeja B [0],Berjalan,56702316360,Manual,Pencarian,04/12/2025 20:00:00,Tidak Terbatas,'
+    '163,1,"0,61%",0,0,"0,00%","0,00%",0.00,0.00,0,0,0,0,339,0.00,0.00,"0,00%","0,00%"'
+]
+
+def _number(value):
+    return f"{value:,}".replace(',', '.')
+
+def _percent(value):
+    return '"' + f"{value * 100:.2f}%".replace('.', ',') + '"'
+
+def export_row(i, name=None):
+    """Satu baris export sintetis (angka format Indonesia)"""
+    impressions = 1000 + i * 31
+    clicks = 10 + i % 37
+    orders = i % 5
+    sales = orders * 61000
+    spend = 1200 + i * 173
+    return ','.join([
+        str(i), name or f"Produk {i % 7} Kemeja [{i % 3}]", 'Berjalan', str(56702316300 + i % 11),
+        'Manual' if i % 2 else 'GMV Max ROAS', 'Pencarian',
+        f"{1 + i % 28:02d}/12/2025 {i % 24:02d}:00:00", 'Tidak Terbatas',
+        _number(impressions), _number(clicks), _percent(clicks / impressions), str(orders), str(orders // 2),
+        _percent(orders / clicks), '"0,00%"', '0.00', '0.00', str(orders), str(orders // 2),
+        _number(sales), _number(sales // 2), _number(spend), f"{sales / spend:.2f}", '0.00',
+        _percent(spend / sales if sales else 0), '"0,00%"'
+    ])
+
+@pytest.fixture
+def write_export(tmp_path):
+    """Tulis export CSV ke tmp_path: write_export(rows=None, name='export.csv')"""
+    def write(rows=None, name='export.csv'):
+        path = tmp_path / name
+        path.write_text('\n'.join([EXPORT_HEADER] + list(rows or EXPORT_ROWS)) + '\n', encoding='utf-8')
+        return str(path)
+    return write
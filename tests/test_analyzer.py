@@ -0,0 +1,86 @@
+"""
+Test ShopeeAdAnalyzer: status campaign dengan HPP (Margin_ROAS) & rules engine
+"""
+
+import os
+
+import pandas as pd
+
+from shopee_analyzer import ShopeeAdAnalyzer
+from shopee_catalog import ShopeeProductCatalog
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_metrics import profit_total
+from shopee_rules_engine import ShopeeRulesEngine
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rules.json')
+
+def _summary():
+    processor = ShopeeDataProcessor()
+    df = pd.DataFrame({
+        'Campaign': ['Produk 0', 'Produk 1'],
+        'Impressions': [10000, 8000],
+        'Clicks': [300, 200],
+        'Orders': [40, 20],
+        'Sales': [7280000, 3000000],
+        'Spend': [1000000, 1000000],
+        'Units': [40, 20],
+        'COGS': [38480000, 1400000]
+    })
+    return processor, processor.get_campaign_summary(df)
+
+def test_high_roas_negative_margin_is_a_loss():
+    processor, summary = _summary()
+    # Produk 0: ROAS 7.28 tapi HPP > omzet -> rugi setelah HPP
+    assert summary['ROAS'].tolist() == [7.28, 3.0]
+    assert summary['True_Profit'].tolist() == [-32200000, 600000]
+    assert summary['Status'].tolist() == ['BONCOS ⚠️', 'UNTUNG ✅']
+    # Margin <= 0: tidak ada break-even ROAS (NaN, bukan 0)
+    assert pd.isna(summary['Break_Even_ROAS'].iloc[0])
+    assert summary['Break_Even_ROAS'].iloc[1] == 1.875
+    assert summary['Margin_ROAS'].tolist() == [-31.2, 1.6]
+    
+    for rules_engine in (None, ShopeeRulesEngine(RULES_FILE)):
+        analyzer = ShopeeAdAnalyzer(processor, rules_engine=rules_engine)
+        analysis = analyzer.analyze_campaigns(summary)
+        assert analysis['Status'].tolist() == ['BONCOS', 'UNTUNG']
+        assert analysis['Priority'].tolist() == ['HIGH', 'LOW']
+        assert analysis['Break_Even_ROAS'].tolist() == ['N/A', 1.88]
+        # Profit (Sales - Spend) tetap ada, profit setelah HPP di sampingnya
+        assert analysis['Profit'].tolist() == ['Rp 6,280,000', 'Rp 2,000,000']
+        assert analysis['True_Profit'].tolist() == ['Rp -32,200,000', 'Rp 600,000']
+
+def test_unknown_product_cost_is_not_zero(tmp_path):
+    catalog_file = tmp_path / 'katalog.csv'
+    catalog_file.write_text('Kode Produk,HPP\n111,5000\n', encoding='utf-8')
+    catalog = ShopeeProductCatalog(str(catalog_file), cache_file='')
+    assert catalog.load()
+    
+    processor = ShopeeDataProcessor()
+    df = catalog.join(pd.DataFrame({
+        'Campaign': ['Kemeja A', 'Kemeja B', 'Kemeja B'],
+        'Kode_Produk': ['111', '111', '999'],
+        'Impressions': [1000, 1000, 1000],
+        'Clicks': [50, 50, 50],
+        'Orders': [10, 5, 5],
+        'Sales': [100000, 50000, 50000],
+        'Spend': [20000, 10000, 10000],
+        'Units': [10, 5, 5]
+    }))
+    # Produk 999 tidak ada di katalog -> COGS tidak diketahui, bukan 0
+    assert df['COGS'].tolist()[:2] == [50000, 25000]
+    assert pd.isna(df['COGS'].iloc[2])
+    
+    summary = processor.get_campaign_summary(df)
+    assert summary['True_Profit'].iloc[0] == 30000
+    assert pd.isna(summary['True_Profit'].iloc[1])
+    assert pd.isna(summary['Margin_ROAS'].iloc[1])
+    # Tanpa HPP status kembali ke ROAS biasa (100000 / 20000 = 5)
+    assert summary['Status'].tolist() == ['UNTUNG TINGGI 🚀', 'UNTUNG TINGGI 🚀']
+    
+    profit_col, label, total = profit_total(summary)
+    assert (profit_col, total) == ('True_Profit', 30000)
+    assert label.endswith('HPP diketahui 1/2 campaign')
+    
+    analysis = ShopeeAdAnalyzer(processor).analyze_campaigns(summary)
+    assert analysis['True_Profit'].tolist() == ['Rp 30,000', 'N/A']
+    assert analysis['Profit'].tolist() == ['Rp 80,000', 'Rp 80,000']
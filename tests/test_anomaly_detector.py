@@ -0,0 +1,65 @@
+"""
+Test ShopeeAnomalyDetector: key produk, spend rate & run ulang export yang sama
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from shopee_anomaly_detector import ShopeeAnomalyDetector
+
+START = pd.Timestamp('2025-12-05 08:00')
+
+def _snapshot(hour, spike=0):
+    """Export kumulatif setelah `hour` jam: 2 campaign produk 111, 1 campaign tanpa kode"""
+    spend = 1000 * hour + 30 * (hour % 3)
+    return pd.DataFrame({
+        'Campaign': ['Kemeja A Manual', 'Kemeja A GMV Max', 'Kemeja B'],
+        'Kode_Produk': ['111', '111', None],
+        'Impressions': [1000 * hour, 500 * hour, 800 * hour],
+        'Clicks': [20 * hour, 10 * hour, 16 * hour],
+        'Sales': [5000 * hour, 2500 * hour, 4000 * hour],
+        'Spend': [spend + spike, spend, spend]
+    })
+
+def _detector(tmp_path):
+    return ShopeeAnomalyDetector(state_file=str(tmp_path / 'anomaly.npz'), alpha=0.3,
+                                 z_threshold=3.0, min_observations=3)
+
+def _run(tmp_path, hours, spike_hour=None):
+    detector = _detector(tmp_path)
+    for hour in hours:
+        spike = 50000 if hour == spike_hour else 0
+        anomalies = detector.update(_snapshot(hour, spike), snapshot_time=START + pd.Timedelta(hours=hour))
+    return detector, anomalies
+
+def test_spend_spike_is_flagged_for_every_campaign_of_the_product(tmp_path):
+    detector, anomalies = _run(tmp_path, range(1, 8), spike_hour=7)
+    
+    # State per key: Kode Produk 111 (dua campaign) & nama campaign tanpa kode
+    assert sorted(detector.keys) == ['111', 'Kemeja B']
+    spend_rate = anomalies[anomalies['Metric'] == 'Spend_Rate']
+    assert sorted(spend_rate['Campaign']) == ['Kemeja A GMV Max', 'Kemeja A Manual']
+    assert set(anomalies['Key']) == {'111'}
+    assert (spend_rate['Z_Score'] > 3).all()
+
+def test_rerun_of_same_snapshot_does_not_change_state(tmp_path):
+    state_file = tmp_path / 'anomaly.npz'
+    _, first = _run(tmp_path, range(1, 8), spike_hour=7)
+    saved = state_file.read_bytes()
+    os.utime(state_file, (0, 0))
+    
+    # Export yang sama dijalankan ulang (mis. --only=status): anomali sama, state tidak disimpan
+    detector = _detector(tmp_path)
+    before = detector.mean.copy(), detector.var.copy(), detector.count.copy()
+    again = detector.update(_snapshot(7, 50000), snapshot_time=START + pd.Timedelta(hours=7))
+    pd.testing.assert_frame_equal(again, first)
+    assert os.path.getmtime(state_file) == 0
+    assert state_file.read_bytes() == saved
+    for kept, now in zip(before, (detector.mean, detector.var, detector.count)):
+        np.testing.assert_array_equal(kept, now)
+    
+    # Snapshot berikutnya tetap dihitung normal (CTR, CPC, ROAS bertambah satu observasi)
+    detector.update(_snapshot(8), snapshot_time=START + pd.Timedelta(hours=8))
+    np.testing.assert_array_equal(detector.count[:, :3], before[2][:, :3] + 1)
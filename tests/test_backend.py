@@ -0,0 +1,66 @@
+"""
+Test ShopeeBackend: engine pyarrow / Polars harus memberi hasil sama dengan pandas
+"""
+
+import io
+import contextlib
+
+import pandas as pd
+import pytest
+
+from conftest import export_row
+from shopee_backend import ShopeeBackend
+from shopee_data_processor import ShopeeDataProcessor
+
+ENGINES = [
+    pytest.param('pyarrow', marks=pytest.mark.skipif(
+        'pyarrow' not in ShopeeBackend.available(), reason='pyarrow tidak terinstall')),
+    pytest.param('polars', marks=pytest.mark.skipif(
+        'polars' not in ShopeeBackend.available(), reason='polars tidak terinstall'))
+]
+
+def _run(engine, path):
+    """raw, cleaned, campaign & daily summary untuk satu engine"""
+    processor = ShopeeDataProcessor(backend=ShopeeBackend(engine))
+    with contextlib.redirect_stdout(io.StringIO()):
+        raw = processor.load_data(path)
+        cleaned = processor.clean_data(raw)
+        processed = processor.calculate_additional_metrics(cleaned)
+        return {
+            'raw': raw,
+            'cleaned': cleaned,
+            'campaign_summary': processor.get_campaign_summary(processed),
+            'daily_summary': processor.get_daily_summary(processed)
+        }
+
+@pytest.fixture
+def export_file(write_export):
+    rows = [export_row(i) for i in range(500)]
+    rows[7] = export_row(7).replace(',Pencarian,', ',,')       # sel teks kosong
+    fields = rows[9].split(',')
+    fields[8] = ''                                              # sel angka kosong (Dilihat)
+    rows[9] = ','.join(fields)
+    return write_export(rows)
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engine_matches_pandas(engine, export_file):
+    assert ShopeeBackend(engine).engine == engine
+    expected = _run('pandas', export_file)
+    result = _run(engine, export_file)
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(result[name], frame, obj=name)
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_numbers_matches_pandas(engine):
+    series = pd.Series(['1.234', '5', '', None, 'abc', '12,5', '-7'], dtype='str')
+    for remove in [('.',), ('%',)]:
+        pd.testing.assert_series_equal(ShopeeBackend(engine).parse_numbers(series, remove=remove),
+                                       ShopeeBackend('pandas').parse_numbers(series, remove=remove))
+    integers = pd.Series(['1.234', '5', '10.000'], dtype='str')
+    pd.testing.assert_series_equal(ShopeeBackend(engine).parse_numbers(integers),
+                                   ShopeeBackend('pandas').parse_numbers(integers))
+
+def test_missing_engine_falls_back_to_pandas():
+    assert ShopeeBackend('pandas').engine == 'pandas'
+    with pytest.raises(ValueError):
+        ShopeeBackend('duckdb')
@@ -0,0 +1,56 @@
+"""
+Test ShopeeBudgetOptimizer: total budget & band rekomendasi per status dipatuhi
+"""
+
+import numpy as np
+import pandas as pd
+
+from shopee_budget_optimizer import ShopeeBudgetOptimizer
+from shopee_rules_engine import ShopeeRulesEngine
+
+def _summary():
+    return pd.DataFrame({
+        'Campaign': ['A', 'B', 'C', 'D', 'E'],
+        'Spend': [100000.0] * 5,
+        'Sales': [20000.0, 110000.0, 180000.0, 300000.0, 800000.0]
+    })
+
+def _optimize(total_budget=None):
+    optimizer = ShopeeBudgetOptimizer(rules_engine=ShopeeRulesEngine(rules=[]))
+    return optimizer.optimize(_summary(), total_budget).set_index('Campaign').sort_index()
+
+def test_default_budget_is_current_spend_within_bands():
+    plan = _optimize()
+    assert plan['Status'].tolist() == ['BONCOS', 'BREAK EVEN', 'UNTUNG', 'UNTUNG TINGGI', 'UNTUNG TINGGI']
+    assert plan['Proposed_Budget'].sum() == _summary()['Spend'].sum()
+    assert (plan['Proposed_Budget'] >= plan['Min_Budget']).all()
+    assert (plan['Proposed_Budget'] <= plan['Max_Budget']).all()
+    # Budget BONCOS dipindah ke ROAS tertinggi, expected sales naik
+    assert plan.loc['A', 'Proposed_Budget'] == 0
+    assert plan.loc['E', 'Proposed_Budget'] == plan.loc['E', 'Max_Budget']
+    assert plan['Expected_Sales'].sum() > _summary()['Sales'].sum()
+
+def test_extra_budget_fills_highest_roas_first():
+    plan = _optimize(total_budget=550000)
+    assert plan['Proposed_Budget'].sum() == 550000
+    # Sisa di atas batas bawah (150rb) mengisi ROAS tertinggi lebih dulu: E penuh, D sebagian
+    assert plan.loc['E', 'Proposed_Budget'] == plan.loc['E', 'Max_Budget']
+    assert plan.loc['D', 'Proposed_Budget'] == 150000
+    assert plan.loc['C', 'Proposed_Budget'] == plan.loc['C', 'Min_Budget']
+    assert plan.loc['B', 'Proposed_Budget'] == plan.loc['B', 'Min_Budget']
+    assert plan.loc['A', 'Proposed_Budget'] == 0
+    
+    # Budget lebih dari total batas atas -> berhenti di batas atas
+    capped = _optimize(total_budget=10000000)
+    np.testing.assert_array_equal(capped['Proposed_Budget'], capped['Max_Budget'])
+
+def test_budget_below_minimum_scales_proportionally():
+    plan = _optimize(total_budget=100000)
+    assert plan['Proposed_Budget'].sum() == 100000
+    active = plan['Min_Budget'] > 0
+    ratio = plan.loc[active, 'Proposed_Budget'] / plan.loc[active, 'Min_Budget']
+    np.testing.assert_allclose(ratio, 0.25)
+    assert plan.loc[~active, 'Proposed_Budget'].eq(0).all()
+
+def test_empty_summary():
+    assert ShopeeBudgetOptimizer().optimize(pd.DataFrame()).empty
@@ -0,0 +1,94 @@
+"""
+Test ShopeeResultCache: hit, miss & invalidasi (data, config, rules, kode)
+"""
+
+import os
+
+import pandas as pd
+
+import config
+from shopee_analyzer import ShopeeAdAnalyzer
+from shopee_cache import ShopeeResultCache
+from shopee_data_processor import ShopeeDataProcessor
+
+def _processed():
+    return pd.DataFrame({
+        'Campaign': ['Kemeja A', 'Kemeja B', 'Kemeja A'],
+        'Impressions': [1000, 500, 800],
+        'Clicks': [40, 5, 30],
+        'Orders': [4, 0, 2],
+        'Sales': [400000, 0, 150000],
+        'Spend': [100000, 20000, 60000]
+    })
+
+def _counter():
+    calls = []
+    def compute():
+        calls.append(1)
+        return pd.DataFrame({'Value': [len(calls)]})
+    return calls, compute
+
+def test_hit_miss_and_invalidation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = ShopeeResultCache()
+    df = _processed()
+    calls, compute = _counter()
+    
+    first = cache.cached('summary', [df], compute)
+    # Isi data sama (objek baru) -> hit, compute tidak dipanggil lagi
+    again = cache.cached('summary', [df.copy()], compute)
+    pd.testing.assert_frame_equal(first, again)
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    
+    # Data berubah -> miss
+    changed = df.copy()
+    changed.loc[0, 'Spend'] = 100001
+    cache.cached('summary', [changed], compute)
+    assert len(calls) == 2
+    
+    # Threshold config berubah -> miss
+    thresholds = dict(config.PERFORMANCE_THRESHOLDS, ROAS_CRITICAL=0.6)
+    monkeypatch.setattr(config, 'PERFORMANCE_THRESHOLDS', thresholds)
+    cache.cached('summary', [df], compute)
+    assert len(calls) == 3
+    
+    # Rules berubah -> miss
+    cache.cached('summary', [df], compute, extra={'status': []})
+    assert len(calls) == 4
+    
+    # Kode modul berubah -> miss
+    cache.code_hash = 'modul-berubah'
+    cache.cached('summary', [df], compute)
+    assert len(calls) == 5
+    
+    # Default memory saja: tidak ada folder cache di cwd
+    assert os.listdir(tmp_path) == []
+
+def test_result_is_a_copy():
+    cache = ShopeeResultCache()
+    calls, compute = _counter()
+    result = cache.cached('summary', [_processed()], compute)
+    result.loc[0, 'Value'] = 99
+    assert cache.cached('summary', [_processed()], compute)['Value'].tolist() == [1]
+
+def test_disk_cache_survives_new_instance(tmp_path):
+    directory = str(tmp_path / 'cache')
+    calls, compute = _counter()
+    ShopeeResultCache(directory=directory).cached('summary', [_processed()], compute)
+    # Proses baru (instance baru) -> dibaca dari disk
+    ShopeeResultCache(directory=directory).cached('summary', [_processed()], compute)
+    assert len(calls) == 1
+
+def test_analysis_hit_still_prints_header(capsys):
+    processor = ShopeeDataProcessor()
+    analyzer = ShopeeAdAnalyzer(processor, cache=ShopeeResultCache())
+    summary = analyzer.summarize(_processed())
+    first = analyzer.analyze_campaigns(summary)
+    capsys.readouterr()
+    
+    second = analyzer.analyze_campaigns(summary)
+    output = capsys.readouterr().out
+    assert 'DETAILED CAMPAIGN ANALYSIS' in output
+    assert '♻️ Cache hit: analysis' in output
+    pd.testing.assert_frame_equal(first, second)
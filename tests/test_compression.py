@@ -0,0 +1,64 @@
+"""
+Test input terkompresi: .gz / .xz / .bz2 == CSV biasa, bundle .zip digabung satu batch
+"""
+
+import bz2
+import gzip
+import lzma
+import zipfile
+
+import pandas as pd
+
+from conftest import export_row
+from shopee_compression import detect_format, zip_members
+from shopee_data_processor import ShopeeDataProcessor
+
+def _load(path):
+    processor = ShopeeDataProcessor()
+    return processor.load_data(str(path))
+
+def test_compressed_loads_match_plain_csv(write_export, tmp_path):
+    path = write_export([export_row(i) for i in range(500)])
+    with open(path, 'rb') as f:
+        content = f.read()
+    expected = _load(path)
+    
+    for kind, compress in [('gzip', gzip.compress), ('xz', lzma.compress), ('bz2', bz2.compress)]:
+        # Nama file tanpa ekstensi kompresi: format dari magic bytes
+        compressed = tmp_path / f'export_{kind}.dat'
+        compressed.write_bytes(compress(content))
+        assert detect_format(str(compressed)) == kind
+        pd.testing.assert_frame_equal(_load(compressed), expected, check_exact=True)
+
+def test_zip_bundle_is_one_batch(write_export, tmp_path):
+    first = write_export([export_row(i) for i in range(30)], 'day1.csv')
+    second = write_export([export_row(i) for i in range(30, 50)], 'day2.csv')
+    bundle = tmp_path / 'bundle.zip'
+    with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(first, 'exports/day1.csv')
+        zf.writestr('exports/day2.csv.gz', gzip.compress((tmp_path / 'day2.csv').read_bytes()))
+        # File sampah macOS dilewati
+        zf.writestr('__MACOSX/exports/._day1.csv', b'\x00\x05\x16\x07')
+        zf.writestr('exports/.DS_Store', b'\x00')
+    
+    assert detect_format(str(bundle)) == 'zip'
+    assert zip_members(str(bundle)) == [('exports/day1.csv', 'csv'), ('exports/day2.csv.gz', 'gzip')]
+    
+    loaded = _load(bundle)
+    assert loaded['Sumber_File'].tolist() == ['exports/day1.csv'] * 30 + ['exports/day2.csv.gz'] * 20
+    expected = pd.concat([_load(first), _load(second)], ignore_index=True)
+    pd.testing.assert_frame_equal(loaded.drop(columns='Sumber_File'), expected, check_exact=True)
+
+def test_single_member_zip_has_no_source_column(write_export, tmp_path):
+    path = write_export()
+    bundle = tmp_path / 'single.zip'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        zf.write(path, 'export.csv')
+    pd.testing.assert_frame_equal(_load(bundle), _load(path), check_exact=True)
+
+def test_empty_zip_fails_cleanly(tmp_path, capsys):
+    bundle = tmp_path / 'empty.zip'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        zf.writestr('notes.txt', 'bukan export')
+    assert _load(bundle) is None
+    assert '❌ Error loading data: Zip tidak berisi file export' in capsys.readouterr().out
@@ -0,0 +1,57 @@
+"""
+Test ShopeeCube: hasil query == groupby pandas langsung di data baris
+"""
+
+import numpy as np
+import pandas as pd
+
+from conftest import export_row
+from shopee_cube import ShopeeCube
+from shopee_data_processor import ShopeeDataProcessor
+
+SUMS = ['Impressions', 'Clicks', 'Orders', 'Sales', 'Spend']
+
+def _processed(write_export):
+    processor = ShopeeDataProcessor()
+    path = write_export([export_row(i) for i in range(300)])
+    return processor.calculate_additional_metrics(processor.clean_data(processor.load_data(path)))
+
+def _expected(df, dims):
+    grouped = df.groupby(dims, sort=True)
+    expected = grouped[SUMS].sum().astype(np.float64)
+    expected['Rows'] = grouped.size()
+    expected['ROAS'] = expected['Sales'] / expected['Spend']
+    return expected
+
+def _actual(result, dims):
+    return result.set_index(dims).sort_index()[SUMS + ['Rows', 'ROAS']]
+
+def test_query_matches_groupby(write_export):
+    df = _processed(write_export)
+    cube = ShopeeCube().build(df)
+    assert cube.n_rows == len(df)
+    
+    for dims in (['Campaign'], ['Mode_Bidding', 'Kode_Produk'], ['Status_Iklan']):
+        pd.testing.assert_frame_equal(_actual(cube.query(dims), dims), _expected(df, dims),
+                                      check_dtype=False, check_names=False)
+    
+    # Dimensi turunan Tanggal dihitung dari tanggal (tanpa jam)
+    df = df.assign(Minggu=df['Tanggal'].dt.normalize().dt.to_period('W-SUN').dt.start_time)
+    pd.testing.assert_frame_equal(_actual(cube.query(['Mode_Bidding', 'Minggu']), ['Mode_Bidding', 'Minggu']),
+                                  _expected(df, ['Mode_Bidding', 'Minggu']),
+                                  check_dtype=False, check_names=False, check_index_type=False)
+
+def test_query_filters_and_grand_total(write_export):
+    df = _processed(write_export)
+    cube = ShopeeCube().build(df)
+    
+    products = sorted(df['Kode_Produk'].unique())[:3]
+    result = cube.query(['Campaign'], filters={'Mode_Bidding': 'Manual', 'Kode_Produk': products})
+    subset = df[(df['Mode_Bidding'] == 'Manual') & df['Kode_Produk'].isin(products)]
+    pd.testing.assert_frame_equal(_actual(result, ['Campaign']), _expected(subset, ['Campaign']),
+                                  check_dtype=False, check_names=False)
+    
+    total = cube.query([])
+    assert len(total) == 1
+    assert total.loc[0, 'Rows'] == len(df)
+    assert total.loc[0, 'Spend'] == df['Spend'].sum()
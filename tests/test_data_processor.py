@@ -0,0 +1,41 @@
+"""
+Test ShopeeDataProcessor: dtype hasil clean_data & calculate_additional_metrics
+"""
+
+import pandas as pd
+
+from shopee_data_processor import ShopeeDataProcessor, HEATMAP_BASIS
+
+def _process(path):
+    processor = ShopeeDataProcessor()
+    raw = processor.load_data(path)
+    return processor.calculate_additional_metrics(processor.clean_data(raw))
+
+def test_processed_metric_dtypes_are_numeric(write_export):
+    df = _process(write_export())
+    for col in ['Impressions', 'Clicks', 'Orders', 'Sales', 'Spend', 'Units',
+                'CTR', 'Conversion_Rate', 'ACOS', 'ROAS', 'CPC', 'Profit']:
+        assert pd.api.types.is_numeric_dtype(df[col]), f"{col}: {df[col].dtype}"
+    assert pd.api.types.is_datetime64_any_dtype(df['Tanggal'])
+
+def test_roas_keeps_decimal_point(write_export):
+    df = _process(write_export())
+    assert df['ROAS'].tolist() == [8.29, 0.0]
+    assert df['Spend'].tolist() == [58838, 339]
+    assert (df['ROAS'] >= 3.0).tolist() == [True, False]
+
+def test_hourly_heatmap_is_labelled_with_its_time_basis(write_export):
+    processor = ShopeeDataProcessor()
+    heatmap = processor.get_hourly_heatmap(_process(write_export()))
+    # Tanggal Mulai 03/12/2025 20:00 (Rabu) -> jam mulai campaign, bukan jam aktivitas
+    assert heatmap[['Hari', 'Jam', 'Window']].iloc[0].tolist() == [3, 20, 'evening']
+    assert (heatmap['Basis'] == HEATMAP_BASIS['start']).all()
+
+def test_reference_columns_keep_inferred_dtype(write_export):
+    processor = ShopeeDataProcessor()
+    raw = processor.load_data(write_export())
+    # Hanya kolom angka format Indonesia yang dibaca sebagai teks
+    assert raw['Kode Produk'].dtype == 'int64'
+    assert 'Urutan' not in raw.columns
+    cleaned = processor.clean_data(raw)
+    assert cleaned['Kode_Produk'].tolist() == [56702316365, 56702316360]
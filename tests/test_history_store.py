@@ -0,0 +1,51 @@
+"""
+Test ShopeeHistoryStore: snapshot kumulatif disimpan sebagai delta harian
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import date
+
+from shopee_history_store import ShopeeHistoryStore
+
+def _summary(sales, spend, clicks):
+    return pd.DataFrame({
+        'Campaign': ['Kemeja A', 'Kemeja B'],
+        'Impressions': [1000, 500],
+        'Clicks': clicks,
+        'Orders': [2, 0],
+        'Sales': sales,
+        'Spend': spend
+    })
+
+def test_cumulative_snapshots_are_not_double_counted(tmp_path):
+    history = ShopeeHistoryStore(directory=str(tmp_path / 'history'))
+    history.append(_summary([100000, 0], [10000, 5000], [20, 5]), date(2025, 12, 5))
+    history.append(_summary([250000, 0], [30000, 8000], [30, 8]), date(2025, 12, 6))
+    
+    rolling = history.rolling_roas(7)
+    # Total 7 hari = snapshot kumulatif terakhir, bukan jumlah kedua snapshot
+    assert rolling['Sales_7D'].tolist() == [250000, 0]
+    assert rolling['Spend_7D'].tolist() == [30000, 8000]
+    assert rolling['ROAS_7D'].tolist() == [250000 / 30000, 0]
+    assert history.window('Spend', 7).tolist() == [[10000, 5000], [20000, 3000]]
+    
+    # Campaign yang masih berjalan tidak otomatis "growth"
+    assert history.consecutive_growth('Clicks', days=1).tolist() == [False, False]
+    assert history.consecutive_growth('Sales', days=1).tolist() == [True, False]
+
+def test_same_date_reappend_and_reload(tmp_path):
+    directory = str(tmp_path / 'history')
+    history = ShopeeHistoryStore(directory=directory)
+    history.append(_summary([100000, 0], [10000, 5000], [20, 5]), date(2025, 12, 5))
+    history.append(_summary([150000, 0], [20000, 6000], [25, 6]), date(2025, 12, 6))
+    # Export kedua di hari yang sama menimpa delta hari itu
+    history.append(_summary([250000, 0], [30000, 8000], [30, 8]), date(2025, 12, 6))
+    
+    reloaded = ShopeeHistoryStore(directory=directory)
+    assert reloaded.dates == ['2025-12-05', '2025-12-06']
+    np.testing.assert_array_equal(reloaded.window('Spend', 7), [[10000, 5000], [20000, 3000]])
+    
+    # Total turun = campaign di-reset, delta = total baru apa adanya
+    reloaded.append(_summary([40000, 0], [4000, 9000], [4, 9]), date(2025, 12, 7))
+    assert reloaded.window('Spend', 1).tolist() == [[4000, 1000]]
@@ -0,0 +1,65 @@
+"""
+Test ShopeeHtmlDashboard: agregat & tabel kolumnar sama dengan campaign summary
+"""
+
+import json
+import re
+
+import numpy as np
+
+from conftest import export_row
+from shopee_analyzer import ShopeeAdAnalyzer
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_html_dashboard import ShopeeHtmlDashboard
+
+def _inputs(write_export):
+    processor = ShopeeDataProcessor()
+    rows = [export_row(i) for i in range(40)] + [export_row(40, name='Kemeja </script> [5]')]
+    processed = processor.calculate_additional_metrics(processor.clean_data(processor.load_data(write_export(rows))))
+    summary = processor.get_campaign_summary(processed)
+    analysis = ShopeeAdAnalyzer(processor).analyze_campaigns(summary)
+    return summary, analysis, processor.get_daily_summary(processed)
+
+def _decode(table, name):
+    """Kolom tabel kolumnar -> list nilai (kategori di-decode dari kode)"""
+    values = table['data'][table['columns'].index(name)]
+    if name in table['categories']:
+        return [table['categories'][name][code] for code in values]
+    return values
+
+def test_summary_matches_campaign_summary(write_export):
+    summary, analysis, daily = _inputs(write_export)
+    data = ShopeeHtmlDashboard(top_n=3).build_summary(analysis, summary, daily)
+    
+    totals = data['totals']
+    assert totals['campaigns'] == len(summary)
+    assert totals['spend'] == summary['Spend'].sum()
+    assert totals['sales'] == summary['Sales'].sum()
+    assert totals['profit'] == (summary['Sales'] - summary['Spend']).sum()
+    # Distribusi status dari analysis (tanpa emoji label summary)
+    assert dict(data['status']) == analysis['Status'].value_counts().to_dict()
+    
+    assert [row[0] for row in data['top']] == summary.nlargest(3, 'ROAS')['Campaign'].tolist()
+    assert all(row[1] < 1 for row in data['bottom'])
+    assert data['daily']['date'] == daily['Tanggal'].astype(str).tolist()
+
+def test_table_round_trips_and_html_is_safe(write_export, tmp_path):
+    summary, analysis, daily = _inputs(write_export)
+    dashboard = ShopeeHtmlDashboard()
+    table = dashboard.build_table(analysis, summary)
+    
+    assert table['rows'] == len(summary)
+    assert _decode(table, 'Campaign') == summary['Campaign'].tolist()
+    assert _decode(table, 'Status') == summary['Status'].tolist()
+    np.testing.assert_allclose(_decode(table, 'Spend'), summary['Spend'])
+    # Kolom analysis diselaraskan ke urutan campaign summary
+    priority = analysis.set_index('Campaign')['Priority']
+    assert _decode(table, 'Priority') == priority.loc[summary['Campaign']].tolist()
+    
+    file_name = dashboard.generate(analysis, summary, daily, file_name=str(tmp_path / 'dashboard.html'))
+    with open(file_name, encoding='utf-8') as f:
+        html = f.read()
+    # Nama campaign berisi </script> tidak menutup tag script lebih awal
+    assert html.count('</script>') == html.count('<script')
+    payload = re.search(r'<script type="application/json" id="table-data">(.*?)</script>', html).group(1)
+    assert json.loads(payload) == table
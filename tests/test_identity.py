@@ -0,0 +1,94 @@
+"""
+Test ShopeeCampaignIdentity: Campaign_ID persisten & label unik per id
+"""
+
+from datetime import date, datetime
+
+import pandas as pd
+
+from shopee_anomaly_detector import ShopeeAnomalyDetector
+from shopee_cube import ShopeeCube
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_history_store import ShopeeHistoryStore
+from shopee_identity import ShopeeCampaignIdentity, campaign_keys
+
+def _frame(names, codes):
+    return pd.DataFrame({'Campaign': names, 'Kode_Produk': codes, 'Spend': range(len(names))})
+
+def test_labels_are_unique_per_campaign_id(tmp_path):
+    identity = ShopeeCampaignIdentity(str(tmp_path / 'ids.json'))
+    df = identity.assign(_frame(['Kemeja A', 'Kemeja A', 'Kemeja A [2]', 'Kemeja  A', 'Kemeja A'],
+                                ['', '111', '', '222', '222']))
+    
+    # Nama sama, identitas berbeda (tanpa kode vs 2 kode produk) -> 3 id, 3 label
+    assert df['Campaign_ID'].tolist() == [0, 1, 0, 2, 2]
+    assert df['Campaign'].tolist() == ['Kemeja A', 'Kemeja A (111)', 'Kemeja A',
+                                       'Kemeja A (222)', 'Kemeja A (222)']
+    pairs = df[['Campaign', 'Campaign_ID']].drop_duplicates()
+    assert pairs['Campaign'].is_unique and pairs['Campaign_ID'].is_unique
+
+def test_name_collision_without_product_code(tmp_path):
+    identity = ShopeeCampaignIdentity(str(tmp_path / 'ids.json'))
+    identity.assign(_frame(['Kemeja A'], ['111']))
+    df = identity.assign(_frame(['Kemeja A', 'Kemeja A (111)'], ['', '']))
+    # Tanpa kode produk -> key nama "kemeja a", label "Kemeja A" sudah dipakai id 0
+    assert df['Campaign'].tolist() == ['Kemeja A #2', 'Kemeja A #2']
+    assert df['Campaign_ID'].tolist() == [1, 1]
+
+def test_truncated_match_is_persisted(tmp_path):
+    path = str(tmp_path / 'ids.json')
+    ShopeeCampaignIdentity(path).assign(_frame(['Kemeja Flanel Pria Lengan Panjang'], ['']))
+    
+    identity = ShopeeCampaignIdentity(path)
+    df = identity.assign(_frame(['Kemeja Flanel Pria...'], ['']))
+    assert df['Campaign_ID'].tolist() == [0]
+    
+    # Run berikutnya: alias sudah tersimpan, tetap cocok walau ada nama baru dengan prefix sama
+    identity = ShopeeCampaignIdentity(path)
+    identity.assign(_frame(['Kemeja Flanel Pria Lengan Pendek'], ['']))
+    df = ShopeeCampaignIdentity(path).assign(_frame(['Kemeja Flanel Pria...'], ['']))
+    assert df['Campaign_ID'].tolist() == [0]
+    assert df['Campaign'].tolist() == ['Kemeja Flanel Pria Lengan Panjang']
+
+def test_truncated_prefix_must_be_unique(tmp_path):
+    identity = ShopeeCampaignIdentity(str(tmp_path / 'ids.json'))
+    identity.assign(_frame(['Kemeja Flanel Pria Panjang', 'Kemeja Flanel Pria Pendek', 'Kemeja Polos'],
+                           ['', '', '']))
+    df = identity.assign(_frame(['Kemeja Flanel...', 'Kemeja Pol…'], ['', '']))
+    # Dua campaign cocok dengan "kemeja flanel" -> campaign baru; "kemeja pol" tepat satu
+    assert df['Campaign_ID'].tolist() == [3, 2]
+
+def test_groupbys_use_campaign_id(tmp_path):
+    # Satu Campaign_ID dengan dua nama (mis. diganti di tengah export)
+    df = pd.DataFrame({
+        'Campaign_ID': [0, 0, 1],
+        'Campaign': ['Kemeja A', 'Kemeja A Baru', 'Kemeja B'],
+        'Kode_Produk': ['', '', ''],
+        'Tanggal': pd.to_datetime(['2025-12-01 20:00', '2025-12-01 20:00', '2025-12-01 20:00']),
+        'Impressions': [100, 200, 50],
+        'Clicks': [10, 20, 5],
+        'Orders': [1, 2, 0],
+        'Sales': [10000, 20000, 0],
+        'Spend': [1000, 2000, 500]
+    })
+    codes, names = campaign_keys(df)
+    assert codes.tolist() == [0, 0, 1]
+    assert names.tolist() == ['Kemeja A', 'Kemeja B']
+    
+    heatmap = ShopeeDataProcessor().get_hourly_heatmap(df)
+    assert heatmap['Campaign'].tolist() == ['Kemeja A', 'Kemeja B']
+    assert heatmap['Spend'].tolist() == [3000, 500]
+    
+    cube = ShopeeCube(['Campaign', 'Tanggal']).build(df)
+    assert cube.query(['Campaign'])['Spend'].tolist() == [3000, 500]
+    
+    detector = ShopeeAnomalyDetector(state_file=str(tmp_path / 'anomaly.npz'))
+    detector.update(df, snapshot_time=datetime(2025, 12, 2), save=False)
+    assert detector.keys.tolist() == ['#0', '#1']
+    
+    history = ShopeeHistoryStore(directory=str(tmp_path / 'history'))
+    summary = df.groupby('Campaign_ID', as_index=False).sum(numeric_only=True)
+    history.append(summary.assign(Campaign=['Kemeja A', 'Kemeja B']), date(2025, 12, 1))
+    history.append(summary.assign(Campaign=['Kemeja A Baru', 'Kemeja B']), date(2025, 12, 2))
+    # Nama baru tetap kolom yang sama, label ikut nama terbaru
+    assert ShopeeHistoryStore(directory=str(tmp_path / 'history')).campaigns == ['Kemeja A Baru', 'Kemeja B']
@@ -0,0 +1,68 @@
+"""
+Test ShopeeIncrementalUpdater: patch campaign yang berubah == hitung ulang penuh
+"""
+
+import json
+
+import pandas as pd
+
+from conftest import export_row
+from shopee_analyzer import ShopeeAdAnalyzer
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_incremental import ShopeeIncrementalUpdater
+
+def _process(processor, path):
+    return processor.calculate_additional_metrics(processor.clean_data(processor.load_data(path)))
+
+def _sorted(df):
+    return df.sort_values('Campaign').reset_index(drop=True)
+
+def test_incremental_matches_full_recompute(write_export, tmp_path):
+    processor = ShopeeDataProcessor()
+    analyzer = ShopeeAdAnalyzer(processor)
+    state_file = str(tmp_path / 'incremental_state.json')
+    rows = [export_row(i) for i in range(60)]
+    
+    first = ShopeeIncrementalUpdater(processor, state_file=state_file)
+    first.update_summary(_process(processor, write_export(rows, 'day1.csv')))
+    first.update_analysis(analyzer)
+    first.save()
+    # State disimpan sebagai JSON, bukan pickle
+    with open(state_file, encoding='utf-8') as f:
+        assert json.load(f)['campaigns']
+    
+    # Export berikutnya: 1 campaign berubah, 1 hilang, 1 baru
+    rows[0] = export_row(1000, name='Produk 0 Kemeja [0]')
+    rows = [row for i, row in enumerate(rows) if i % 21 != 5]
+    rows.append(export_row(61, name='Kemeja Baru [9]'))
+    processed = _process(processor, write_export(rows, 'day2.csv'))
+    
+    # Instance baru = run berikutnya (state dibaca dari file)
+    second = ShopeeIncrementalUpdater(processor, state_file=state_file)
+    summary = second.update_summary(processed)
+    analysis = second.update_analysis(analyzer)
+    assert second.stats['changed'] == 2
+    assert second.stats['removed'] == 1
+    assert second.stats['unchanged'] == second.stats['campaigns'] - 2
+    
+    full_summary = processor.get_campaign_summary(processed)
+    full_analysis = analyzer.analyze_campaigns(full_summary)
+    pd.testing.assert_frame_equal(_sorted(summary), _sorted(full_summary), check_exact=True)
+    pd.testing.assert_frame_equal(_sorted(analysis), _sorted(full_analysis), check_exact=True)
+
+def test_unchanged_export_recomputes_nothing(write_export, tmp_path):
+    processor = ShopeeDataProcessor()
+    state_file = str(tmp_path / 'incremental_state.json')
+    processed = _process(processor, write_export([export_row(i) for i in range(30)]))
+    
+    first = ShopeeIncrementalUpdater(processor, state_file=state_file)
+    first.update_summary(processed)
+    first.save()
+    
+    second = ShopeeIncrementalUpdater(processor, state_file=state_file)
+    summary = second.update_summary(processed)
+    assert second.stats['changed'] == 0
+    pd.testing.assert_frame_equal(_sorted(summary), _sorted(processor.get_campaign_summary(processed)),
+                                  check_exact=True)
+    # Tidak ada folder cache yang ikut dibuat
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['export.csv', 'incremental_state.json']
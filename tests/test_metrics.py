@@ -0,0 +1,69 @@
+"""
+Test kernel shopee_metrics: hasil sama dengan rumus np.where lama (termasuk penyebut 0)
+"""
+
+import numpy as np
+import pandas as pd
+
+from conftest import export_row
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_metrics import RATIO_METRICS, add_metrics, compute_metrics
+
+def _frame():
+    return pd.DataFrame({
+        'Impressions': [1000, 0, 500, 250, 0],
+        'Clicks': [40, 0, 0, 12, 3],
+        'Orders': [4, 0, 0, 1, 1],
+        'Sales': [400000, 0, 0, 90000, 50000],
+        'Spend': [100000, 0, 20000, 0, 7000],
+        'Direct_Orders': [2, 0, 0, 1, 0],
+        'Direct_Sales': [150000, 0, 0, 90000, 0],
+        'COGS': [250000.0, 0.0, np.nan, 60000.0, 55000.0]
+    })
+
+def _where(df, numerator, denominator, factor=1):
+    """Rumus lama: np.where(penyebut > 0, pembilang / penyebut * faktor, 0)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(df[denominator] > 0, (df[numerator] / df[denominator]) * factor, 0)
+
+def test_ratios_match_np_where():
+    df = _frame()
+    df['Profit'] = df['Sales'] - df['Spend']
+    results = compute_metrics(df, list(RATIO_METRICS))
+    
+    for name in ['CTR', 'ROAS', 'CPC', 'Conversion_Rate', 'ACOS', 'Profit_Margin',
+                 'Direct_ROAS', 'Direct_ACOS', 'Direct_Conversion_Rate', 'Direct_Share']:
+        np.testing.assert_array_equal(results[name], _where(df, *RATIO_METRICS[name]), err_msg=name)
+
+def test_differences_keep_dtype_and_unknown_cost():
+    df = _frame()
+    results = compute_metrics(df, ['Profit', 'Gross_Profit', 'True_Profit', 'Margin_ROAS', 'Break_Even_ROAS'])
+    
+    assert results['Profit'].dtype == np.int64
+    np.testing.assert_array_equal(results['Profit'], df['Sales'] - df['Spend'])
+    np.testing.assert_array_equal(results['True_Profit'], df['Sales'] - df['Spend'] - df['COGS'])
+    # HPP tidak diketahui tetap NaN, bukan 0
+    assert np.isnan(results['True_Profit'][2]) and np.isnan(results['Margin_ROAS'][2])
+    # HPP >= omzet: tidak ada break-even ROAS
+    assert np.isnan(results['Break_Even_ROAS'][2]) and np.isnan(results['Break_Even_ROAS'][4])
+    assert results['Break_Even_ROAS'][0] == 400000 / 150000
+
+def test_missing_columns_are_skipped():
+    df = _frame()[['Clicks', 'Spend']]
+    assert list(compute_metrics(df, ['CPC', 'ROAS', 'Profit'])) == ['CPC']
+    assert list(add_metrics(df, ['CPC']).columns) == ['Clicks', 'Spend', 'CPC']
+
+def test_processor_metrics_match_np_where(write_export):
+    processor = ShopeeDataProcessor()
+    rows = [export_row(i) for i in range(60)]
+    processed = processor.calculate_additional_metrics(processor.clean_data(processor.load_data(write_export(rows))))
+    np.testing.assert_array_equal(processed['CPC'], _where(processed, 'Spend', 'Clicks'))
+    np.testing.assert_array_equal(processed['Profit_Margin'], _where(processed, 'Profit', 'Sales', 100))
+    np.testing.assert_array_equal(processed['Direct_ROAS'], _where(processed, 'Direct_Sales', 'Spend'))
+    
+    summary = processor.get_campaign_summary(processed)
+    for name in ['CTR', 'ROAS', 'CPC', 'Conversion_Rate', 'ACOS']:
+        np.testing.assert_array_equal(summary[name], _where(summary, *RATIO_METRICS[name]), err_msg=name)
+    daily = processor.get_daily_summary(processed)
+    for name in ['CTR', 'ROAS', 'CPC']:
+        np.testing.assert_array_equal(daily[name], _where(daily, *RATIO_METRICS[name]), err_msg=name)
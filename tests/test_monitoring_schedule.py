@@ -0,0 +1,23 @@
+"""
+Test MonitoringQueue: waktu mulai per campaign dari cleaned data
+"""
+
+import pandas as pd
+
+from monitoring_schedule import MonitoringQueue, CHECKPOINTS
+
+def test_from_data_ignores_rows_without_campaign():
+    df = pd.DataFrame({
+        'Campaign': pd.Series(['Kemeja A', None, 'Kemeja B', 'Kemeja A'], dtype='str'),
+        'Tanggal': pd.to_datetime(['2025-12-03 20:00', '2025-11-01 08:00',
+                                   '2025-12-04 21:00', '2025-12-02 10:00'])
+    })
+    queue = MonitoringQueue.from_data(df)
+    
+    assert queue.campaigns == ['Kemeja A', 'Kemeja B']
+    assert len(queue) == 2 * len(CHECKPOINTS)
+    # Baris tanpa campaign (paling awal) tidak menggeser waktu mulai Kemeja B
+    first = queue.upcoming(len(queue)).groupby('Campaign')['Due'].min()
+    assert first['Kemeja A'] == pd.Timestamp('2025-12-03 07:00')
+    assert first['Kemeja B'] == pd.Timestamp('2025-12-05 07:00')
+    assert queue.next_due() == pd.Timestamp('2025-12-03 07:00')
@@ -0,0 +1,48 @@
+"""
+Test ShopeeParallelLoader: hasil paralel == load_data + clean_data berurutan
+"""
+
+import pandas as pd
+
+from conftest import export_row
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_parallel_loader import ShopeeParallelLoader
+
+def _sequential(path):
+    processor = ShopeeDataProcessor()
+    raw = processor.load_data(path)
+    return raw, processor.clean_data(raw)
+
+def test_parallel_load_matches_sequential(write_export, capsys):
+    path = write_export([export_row(i) for i in range(2000)])
+    loader = ShopeeParallelLoader(ShopeeDataProcessor(), workers=4, min_bytes=0)
+    assert len(loader.split_ranges(path, 4)) == 4
+    
+    raw, cleaned = loader.load(path)
+    assert '4 workers' in capsys.readouterr().out
+    expected_raw, expected_cleaned = _sequential(path)
+    # Raw_Data tetap kolom export asli (teks), bukan kolom hasil clean
+    pd.testing.assert_frame_equal(raw, expected_raw, check_exact=True)
+    pd.testing.assert_frame_equal(cleaned, expected_cleaned, check_exact=True)
+
+def test_quoted_newline_falls_back_to_sequential(write_export, capsys):
+    # Nama iklan berkutip dengan banyak newline -> batas rentang jatuh di dalam field
+    lines = '\n'.join(f'baris {j}' for j in range(40))
+    rows = [export_row(i, name=f'"Kemeja {i}\n{lines}"') for i in range(200)]
+    path = write_export(rows)
+    loader = ShopeeParallelLoader(ShopeeDataProcessor(), workers=2, min_bytes=0)
+    
+    raw, cleaned = loader.load(path)
+    # Rentang terpotong di dalam kutip: worker gagal parse / jumlah kutip ganjil
+    assert 'load berurutan' in capsys.readouterr().out
+    expected_raw, expected_cleaned = _sequential(path)
+    assert len(raw) == 200
+    pd.testing.assert_frame_equal(raw, expected_raw, check_exact=True)
+    pd.testing.assert_frame_equal(cleaned, expected_cleaned, check_exact=True)
+
+def test_small_files_load_sequentially(write_export, capsys):
+    path = write_export()
+    loader = ShopeeParallelLoader(ShopeeDataProcessor(), workers=4)
+    raw, cleaned = loader.load(path)
+    assert 'workers' not in capsys.readouterr().out
+    pd.testing.assert_frame_equal(cleaned, _sequential(path)[1])
@@ -0,0 +1,88 @@
+"""
+Test ShopeePipeline: urutan plan, evaluasi lazy, memoization & paralel per level
+"""
+
+import os
+import threading
+
+import pytest
+
+import config
+from run_analysis import build_pipeline
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_pipeline import ShopeePipeline
+
+def _graph(workers=1):
+    calls = []
+    pipeline = ShopeePipeline(workers=workers)
+    
+    def node(name, value):
+        def compute(*deps):
+            calls.append(name)
+            return value + sum(deps)
+        return compute
+    
+    pipeline.add('data', node('data', 1))
+    pipeline.add('summary', node('summary', 10), ['data'])
+    pipeline.add('daily', node('daily', 100), ['data'])
+    pipeline.add('total', node('total', 1000), ['summary', 'daily'])
+    pipeline.add('unused', node('unused', 0), ['data'])
+    return pipeline, calls
+
+def test_plan_is_topological_and_lazy():
+    pipeline, calls = _graph()
+    assert pipeline.plan('total') == ['data', 'summary', 'daily', 'total']
+    assert pipeline.plan(['daily']) == ['data', 'daily']
+    assert calls == []
+    
+    assert pipeline.run('summary') == {'summary': 11}
+    # Node di luar target tidak pernah dipanggil
+    assert calls == ['data', 'summary']
+
+def test_results_are_memoized():
+    pipeline, calls = _graph()
+    assert pipeline.run(['total']) == {'total': 1112}
+    assert pipeline.get('summary') == 11
+    assert pipeline.plan('total') == []
+    assert sorted(calls) == ['daily', 'data', 'summary', 'total']
+    
+    # add() ulang membuang memo node itu saja
+    pipeline.add('daily', lambda data: 200 + data, ['data'])
+    assert pipeline.plan('daily') == ['daily']
+
+def test_cycle_and_unknown_node():
+    pipeline, _ = _graph()
+    pipeline.add('data', lambda total: total, ['total'])
+    with pytest.raises(ValueError, match='melingkar'):
+        pipeline.plan('total')
+    with pytest.raises(ValueError, match='tidak dikenal'):
+        pipeline.plan('tidak_ada')
+
+def test_independent_nodes_run_in_parallel():
+    pipeline = ShopeePipeline(workers=2)
+    # Barrier 2 pihak: hanya lolos jika summary & daily berjalan bersamaan
+    barrier = threading.Barrier(2, timeout=5)
+    pipeline.add('data', lambda: 1)
+    pipeline.add('summary', lambda data: barrier.wait() >= 0 and data + 10, ['data'])
+    pipeline.add('daily', lambda data: barrier.wait() >= 0 and data + 100, ['data'])
+    assert pipeline.run(['summary', 'daily']) == {'summary': 11, 'daily': 101}
+
+def test_status_target_does_not_write_state(write_export, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for section in (config.ANOMALY_DETECTION, config.HISTORY, config.INCREMENTAL,
+                    config.CAMPAIGN_IDENTITY):
+        monkeypatch.setitem(section, 'enabled', True)
+    monkeypatch.setitem(config.RESULT_CACHE, 'directory', None)
+    export_file = write_export()
+    
+    pipeline = build_pipeline(ShopeeDataProcessor(), export_file)
+    pipeline.run('status')
+    assert 'anomalies' in pipeline.results and 'save_state' not in pipeline.results
+    assert 'history_trends' not in pipeline.results and 'intervals' not in pipeline.results
+    # Hanya folder history kosong (dibuat saat store dibuka), tanpa file state
+    assert sorted(os.listdir(tmp_path)) == ['export.csv', 'history']
+    assert os.listdir(tmp_path / 'history') == []
+    
+    pipeline.run(['save_state'])
+    assert {config.ANOMALY_DETECTION['state_file'], config.INCREMENTAL['state_file'],
+            config.CAMPAIGN_IDENTITY['file']} <= set(os.listdir(tmp_path))
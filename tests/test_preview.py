@@ -0,0 +1,54 @@
+"""
+Test ShopeePreview: estimasi eksak tanpa sampling & cakupan confidence interval
+"""
+
+import numpy as np
+import pandas as pd
+
+from conftest import export_row
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_preview import ShopeePreview
+
+def _full_summary(processor, path):
+    processed = processor.calculate_additional_metrics(processor.clean_data(processor.load_data(path)))
+    return processor.get_campaign_summary(processed).set_index('Campaign')
+
+def _estimate(preview, path):
+    counts, reservoir, top_rows, total_rows = preview.sample(path)
+    summary, overall = preview.estimate(counts, reservoir, top_rows)
+    return summary.set_index('Campaign'), overall, total_rows
+
+def test_small_campaigns_are_exact(write_export):
+    processor = ShopeeDataProcessor()
+    path = write_export([export_row(i) for i in range(210)])
+    # 21 campaign x 10 baris <= reservoir 50: semua baris masuk sample
+    summary, overall, total_rows = _estimate(ShopeePreview(processor, chunk_size=64, seed=1), path)
+    full = _full_summary(processor, path)
+    
+    assert total_rows == 210 and overall['rows'] == 210
+    assert overall['sampled_rows'] == 210
+    assert (summary['Spend_CI'] == 0).all() and overall['roas_ci'] == 0
+    pd.testing.assert_series_equal(summary['Spend'], full.loc[summary.index, 'Spend'], check_dtype=False)
+    pd.testing.assert_series_equal(summary['Sales'], full.loc[summary.index, 'Sales'], check_dtype=False)
+
+def test_confidence_interval_coverage(write_export):
+    processor = ShopeeDataProcessor()
+    path = write_export([export_row(i) for i in range(2100)])
+    full = _full_summary(processor, path)
+    true_roas = full['Sales'].sum() / full['Spend'].sum()
+    
+    spend_hits, sales_hits, roas_hits = [], [], []
+    for seed in range(40):
+        # 100 baris per campaign, reservoir 20, beberapa chunk
+        preview = ShopeePreview(processor, rows_per_campaign=20, top_n=5, chunk_size=500, seed=seed)
+        summary, overall, _ = _estimate(preview, path)
+        truth = full.loc[summary.index]
+        assert overall['sampled_rows'] < 2100
+        spend_hits.append((abs(summary['Spend'] - truth['Spend']) <= summary['Spend_CI']).mean())
+        sales_hits.append((abs(summary['Sales'] - truth['Sales']) <= summary['Sales_CI']).mean())
+        roas_hits.append(abs(overall['roas'] - true_roas) <= overall['roas_ci'])
+    
+    # CI 95%: cakupan empiris harus mendekati nominal
+    assert np.mean(spend_hits) >= 0.88
+    assert np.mean(sales_hits) >= 0.88
+    assert np.mean(roas_hits) >= 0.85
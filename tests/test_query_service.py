@@ -0,0 +1,54 @@
+"""
+Test ShopeeQueryService: server di port 0, semua endpoint lewat HTTP
+"""
+
+import json
+import asyncio
+from urllib.parse import quote
+
+from shopee_query_service import ShopeeQueryService
+
+async def _get(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {quote(path, safe='/?=&')} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+async def _query_all(service, paths):
+    await service.start()
+    try:
+        return {path: await _get(service.port, path) for path in paths}
+    finally:
+        await service.stop()
+
+def test_endpoints_over_http(write_export, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    service = ShopeeQueryService(write_export(), host='127.0.0.1', port=0, poll_interval=60)
+    paths = ['/health', '/summary', '/campaigns?sort=Spend&limit=1', '/campaigns?status=untung',
+             '/campaign?name=kemeja b [0]', '/campaign?name=Tidak Ada', '/product?code=56702316365',
+             '/priority?level=high', '/daily', '/unknown']
+    results = asyncio.run(_query_all(service, paths))
+    
+    assert service.port != 0
+    assert {path: status for path, (status, _) in results.items()} == {
+        '/health': 200, '/summary': 200, '/campaigns?sort=Spend&limit=1': 200,
+        '/campaigns?status=untung': 200, '/campaign?name=kemeja b [0]': 200,
+        '/campaign?name=Tidak Ada': 404, '/product?code=56702316365': 200,
+        '/priority?level=high': 200, '/daily': 200, '/unknown': 404
+    }
+    summary = results['/summary'][1]
+    assert summary['campaigns'] == 2
+    assert summary['spend'] == 58838 + 339
+    # Hitungan status & priority dari hasil analisis yang sama dengan filter ?status=
+    assert summary['status'] == {'UNTUNG TINGGI': 1, 'BONCOS': 1}
+    assert sum(summary['priority'].values()) == 2
+    assert results['/campaigns?status=untung'][1]['count'] == summary['status']['UNTUNG TINGGI']
+    assert results['/priority?level=high'][1]['count'] == summary['priority'].get('HIGH', 0)
+    
+    assert results['/campaigns?sort=Spend&limit=1'][1]['campaigns'][0]['Campaign'] == 'Kemeja A [1]'
+    assert results['/campaign?name=kemeja b [0]'][1]['Campaign'] == 'Kemeja B [0]'
+    assert [c['Campaign'] for c in results['/product?code=56702316365'][1]['campaigns']] == ['Kemeja A [1]']
+    assert len(results['/daily'][1]['days']) == 2
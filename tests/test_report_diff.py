@@ -0,0 +1,27 @@
+"""
+Test ShopeeReportDiff: jenis perubahan per campaign
+"""
+
+import pandas as pd
+
+from shopee_report_diff import ShopeeReportDiff
+
+def _summary(campaigns, spend, roas, status):
+    return pd.DataFrame({
+        'Campaign': campaigns,
+        'Spend': spend,
+        'Sales': [s * r for s, r in zip(spend, roas)],
+        'ROAS': roas,
+        'Status': status
+    })
+
+def test_change_types():
+    previous = _summary(['A', 'B', 'C', 'D'], [1000, 2000, 3000, 4000], [3.0, 0.9, 2.0, 1.5],
+                        ['UNTUNG ✅', 'RUGI ❌', 'UNTUNG ✅', 'BEP ⚠️'])
+    current = _summary(['A', 'B', 'C', 'E'], [1000, 2000, 3500, 100], [3.0 + 1e-15, 1.2, 2.0, 4.0],
+                       ['UNTUNG ✅', 'BEP ⚠️', 'UNTUNG ✅', 'UNTUNG ✅'])
+    
+    changes = ShopeeReportDiff().compare(previous, current)
+    assert dict(zip(changes['Campaign'], changes['Change_Type'])) == {
+        'A': 'UNCHANGED', 'B': 'STATUS CHANGED', 'C': 'UPDATED', 'E': 'NEW', 'D': 'REMOVED'
+    }
@@ -0,0 +1,37 @@
+"""
+Test ShopeeReportGenerator: laporan per segmen dengan kolom level baris
+"""
+
+import pandas as pd
+
+from shopee_analyzer import ShopeeAdAnalyzer
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_report_generator import ShopeeReportGenerator
+
+def _processed(write_export):
+    processor = ShopeeDataProcessor()
+    raw = processor.load_data(write_export())
+    cleaned = processor.clean_data(raw)
+    # Kemeja A memakai dua mode bidding di baris berbeda
+    extra = cleaned.iloc[[0]].assign(Mode_Bidding='Manual', Spend=1000, Sales=0)
+    cleaned = pd.concat([cleaned, extra], ignore_index=True)
+    raw = pd.concat([raw, raw.iloc[[0]]], ignore_index=True)
+    return processor, raw, cleaned, processor.calculate_additional_metrics(cleaned)
+
+def test_row_level_segments_split_mixed_campaigns(write_export, tmp_path):
+    processor, raw, cleaned, processed = _processed(write_export)
+    summary = processor.get_campaign_summary(processed)
+    analysis = ShopeeAdAnalyzer(processor).analyze_campaigns(summary)
+    
+    index_file = ShopeeReportGenerator().generate_segmented_reports(
+        raw, cleaned, analysis, summary,
+        segment_by='Mode_Bidding', processor=processor, output_dir=str(tmp_path / 'out'),
+        max_workers=1, processed_data=processed)
+    
+    index = pd.read_excel(index_file).set_index('Mode_Bidding')
+    assert index.loc['GMV Max ROAS', 'Spend'] == 58838
+    assert index.loc['Manual', 'Spend'] == 339 + 1000
+    assert index['Campaigns'].to_dict() == {'GMV Max ROAS': 1, 'Manual': 2}
+    
+    manual = pd.read_excel(tmp_path / 'out' / 'segment_02_Manual.xlsx', sheet_name='Campaign_Summary')
+    assert manual.set_index('Campaign')['Spend'].to_dict() == {'Kemeja A [1]': 1000, 'Kemeja B [0]': 339}
@@ -0,0 +1,47 @@
+"""
+Test ShopeeRulesEngine: status dari rules file dipakai summary, analyzer & budget optimizer
+"""
+
+import json
+
+import pandas as pd
+
+import shopee_rules_engine
+from shopee_analyzer import ShopeeAdAnalyzer
+from shopee_budget_optimizer import ShopeeBudgetOptimizer
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_rules_engine import ShopeeRulesEngine
+
+def _data():
+    return pd.DataFrame({
+        'Campaign': ['A', 'B', 'C', 'D'],
+        'Impressions': [10000, 10000, 10000, 0],
+        'Clicks': [300, 300, 300, 0],
+        'Orders': [10, 10, 10, 0],
+        'Sales': [400000, 1500000, 3000000, 0],
+        'Spend': [1000000, 1000000, 1000000, 0]
+    })
+
+def test_default_ladder_from_thresholds():
+    df = _data()
+    status = ShopeeRulesEngine(rules=[]).status(df.assign(ROAS=df['Sales'] / df['Spend'].where(df['Spend'] > 0)))
+    assert status['Status'].tolist() == ['BONCOS', 'UNTUNG', 'UNTUNG TINGGI', 'TIDAK AKTIF']
+    assert status['Level'].tolist() == ['HIGH', 'LOW', 'LOW', 'MEDIUM']
+
+def test_rules_file_changes_status_everywhere(tmp_path, monkeypatch):
+    rules_file = tmp_path / 'rules.json'
+    rules_file.write_text(json.dumps({'rules': [
+        {'name': 'RUGI', 'group': 'status', 'priority': 1, 'level': 'HIGH', 'when': 'ROAS < 2'}
+    ]}), encoding='utf-8')
+    engine = ShopeeRulesEngine(str(rules_file))
+    monkeypatch.setattr(shopee_rules_engine, '_default_engine', engine)
+    
+    processor = ShopeeDataProcessor()
+    summary = processor.get_campaign_summary(_data())
+    analysis = ShopeeAdAnalyzer(processor, rules_engine=engine).analyze_campaigns(summary)
+    plan = ShopeeBudgetOptimizer(rules_engine=engine).optimize(summary).set_index('Campaign')
+    
+    # Rule file: ROAS 1.5 -> RUGI; campaign yang tidak cocok -> ladder bawaan
+    assert summary['Status'].tolist() == ['RUGI ❌', 'RUGI ❌', 'UNTUNG TINGGI 🚀', 'RUGI ❌']
+    assert analysis['Status'].tolist() == ['RUGI', 'RUGI', 'UNTUNG TINGGI', 'RUGI']
+    assert plan.loc[['A', 'B', 'C', 'D'], 'Status'].tolist() == ['RUGI', 'RUGI', 'UNTUNG TINGGI', 'RUGI']
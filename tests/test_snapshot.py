@@ -0,0 +1,49 @@
+"""
+Test ShopeeSnapshotIngestor: file interval tetap konsisten walau kolom export berubah
+"""
+
+import pandas as pd
+
+from shopee_snapshot import ShopeeSnapshotIngestor
+
+def _snapshot(spend, cogs=None):
+    df = pd.DataFrame({
+        'Campaign': ['Kemeja A', 'Kemeja B'],
+        'Kode_Produk': ['1', '2'],
+        'Tanggal': pd.to_datetime(['2025-12-03 20:00', '2025-12-04 20:00']),
+        'Impressions': [1000, 500],
+        'Clicks': [20, 5],
+        'Sales': [100000, 0],
+        'Spend': spend
+    })
+    if cogs is not None:
+        df['COGS'] = cogs
+    return df
+
+def test_intervals_keep_columns_aligned_when_metric_appears(tmp_path):
+    tracker = ShopeeSnapshotIngestor(state_file=str(tmp_path / 'state.npz'),
+                              intervals_file=str(tmp_path / 'intervals.csv'))
+    tracker.ingest(_snapshot([1000, 500]), snapshot_time='2025-12-05 08:00')
+    tracker.ingest(_snapshot([3000, 800], cogs=[40000, 0]), snapshot_time='2025-12-05 12:30')
+    
+    intervals = tracker.load_intervals()
+    assert len(intervals) == 4
+    assert intervals['Spend'].tolist() == [1000, 500, 2000, 300]
+    assert intervals['COGS'].tolist() == [0, 0, 40000, 0]
+    assert intervals['Window'].tolist() == ['morning', 'morning', 'noon', 'noon']
+
+def test_intervals_file_with_old_header_is_rewritten(tmp_path):
+    intervals_file = tmp_path / 'intervals.csv'
+    tracker = ShopeeSnapshotIngestor(state_file=str(tmp_path / 'state.npz'),
+                              intervals_file=str(intervals_file))
+    tracker.ingest(_snapshot([1000, 500]), snapshot_time='2025-12-05 08:00')
+    
+    # File dari versi lama: tanpa kolom COGS
+    old = pd.read_csv(intervals_file).drop(columns=['COGS'])
+    old.to_csv(intervals_file, index=False)
+    tracker.ingest(_snapshot([3000, 800]), snapshot_time='2025-12-05 12:30')
+    
+    intervals = tracker.load_intervals()
+    assert intervals['Spend'].tolist() == [1000, 500, 2000, 300]
+    assert intervals['Snapshot_Type'].tolist() == ['NEW', 'NEW', 'DELTA', 'DELTA']
+    assert pd.api.types.is_datetime64_any_dtype(intervals['Interval_End'])
@@ -0,0 +1,38 @@
+"""
+Test ShopeeSpillExecutor: hasil per chunk + spill sama dengan jalur in-memory
+"""
+
+import os
+
+import pandas as pd
+
+from conftest import export_row
+from shopee_data_processor import ShopeeDataProcessor
+from shopee_spill import ShopeeSpillExecutor
+
+def test_spill_matches_in_memory(write_export, tmp_path):
+    path = write_export([export_row(i) for i in range(3000)])
+    processor = ShopeeDataProcessor()
+    full = processor.calculate_additional_metrics(processor.clean_data(processor.load_data(path)))
+    
+    spill_dir = tmp_path / 'spill'
+    spill_dir.mkdir()
+    executor = ShopeeSpillExecutor(processor, budget_bytes=1, chunk_rows=400, spill_dir=str(spill_dir))
+    assert executor.should_spill(path)
+    # Tanpa batas minimum 1000 baris per chunk dari perkiraan memory
+    executor.bytes_per_row = None
+    assert executor.run(path) == 3000
+    assert len(executor.partitions) == 8
+    spilled = executor.read_columns()
+    # Sudah diagregasi per key, jauh lebih kecil dari export
+    assert len(spilled) < len(full)
+    
+    pd.testing.assert_frame_equal(processor.get_campaign_summary(spilled),
+                                  processor.get_campaign_summary(full))
+    pd.testing.assert_frame_equal(processor.get_daily_summary(spilled),
+                                  processor.get_daily_summary(full))
+    pd.testing.assert_frame_equal(processor.get_hourly_heatmap(spilled),
+                                  processor.get_hourly_heatmap(full))
+    
+    executor.cleanup()
+    assert os.listdir(spill_dir) == []
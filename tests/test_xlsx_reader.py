@@ -0,0 +1,93 @@
+"""
+Test ShopeeXlsxReader: karakter multibyte, sel tanpa atribut r & header duplikat
+"""
+
+import zipfile
+
+from shopee_xlsx_reader import ShopeeXlsxReader
+
+HEADER = ['Nama Iklan', 'Dilihat', 'Jumlah Klik', 'Konversi', 'Omzet Penjualan', 'Biaya', 'Tanggal Mulai']
+
+WORKBOOK = (
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+CONTENT_TYPES = (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+RELS = (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/worksheet" Target="worksheets/sheet1.xml"/></Relationships>'
+)
+
+def _letters(col):
+    return chr(65 + col)
+
+def _write_xlsx(path, rows, with_ref=True, attr_order='rt', prefix=''):
+    """Workbook minimal dengan sel inline string / angka"""
+    def cell(row, col, value):
+        ref = f' r="{_letters(col)}{row}"' if with_ref else ''
+        if isinstance(value, str):
+            attrs = ref + ' t="inlineStr"' if attr_order == 'rt' else ' t="inlineStr"' + ref
+            return f'<{prefix}c{attrs}><{prefix}is><{prefix}t>{value}</{prefix}t></{prefix}is></{prefix}c>'
+        return f'<{prefix}c{ref}><{prefix}v>{value}</{prefix}v></{prefix}c>'
+    
+    xmlns = 'xmlns' + (f':{prefix[:-1]}' if prefix else '')
+    body = ''.join(
+        f'<{prefix}row' + (f' r="{i}"' if with_ref else '') + '>' +
+        ''.join(cell(i, col, value) for col, value in enumerate(row)) + f'</{prefix}row>'
+        for i, row in enumerate(rows, start=1)
+    )
+    sheet = (f'<{prefix}worksheet {xmlns}="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+             f'<{prefix}sheetData>{body}</{prefix}sheetData></{prefix}worksheet>')
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('[Content_Types].xml', CONTENT_TYPES)
+        zf.writestr('xl/workbook.xml', WORKBOOK)
+        zf.writestr('xl/_rels/workbook.xml.rels', RELS)
+        zf.writestr('xl/worksheets/sheet1.xml', sheet)
+
+def _rows(n):
+    return [HEADER] + [[f'Produk ✨ ñ 日本語 {i}', 100 + i, i, 1, 5000, 250, '18/12/2025 00:00:00']
+                       for i in range(n)]
+
+def test_multibyte_text(tmp_path):
+    path = tmp_path / 'export.xlsx'
+    rows = _rows(2000)
+    _write_xlsx(path, rows)
+    df = ShopeeXlsxReader(str(path)).read(HEADER)
+    assert len(df) == 2000
+    assert not df['Nama Iklan'].str.contains('�').any()
+    assert df['Nama Iklan'].tolist() == [row[0] for row in rows[1:]]
+
+def test_cells_without_reference_and_any_attribute_order(tmp_path):
+    rows = _rows(50)
+    results = []
+    for name, options in [('ref.xlsx', {}), ('noref.xlsx', {'with_ref': False}),
+                          ('order.xlsx', {'attr_order': 'tr'}), ('ns.xlsx', {'prefix': 'x:', 'with_ref': False})]:
+        path = tmp_path / name
+        _write_xlsx(path, rows, **options)
+        results.append(ShopeeXlsxReader(str(path)).read(HEADER))
+    
+    expected = results[0]
+    assert list(expected.columns) == HEADER
+    assert len(expected) == 50
+    for df in results[1:]:
+        assert df.equals(expected)
+
+def test_duplicate_headers_are_suffixed(tmp_path):
+    path = tmp_path / 'dup.xlsx'
+    rows = [HEADER + ['Biaya']] + [row + [999] for row in _rows(3)[1:]]
+    _write_xlsx(path, rows)
+    df = ShopeeXlsxReader(str(path)).read(HEADER)
+    assert list(df.columns) == HEADER + ['Biaya.1']
+    assert df['Biaya'].tolist() == [250, 250, 250]
+    assert df['Biaya.1'].tolist() == [999, 999, 999]